@@ -1,11 +1,15 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Generator, Optional
+from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.core.config import get_settings
+from app.database import get_async_db, get_db
 
-def get_db() -> Generator:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+def valid_admin_token(token: Optional[str]) -> bool:
+    expected = get_settings().ADMIN_TOKEN
+    return bool(expected and token) and hmac.compare_digest(token, expected)
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow a request only with the configured X-Admin-Token, admin routes are off without one"""
+    if not valid_admin_token(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
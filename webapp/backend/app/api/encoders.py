@@ -0,0 +1,140 @@
+"""
+Response encoding straight from rows and columns, skipping response model validation.
+
+JSON goes through orjson when it is installed and the stdlib otherwise,
+with the same shape either way. Bulk consumers can ask for MessagePack
+(the same records as the JSON) or an Arrow IPC stream (the same columns)
+through the Accept header. Both need their optional package installed.
+"""
+import importlib.util
+import io
+import json
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Other names clients use for the same formats
+ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+REQUIRES = {
+    MSGPACK: ("msgpack", "MessagePack output needs msgpack installed"),
+    ARROW: ("pyarrow", "Arrow output needs pyarrow installed"),
+}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, separators=(',', ':')).encode()
+
+def negotiate(accept: Optional[str], offered: Sequence[str]) -> str:
+    """
+    Pick the offered media type the client prefers, the first offered on a tie.
+
+    Clients that accept none of them get the first one, as before there was
+    a choice. Raises 406 when the one the client wants needs a package that
+    is not installed.
+    """
+    if not accept:
+        return offered[0]
+
+    ranges = []
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((ALIASES.get(media_type.lower(), media_type.lower()), quality))
+
+    def quality_of(media_type: str) -> float:
+        best, best_specificity = 0.0, -1
+        major = media_type.split("/")[0]
+        for media_range, quality in ranges:
+            if media_range == media_type:
+                specificity = 2
+            elif media_range == f"{major}/*":
+                specificity = 1
+            elif media_range == "*/*":
+                specificity = 0
+            else:
+                continue
+            if specificity > best_specificity:
+                best, best_specificity = quality, specificity
+        return best
+
+    chosen = max(offered, key=lambda media_type: (quality_of(media_type), -offered.index(media_type)))
+    if quality_of(chosen) <= 0:
+        return offered[0]
+
+    if chosen in REQUIRES and importlib.util.find_spec(REQUIRES[chosen][0]) is None:
+        raise HTTPException(status_code=406, detail=REQUIRES[chosen][1])
+    return chosen
+
+def column_records(columns: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Rows as dicts, built from whole columns"""
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*(list(column) for column in columns.values()))]
+
+def frame_columns(frame) -> Dict[str, List[Any]]:
+    """A DataFrame's columns as lists of Python values, missing values as None like to_json"""
+    columns = {}
+    for column in frame.columns:
+        series = frame[column]
+        if series.hasnans:
+            series = series.astype(object).where(series.notna(), None)
+        columns[column] = series.tolist()
+    return columns
+
+def arrow_stream(columns: Dict[str, Sequence]) -> bytes:
+    import pyarrow as pa
+
+    table = pa.table(columns)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def records_response(
+    records: List[Dict[str, Any]],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+    columns: Optional[Dict[str, Sequence]] = None
+) -> Response:
+    """
+    Encode rows in the negotiated format.
+
+    Arrow is built from columns, pass them when they are at hand so the
+    rows are not pivoted back.
+    """
+    if media_type == MSGPACK:
+        import msgpack
+        return Response(msgpack.packb(records), media_type=MSGPACK, headers=headers)
+    if media_type == ARROW:
+        if columns is None:
+            names = list(records[0]) if records else []
+            columns = {name: [record[name] for record in records] for name in names}
+        return Response(arrow_stream(columns), media_type=ARROW, headers=headers)
+    return Response(dumps_json(records), media_type=JSON, headers=headers)
+
+def model_response(model: BaseModel, media_type: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Encode a response model as JSON or MessagePack without validating it again"""
+    if media_type == MSGPACK:
+        import msgpack
+        return Response(msgpack.packb(model.model_dump(mode="json")), media_type=MSGPACK, headers=headers)
+    return Response(model.model_dump_json(), media_type=JSON, headers=headers)
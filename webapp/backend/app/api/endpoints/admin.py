@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from app.api.deps import require_admin
+from app.core.request_profiler import request_profiler
+from app.core.sql_profiler import query_profiler
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/queries")
+async def get_queries(limit: int = Query(50, ge=1, le=500)):
+    """
+    SQL statements by total time with call sites, the slow query log with
+    plans, and N+1 patterns. Empty unless SQL_PROFILING_ENABLED is set.
+    """
+    return query_profiler.report(limit)
+
+@router.delete("/queries")
+async def reset_queries():
+    """Clear the recorded statements and logs"""
+    query_profiler.reset()
+    return {"message": "Query statistics cleared"}
+
+@router.get("/profiles")
+async def list_profiles():
+    """Stored request profiles, newest first. Empty unless PROFILING_ENABLED is set."""
+    return request_profiler.summaries()
+
+@router.get("/profiles/{request_id}", response_class=PlainTextResponse)
+async def get_profile(request_id: str):
+    """
+    A request's profile as folded stacks, ready for flamegraph.pl or
+    speedscope. Each line is the thread name, the frames outermost first
+    and the number of samples.
+    """
+    profile = request_profiler.get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for request {request_id}")
+    return PlainTextResponse(profile.folded())
@@ -1,31 +1,188 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional, Tuple
 from app.api import deps
+from app.api.encoders import JSON, MSGPACK, model_response, negotiate
+from app.database import get_async_session_factory
 from app.schemas import schemas
-from app.services import optimizer
+from app.services.coalescing import optimize_flight, optimize_request_key
+from app.services.league_settings import league_templates
+from app.services.lineup_watch import lineup_id_for, lineup_registry, lineup_updates
 
 router = APIRouter()
 
+async def league_settings(
+    db: AsyncSession,
+    settings: Optional[schemas.LeagueSettings],
+    league_id: Optional[int]
+) -> Tuple[schemas.LeagueSettings, Any]:
+    """The request's settings, or a saved league's with its compiled constraint template"""
+    if (settings is None) == (league_id is None):
+        raise HTTPException(status_code=400, detail="Send either settings or a league_id")
+    if league_id is None:
+        return settings, None
+
+    try:
+        saved = await league_templates.get(db, league_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if saved is None:
+        raise HTTPException(status_code=404, detail=f"No league {league_id}")
+    return saved
+
 @router.post("/lineup", response_model=schemas.OptimizedLineup)
 async def optimize_lineup(
-    settings: schemas.LeagueSettings,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    settings: Optional[schemas.LeagueSettings] = None,
+    league_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
     exclude_players: Optional[List[int]] = None,
     force_players: Optional[List[int]] = None
 ):
     """
     Generate optimal lineup based on league settings.
     Optionally exclude or force certain players.
+
+    Send the settings, or the league_id of settings saved through
+    /api/settings to use their precompiled constraint template.
+
+    Concurrent requests with the same settings and player lists share one run.
+    The X-Lineup-Id header identifies the lineup on /lineup/events, where
+    it is pushed again whenever an injury or salary change affects it.
+    Send `Accept: application/msgpack` for MessagePack.
     """
+    media_type = negotiate(request.headers.get("accept"), [JSON, MSGPACK])
+
+    settings, template = await league_settings(db, settings, league_id)
+
+    # Imported on first use, the optimizer pulls in pandas and pulp
+    from app.services import optimizer
+
+    try:
+        key = optimize_request_key(settings, exclude_players, force_players)
+
+        async def run():
+            # The run is shared and can outlive the request that started it,
+            # so it reads through its own session rather than that request's
+            async with get_async_session_factory()() as flight_db:
+                optimizer_instance = optimizer.FantasyOptimizer(
+                    db=flight_db,
+                    settings=settings,
+                    exclude_players=exclude_players,
+                    force_players=force_players,
+                    template=template
+                )
+                lineup = await optimizer_instance.optimize()
+            lineup_registry.record(key, optimizer_instance, lineup)
+            return lineup
+
+        lineup = await optimize_flight.do(key, run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return model_response(lineup, media_type, {"X-Lineup-Id": lineup_id_for(key)})
+
+@router.get("/lineup/events")
+async def lineup_events(lineup_id: Optional[str] = None):
+    """
+    Server-Sent Events stream of lineups re-solved after injury or salary changes.
+
+    Pass lineup_id (the X-Lineup-Id of an optimize response) to only get
+    updates for that lineup.
+    """
+    queue = lineup_updates.subscribe()
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    update = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if lineup_id and update["lineup_id"] != lineup_id:
+                    continue
+                yield f"event: lineup\ndata: {json.dumps(update)}\n\n"
+        finally:
+            lineup_updates.unsubscribe(queue)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@router.get("/stats")
+async def get_optimize_stats():
+    """
+    Get request coalescing counters for the lineup endpoint.
+    """
+    return optimize_flight.stats()
+
+@router.post("/sweep", response_model=schemas.CapSweepResult)
+async def sweep_salary_cap(
+    sweep: schemas.CapSweep,
+    settings: Optional[schemas.LeagueSettings] = None,
+    league_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exclude_players: Optional[List[int]] = None,
+    force_players: Optional[List[int]] = None
+):
+    """
+    Best lineup and projected points at each max_salary_cap from
+    sweep.max_cap down to sweep.min_cap, for each min_salary_cap_pct.
+
+    One pool and one model serve the whole sweep, so it costs a fraction
+    of an optimize call per cap.
+    """
+    settings, template = await league_settings(db, settings, league_id)
+
+    from app.services import cap_sweep
+
+    try:
+        sweeper = cap_sweep.SalaryCapSweep(
+            db=db,
+            settings=settings,
+            sweep=sweep,
+            exclude_players=exclude_players,
+            force_players=force_players,
+            template=template
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        return await sweeper.sweep()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/plan", response_model=schemas.LineupPlan)
+async def plan_lineups(
+    plan: schemas.PlanSettings,
+    settings: Optional[schemas.LeagueSettings] = None,
+    league_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    exclude_players: Optional[List[int]] = None,
+    force_players: Optional[List[int]] = None
+):
+    """
+    Plan lineups for the coming weeks with limited transfers between weeks.
+
+    Send the settings, or the league_id of settings saved through /api/settings.
+    """
+    settings, template = await league_settings(db, settings, league_id)
+
+    from app.services import planner
+
     try:
-        optimizer_instance = optimizer.FantasyOptimizer(
+        planner_instance = planner.LineupPlanner(
             db=db,
             settings=settings,
+            plan=plan,
             exclude_players=exclude_players,
-            force_players=force_players
+            force_players=force_players,
+            template=template
         )
-        lineup = await optimizer_instance.optimize()
-        return lineup
+        return await planner_instance.plan()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
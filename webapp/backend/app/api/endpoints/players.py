@@ -1,39 +1,136 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.api import deps
+from app.api.encoders import ARROW, JSON, MSGPACK, NDJSON, column_records, frame_columns, negotiate, records_response
 from app.schemas import schemas
-from app.services import projections
+from app.core.constants import ASSIST, GOAL
+from app.services.player_search import player_search
+from app.services.players import PlayerService, page_etag
+from app.services.snapshots import data_snapshots
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Player])
 async def get_players(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    after: Optional[int] = Query(None, description="Last player id of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    team: Optional[str] = None,
+    position: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Retreive players with optional pagination.
+    Retrieve players ordered by id with cursor pagination.
+
+    Pass the X-Next-Cursor header of a response as `after` to get the next
+    page. Unchanged pages are answered with 304 when If-None-Match is sent.
+    Send `Accept: application/msgpack` or `application/vnd.apache.arrow.stream`
+    for MessagePack or Arrow.
     """
+    media_type = negotiate(request.headers.get("accept"), [JSON, MSGPACK, ARROW])
     try:
-        players = db.query(schemas.Player).offset(skip).limit(limit).all()
-        return players
+        players = await PlayerService(db).list_players(after, limit, team, position)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/stats")
-async def get_player_stats(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100
+    etag = page_etag(players)
+    headers = {"ETag": etag}
+    if len(players) == limit:
+        headers["X-Next-Cursor"] = str(players[-1]["id"])
+
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return records_response(players, media_type, headers)
+
+@router.get("/search", response_model=List[schemas.PlayerMatch])
+async def search_players(
+    db: AsyncSession = Depends(deps.get_async_db),
+    q: str = Query(..., min_length=1, description="Part of a player's name, accents and case are ignored"),
+    limit: int = Query(10, ge=1, le=50),
+    team: Optional[str] = None,
+    position: Optional[str] = None
 ):
     """
-    Retrieve player stats with projections.
+    Find players by name for autocomplete.
+
+    Exact names come first, then names and words starting with the query,
+    then close misspellings, each with a score from 0 to 1.
     """
     try:
-        # TODO: Add projections logic
+        index = await player_search.get(db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return records_response(index.search(q, limit, team, position), JSON)
 
-        return {"message":"Status endpoint - To be implemented"}
+@router.get("/stats", response_model=List[schemas.PlayerProjection])
+async def get_player_stats(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
+    team: Optional[str] = None,
+    position: Optional[str] = None,
+    injured: Optional[bool] = None,
+    min_games: int = 0,
+    sort: str = "proj_fantasy_pts",
+    descending: bool = True,
+    points_goal: Optional[float] = None,
+    points_assist: Optional[float] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=0, le=1000, description="Page size, 0 for every row when streaming NDJSON or Arrow")
+):
+    """
+    Retrieve this week's skater projections.
+
+    Served from the background projections snapshot, or a cached projection
+    table rebuilt when player data changes. Send `Accept: application/x-ndjson` to stream rows as NDJSON,
+    `application/vnd.apache.arrow.stream` for Arrow or `application/msgpack` for MessagePack.
+    The streamed formats can export every row at once with `limit=0`.
+    """
+    media_type = negotiate(request.headers.get("accept"), [JSON, NDJSON, ARROW, MSGPACK])
+    if limit == 0 and media_type not in (NDJSON, ARROW):
+        raise HTTPException(status_code=400, detail="limit=0 is only allowed when streaming NDJSON or Arrow")
+
+    # Imported on first use, projections pull in pandas and the optimizer
+    from app.services.player_projections import PROJECTION_COLUMNS, iter_arrow, iter_ndjson, projection_table, rescore
+
+    if sort not in PROJECTION_COLUMNS.values():
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort}")
+
+    try:
+        frame = data_snapshots.get("projections")
+        if frame is None:
+            frame = await projection_table.get(db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    mask = frame['games_this_week'] >= min_games
+    if team:
+        mask &= frame['team'] == team
+    if position:
+        mask &= frame['position'] == position
+    if injured is not None:
+        mask &= frame['injured'] == injured
+    frame = frame[mask]
+
+    if points_goal is not None or points_assist is not None:
+        frame = rescore(
+            frame,
+            points_goal if points_goal is not None else GOAL,
+            points_assist if points_assist is not None else ASSIST
+        )
+
+    frame = frame.sort_values(sort, ascending=not descending, kind='stable')
+    page = frame.iloc[skip:skip + limit] if limit else frame.iloc[skip:]
+    headers = {"X-Total-Count": str(len(frame))}
+
+    if media_type == NDJSON:
+        return StreamingResponse(iter_ndjson(page), media_type=NDJSON, headers=headers)
+    if media_type == ARROW:
+        return StreamingResponse(iter_arrow(page), media_type=ARROW, headers=headers)
+
+    return records_response(column_records(frame_columns(page)), media_type, headers)
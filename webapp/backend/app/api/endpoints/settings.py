@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.schemas import schemas
+from app.services.league_settings import LeagueSettingsService, league_templates, settings_of
 from app.core.constants import MAX_COST, MIN_COST, NUM_FORWARDS, NUM_DEFENSE, NUM_GOALIES, MAX_PLAYERS_PER_TEAM, GOAL, ASSIST, GOALIE_WIN, SHUTOUT, OT_LOSS
 
 router = APIRouter()
@@ -13,7 +14,7 @@ async def get_default_settings():
     """
     return {
         "max_salary_cap": MAX_COST,
-        "min_salary_cap_pct": MIN_COST,
+        "min_salary_cap_pct": MIN_COST / MAX_COST,
         "num_forwards": NUM_FORWARDS,
         "num_defense": NUM_DEFENSE,
         "num_goalies": NUM_GOALIES,
@@ -31,13 +32,35 @@ async def get_default_settings():
 @router.post("/", response_model=schemas.LeagueSettings)
 async def create_settings(
     settings: schemas.LeagueSettings,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_async_db)
 ):
     """
-    Create or update league settings
+    Create or update league settings.
+
+    Settings with an id update that league, without one a new league is
+    created. Pass the returned id as league_id to /api/optimize/lineup
+    instead of sending the settings.
+    """
+    try:
+        row = await LeagueSettingsService(db).save(settings)
+        saved, _ = league_templates.put(row)
+        return saved
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{league_id}", response_model=schemas.LeagueSettings)
+async def get_settings(
+    league_id: int,
+    db: AsyncSession = Depends(deps.get_async_db)
+):
+    """
+    Get a saved league's settings
     """
     try:
-        # Save settings to database
-        return settings
+        row = await LeagueSettingsService(db).get(league_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"No league {league_id}")
+    return settings_of(row)
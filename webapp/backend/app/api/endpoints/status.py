@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from app.database import engine
+from app.services.status import data_status
+
+router = APIRouter()
+
+@router.get("/")
+async def get_status():
+    """
+    Report readiness, DB pool health, data freshness and solver availability.
+    Served from in-memory state only, returns 503 until the service is ready.
+    """
+    snapshot = data_status.snapshot(engine)
+    return JSONResponse(
+        content=jsonable_encoder(snapshot),
+        status_code=200 if snapshot['ready'] else 503
+    )
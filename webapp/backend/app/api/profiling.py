@@ -0,0 +1,54 @@
+"""
+Opt-in sampling profiles of single requests.
+
+With PROFILING_ENABLED set, an admin request (X-Admin-Token) carrying an
+X-Profile header or a profile query parameter is profiled. The value
+"optimize" limits sampling to the functions decorated with @profiled,
+FantasyOptimizer.optimize among them, any other value profiles the whole
+route. The profile is kept under the request's X-Request-Id, or a new id,
+returned in X-Profile-Id and served as folded stacks by
+/api/admin/profiles/{request_id}.
+"""
+import uuid
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from app.api.deps import valid_admin_token
+from app.core.request_profiler import RequestProfiler, profile_request, request_profiler
+
+# Values that leave the request unprofiled
+OFF_VALUES = {"", "0", "false", "no", "off"}
+FUNCTIONS_ONLY = "optimize"
+
+class RequestProfilerMiddleware:
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or request_profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        mode = headers.get("x-profile") or QueryParams(scope["query_string"]).get("profile") or ""
+        if mode.lower() in OFF_VALUES or not valid_admin_token(headers.get("x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get("x-request-id") or uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", request_id)
+            await send(message)
+
+        if mode.lower() == FUNCTIONS_ONLY:
+            token = profile_request.set(request_id)
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profile_request.reset(token)
+            return
+
+        with self.profiler.profile(request_id, f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send_with_id)
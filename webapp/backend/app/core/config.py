@@ -3,8 +3,39 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     APP_NAME: str = "NHL Fantasy Optimizer"
-    DATABASE_URL: str
+    DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/nhl_fantasy"
+    ASYNC_DATABASE_URL: str | None = None  # Defaults to DATABASE_URL with an async driver
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced, -1 to keep forever
+    DB_POOL_PRE_PING: bool = True
     REDIS_URL: str | None = None
+    METRICS_ENABLED: bool = True
+    STATUS_REFRESH_SECONDS: float = 30.0
+    REFRESH_ENABLED: bool = True
+    SCHEDULE_REFRESH_SECONDS: float = 3600.0
+    STANDINGS_REFRESH_SECONDS: float = 900.0
+    INJURIES_REFRESH_SECONDS: float = 300.0
+    PROJECTIONS_REFRESH_SECONDS: float = 300.0
+    REFRESH_FIXTURES_DIR: str | None = None  # Read schedule/standings/injuries CSVs from here instead
+    SAVED_LINEUPS_MAX: int = 200  # Optimized lineups re-solved when their players' injuries or salaries change
+    LINEUP_WATCH_SECONDS: float = 60.0  # How often saved lineups are checked for injury and salary changes
+    WARMUP_ENABLED: bool = False  # Build caches and projections before the worker takes traffic
+    PROJECTION_ENGINE: str = "pandas"  # "polars" builds the player pool as one lazy query, needs polars and pyarrow
+    SHARED_POOL_DIR: str | None = None  # e.g. /dev/shm/nhl_app, one worker builds the player pool and all map it
+    CAPTURE_DIR: str | None = None  # Write every solver input here as a bundle for app.scripts.replay_bundles
+    CAPTURE_SAMPLE_RATE: float = 1.0  # Share of solves captured when CAPTURE_DIR is set
+    PLAYER_SEARCH_CHECK_SECONDS: float = 5.0  # How often /api/players/search checks for new players
+    ADMIN_TOKEN: str | None = None  # X-Admin-Token for /api/admin, which is off without one
+    SQL_PROFILING_ENABLED: bool = False  # Record each statement's latency, rows and call site for /api/admin/queries
+    SQL_SLOW_QUERY_MS: float = 200.0  # Statements slower than this are logged with their plan
+    SQL_EXPLAIN_SLOW: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # Runs of one statement from one line in a request that count as N+1
+    PROFILING_ENABLED: bool = False  # Let admins profile a request with X-Profile or ?profile=
+    PROFILE_INTERVAL_MS: float = 5.0  # Sampling interval of request profiles
+    PROFILE_MAX_SECONDS: float = 60.0  # Sampling stops after this long, e.g. on event streams
+    PROFILE_STORE_SIZE: int = 50  # Profiles kept for /api/admin/profiles
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,17 @@
 from datetime import date
 
-def get_season_info():
-    current_date = date.today()
+def get_season_start(season_year: int) -> str:
+    return f"{season_year-1}-10-04"  # Approximate season start
+
+def get_season_info(current_date: date | None = None):
+    current_date = current_date or date.today()
     # NHL season typically starts in October
     if current_date.month < 7:  # If we're in first half of calendar year
         season_year = current_date.year
     else:  # If we're in second half of calendar year
         season_year = current_date.year + 1
 
-    season_start = f"{season_year-1}-10-04"  # Approximate season start
+    season_start = get_season_start(season_year)
     return season_start, season_year
 
 SEASON_START, CURRENT_YEAR = get_season_info()
@@ -62,3 +65,4 @@ NUM_DEFENSE = 4
 NUM_GOALIES = 2
 MAX_PLAYERS_PER_TEAM = 5
 MAX_DEFENSE_PER_TEAM = 1
+HOME_ADVANTAGE = 1.05  # Home teams score and win a little more often
@@ -35,6 +35,19 @@ class DatabaseDataSource(BaseDataSource):
             print(f"Error fetching data from database: {e}")
             return pd.DataFrame()
 
+class FixtureDataSource(BaseDataSource):
+    """Handles data from a local CSV file, e.g. test fixtures"""
+
+    def __init__(self, path: str, date_columns: Optional[list] = None):
+        self.path = path
+        self.date_columns = date_columns or []
+
+    async def get_data(self) -> pd.DataFrame:
+        df = pd.read_csv(self.path)
+        for column in self.date_columns:
+            df[column] = pd.to_datetime(df[column]).dt.date
+        return df
+
 class DataSourceFactory:
     """Factory for creating data sources"""
 
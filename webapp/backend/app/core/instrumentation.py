@@ -0,0 +1,184 @@
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import get_settings
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000)
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Histogram:
+    """Prometheus-style cumulative histogram keyed by label values"""
+
+    def __init__(self, name: str, help: str, label_names: Iterable[str], buckets: Iterable[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple((name, str(labels[name])) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # One count per bucket, then +Inf, sum and count
+                series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-3] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in sorted(series.items()):
+            for bound, count in zip(self.buckets, values):
+                bucket_labels = _format_labels(key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(count)}")
+            inf_labels = _format_labels(key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {_format_value(values[-3])}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {_format_value(values[-1])}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Process-wide metrics with Prometheus text exposition.
+
+    When disabled every recording call returns straight away, so the
+    instrumentation left in the hot path costs a single attribute check.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stage_duration = Histogram(
+            "nhl_stage_duration_seconds", "Time spent in each pipeline stage", ["stage"], DURATION_BUCKETS
+        )
+        self.stage_rows = Histogram(
+            "nhl_stage_rows", "Rows produced by each pipeline stage", ["stage"], SIZE_BUCKETS
+        )
+        self.problem_size = Histogram(
+            "nhl_solver_problem_size", "Variables and constraints in each solved model", ["dimension"], SIZE_BUCKETS
+        )
+        self.db_query_duration = Histogram(
+            "nhl_db_query_duration_seconds", "Database statement execution time", ["statement"], DURATION_BUCKETS
+        )
+        self.pool_checkout_wait = Histogram(
+            "nhl_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["engine"], DURATION_BUCKETS
+        )
+        self._histograms = [
+            self.stage_duration, self.stage_rows, self.problem_size, self.db_query_duration, self.pool_checkout_wait
+        ]
+        self._callbacks: List[Tuple[str, str, str, Callable[[], Dict[Tuple[Tuple[str, str], ...], float]]]] = []
+
+    def observe_stage(self, stage: str, seconds: float, result=None):
+        if not self.enabled:
+            return
+        self.stage_duration.observe(seconds, stage=stage)
+        shape = getattr(result, "shape", None)
+        if shape:
+            self.stage_rows.observe(shape[0], stage=stage)
+
+    def observe_problem(self, variables: int, constraints: int):
+        if not self.enabled:
+            return
+        self.problem_size.observe(variables, dimension="variables")
+        self.problem_size.observe(constraints, dimension="constraints")
+
+    def register_callback(
+        self,
+        name: str,
+        help: str,
+        metric_type: str,
+        collect: Callable[[], Dict[Tuple[Tuple[str, str], ...], float]]
+    ):
+        """Register a gauge or counter whose values are read at scrape time"""
+        self._callbacks.append((name, help, metric_type, collect))
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for name, help, metric_type, collect in self._callbacks:
+            lines.extend([f"# HELP {name} {help}", f"# TYPE {name} {metric_type}"])
+            for labels, value in sorted(collect().items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(enabled=get_settings().METRICS_ENABLED)
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block of code as a pipeline stage"""
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_stage(stage, time.perf_counter() - start)
+
+def instrumented(stage: str):
+    """Time a function as a pipeline stage and record the rows it returns"""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not metrics.enabled:
+                    return await fn(*args, **kwargs)
+                start = time.perf_counter()
+                result = await fn(*args, **kwargs)
+                metrics.observe_stage(stage, time.perf_counter() - start, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            metrics.observe_stage(stage, time.perf_counter() - start, result)
+            return result
+        return wrapper
+    return decorator
+
+def instrument_engine(engine: Engine, registry: Optional[MetricsRegistry] = None):
+    """Time every statement the engine executes, labelled by statement type"""
+    registry = registry or metrics
+    if not registry.enabled:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        verb = statement.split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        registry.db_query_duration.observe(elapsed, statement=verb)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_start_time"):
+            context.connection.info["query_start_time"].pop()
@@ -0,0 +1,177 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from .config import get_settings
+
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Innermost frames of threads sitting idle, left out of other threads' samples
+IDLE_LEAVES = {
+    ("thread.py", "_worker"),  # Executor worker waiting for work
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+
+# Request id to profile functions decorated with @profiled under, set by the
+# profiling middleware when only those functions were asked for
+profile_request: ContextVar[Optional[str]] = ContextVar("profile_request", default=None)
+
+@functools.lru_cache(maxsize=4096)
+def frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(BACKEND_ROOT):
+        path = os.path.relpath(path, BACKEND_ROOT)
+    else:
+        path = "/".join(path.split(os.sep)[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+def fold_stack(frame) -> str:
+    """A frame's stack, outermost first, as one line of a folded stack file"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+def is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_LEAVES
+
+class StackSampler(threading.Thread):
+    """
+    Sample the stacks of every thread at a fixed interval until stopped.
+
+    The thread that started the sampler is always recorded, waiting included,
+    so time spent awaiting the database or the solver shows up on the event
+    loop. Other threads are only recorded while busy.
+    """
+
+    def __init__(self, interval: float, max_seconds: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.target = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        deadline = time.monotonic() + self.max_seconds
+        while not self._done.wait(self.interval) and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (ident != self.target and is_idle(frame)):
+                    continue
+                self.stacks[f"{names.get(ident, ident)};{fold_stack(frame)}"] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+class Profile:
+    def __init__(self, request_id: str, name: str, interval: float):
+        self.request_id = request_id
+        self.name = name
+        self.interval = interval
+        self.started = datetime.now(timezone.utc)
+        self.seconds = 0.0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    def folded(self) -> str:
+        """Folded stacks, one "frame;frame;frame count" line each, as flamegraph.pl and speedscope read"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def summary(self) -> Dict:
+        return {
+            'request_id': self.request_id,
+            'name': self.name,
+            'started': self.started.isoformat(),
+            'seconds': self.seconds,
+            'samples': self.samples,
+            'interval_ms': self.interval * 1000,
+        }
+
+class RequestProfiler:
+    """
+    Sampling profiles of single requests, kept by request id.
+
+    Nothing runs unless a profile is asked for: a sampler thread is started
+    for each profiled block and stopped at its end. Samples cover the whole
+    process, so other requests served at the same time on the event loop
+    appear in the profile too.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        interval: float = 0.005,
+        max_seconds: float = 60.0,
+        store_size: int = 50
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.store_size = store_size
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile(self, request_id: str, name: str):
+        """Sample the stacks while the block runs and store them under request_id"""
+        profile = Profile(request_id, name, self.interval)
+        sampler = StackSampler(self.interval, self.max_seconds)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            yield profile
+        finally:
+            sampler.stop()
+            profile.seconds = time.perf_counter() - start
+            profile.samples = sampler.samples
+            profile.stacks = sampler.stacks
+            self.store(profile)
+            print(f"Profiled {name} for request {request_id}: {profile.samples} samples in {profile.seconds:.2f}s")
+
+    def store(self, profile: Profile):
+        with self._lock:
+            self._profiles.pop(profile.request_id, None)
+            self._profiles[profile.request_id] = profile
+            while len(self._profiles) > self.store_size:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def summaries(self) -> List[Dict]:
+        """Stored profiles, newest first"""
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+request_profiler = RequestProfiler(
+    enabled=get_settings().PROFILING_ENABLED,
+    interval=get_settings().PROFILE_INTERVAL_MS / 1000,
+    max_seconds=get_settings().PROFILE_MAX_SECONDS,
+    store_size=get_settings().PROFILE_STORE_SIZE,
+)
+
+def profiled(name: str):
+    """Profile an async function when the current request asked for it, otherwise one context lookup"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            request_id = profile_request.get()
+            if request_id is None:
+                return await fn(*args, **kwargs)
+            with request_profiler.profile(request_id, name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
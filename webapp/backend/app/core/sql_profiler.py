@@ -0,0 +1,246 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import get_settings
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATEMENT_CHARS = 2000
+MAX_STATEMENTS = 500  # Distinct statements aggregated, later ones are only counted
+SLOW_LOG_SIZE = 100
+N_PLUS_ONE_LOG_SIZE = 100
+# Statements EXPLAIN can describe without running them
+EXPLAINED_VERBS = {"SELECT", "WITH", "UPDATE", "DELETE"}
+EXPLAIN_PREFIX = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+# Where the current statement was issued from, set by app.database.execute
+# because async sessions run statements in a greenlet that cannot see the caller
+call_site: ContextVar[Optional[str]] = ContextVar("sql_call_site", default=None)
+# Statements run so far in the current request or script scope
+_scope: ContextVar[Optional["QueryScope"]] = ContextVar("sql_query_scope", default=None)
+
+def describe_frame(frame) -> str:
+    path = os.path.relpath(frame.f_code.co_filename, os.path.dirname(APP_ROOT))
+    return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+def app_call_site() -> str:
+    """The innermost frame of app code on the stack, outside this module and the database helpers"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_ROOT) and not filename.endswith(("sql_profiler.py", "database.py")):
+            return describe_frame(frame)
+        frame = frame.f_back
+    return "unknown"
+
+def normalize_statement(statement: str) -> str:
+    return " ".join(statement.split())[:STATEMENT_CHARS]
+
+class QueryScope:
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Counter = Counter()
+
+class StatementStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.call_sites: Counter = Counter()
+
+class QueryProfiler:
+    """
+    Per-statement latency, row counts and call sites for every engine it is attached to.
+
+    Statements slower than the threshold are logged with their EXPLAIN plan,
+    and a statement run over and over from the same line within one scope
+    (a request, or a script wrapped in query_scope) is flagged as an N+1
+    pattern. When disabled the hooks are never attached.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_seconds: float = 0.2,
+        explain: bool = True,
+        n_plus_one_threshold: int = 10
+    ):
+        self.enabled = enabled
+        self.slow_seconds = slow_seconds
+        self.explain = explain
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.statements: Dict[str, StatementStats] = {}
+            self.untracked = 0
+            self.slow = deque(maxlen=SLOW_LOG_SIZE)
+            self.n_plus_one = deque(maxlen=N_PLUS_ONE_LOG_SIZE)
+            self.since = datetime.now(timezone.utc)
+
+    def instrument(self, engine: Engine):
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("profile_start_time", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["profile_start_time"].pop()
+            rows = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+            self.record(conn, statement, parameters, executemany, elapsed, rows)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if context.connection is not None and context.connection.info.get("profile_start_time"):
+                context.connection.info["profile_start_time"].pop()
+
+    def record(self, conn, statement: str, parameters, executemany: bool, elapsed: float, rows: Optional[int]):
+        key = normalize_statement(statement)
+        site = call_site.get() or app_call_site()
+
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None and len(self.statements) < MAX_STATEMENTS:
+                stats = self.statements[key] = StatementStats()
+            if stats is None:
+                self.untracked += 1
+            else:
+                stats.count += 1
+                stats.seconds += elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                stats.rows += rows or 0
+                stats.call_sites[site] += 1
+
+        scope = _scope.get()
+        if scope is not None:
+            scope.counts[(key, site)] += 1
+
+        if elapsed >= self.slow_seconds:
+            plan = self.explain_plan(conn, statement, parameters) if self.explain and not executemany else None
+            entry = {
+                'at': datetime.now(timezone.utc).isoformat(),
+                'statement': key,
+                'ms': elapsed * 1000,
+                'rows': rows,
+                'call_site': site,
+                'scope': scope.name if scope is not None else None,
+                'plan': plan,
+            }
+            with self._lock:
+                self.slow.append(entry)
+            print(f"Slow query {elapsed * 1000:.1f} ms at {site}: {key[:200]}")
+            if plan:
+                print("\n".join(f"    {line}" for line in plan))
+
+    def explain_plan(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        """The plan of a statement, from a separate cursor so the statement's own results are untouched"""
+        prefix = EXPLAIN_PREFIX.get(conn.dialect.name)
+        verb = statement.split(None, 1)[0].upper() if statement.strip() else ""
+        if prefix is None or verb not in EXPLAINED_VERBS:
+            return None
+
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                return [" ".join(str(value) for value in row) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"EXPLAIN failed: {e}"]
+
+    @contextmanager
+    def scope(self, name: str):
+        """Count statements by call site within a block, flagging N+1 patterns at the end"""
+        if not self.enabled:
+            yield
+            return
+
+        scope = QueryScope(name)
+        token = _scope.set(scope)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+            self.flag_repeats(scope)
+
+    def flag_repeats(self, scope: QueryScope):
+        found = [
+            {
+                'at': datetime.now(timezone.utc).isoformat(),
+                'scope': scope.name,
+                'statement': statement,
+                'call_site': site,
+                'count': count,
+            }
+            for (statement, site), count in scope.counts.items()
+            if count >= self.n_plus_one_threshold
+        ]
+        if not found:
+            return
+
+        with self._lock:
+            self.n_plus_one.extend(found)
+        for entry in found:
+            print(f"N+1 in {scope.name}: {entry['count']} runs at {entry['call_site']}: {entry['statement'][:200]}")
+
+    def report(self, limit: int = 50) -> Dict[str, Any]:
+        """Aggregates by statement, slowest total first, with the slow query and N+1 logs"""
+        with self._lock:
+            statements = sorted(self.statements.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+            return {
+                'enabled': self.enabled,
+                'since': self.since.isoformat(),
+                'slow_query_ms': self.slow_seconds * 1000,
+                'untracked_statements': self.untracked,
+                'statements': [
+                    {
+                        'statement': statement,
+                        'count': stats.count,
+                        'total_ms': stats.seconds * 1000,
+                        'mean_ms': stats.seconds / stats.count * 1000,
+                        'max_ms': stats.max_seconds * 1000,
+                        'rows': stats.rows,
+                        'call_sites': dict(stats.call_sites.most_common(5)),
+                    }
+                    for statement, stats in statements
+                ],
+                'slow': list(self.slow),
+                'n_plus_one': list(self.n_plus_one),
+            }
+
+class QueryScopeMiddleware:
+    """Give each HTTP request its own query scope, so N+1 patterns are found per request"""
+
+    def __init__(self, app, profiler: Optional[QueryProfiler] = None):
+        self.app = app
+        self.profiler = profiler or query_profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.scope(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+query_profiler = QueryProfiler(
+    enabled=get_settings().SQL_PROFILING_ENABLED,
+    slow_seconds=get_settings().SQL_SLOW_QUERY_MS / 1000,
+    explain=get_settings().SQL_EXPLAIN_SLOW,
+    n_plus_one_threshold=get_settings().SQL_N_PLUS_ONE_THRESHOLD,
+)
+query_scope = query_profiler.scope
@@ -1,18 +1,196 @@
+import sys
+import time
+from functools import lru_cache
+from typing import Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+from app.core.config import Settings, get_settings
+from app.core.instrumentation import instrument_engine, metrics
+from app.core.sql_profiler import call_site, describe_frame, query_profiler
 
-SQLALCHEMY_DATABASE_URL = "postgresql://postgres:postgres@db:5432/nhl_fantasy"
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+    engine_label = "sync"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    def _do_get(self):
+        if not metrics.enabled:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.pool_checkout_wait.observe(time.perf_counter() - start, engine=self.engine_label)
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The same for async engines, which need the asyncio-aware queue"""
+    engine_label = "async"
+
+def create_db_engine(settings: Settings | None = None, url: str | None = None) -> Engine:
+    """
+    Create an engine from settings.
+
+    Postgres gets a tuned, instrumented connection pool. SQLite URLs are
+    accepted as a local stand-in for tests and benchmarks: an in-memory
+    database shares a single connection so every session sees the same data.
+    """
+    settings = settings or get_settings()
+    url = make_url(url or settings.DATABASE_URL)
+
+    if url.get_backend_name() == "sqlite":
+        connect_args = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+        else:
+            engine = create_engine(
+                url,
+                connect_args=connect_args,
+                poolclass=InstrumentedQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+    else:
+        if url.drivername == "postgresql":
+            # requirements.txt ships psycopg2, don't depend on the dialect default
+            url = url.set(drivername="postgresql+psycopg2")
+        engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    instrument_engine(engine)
+    query_profiler.instrument(engine)
+    return engine
+
+# Async drivers used for each backend when DATABASE_URL names a sync one
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str | URL) -> URL:
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+def create_async_db_engine(settings: Settings | None = None, url: str | None = None) -> AsyncEngine:
+    """
+    Create an async engine from settings, mirroring create_db_engine.
+
+    Uses ASYNC_DATABASE_URL when set, otherwise DATABASE_URL with its async
+    driver (asyncpg for Postgres, aiosqlite for SQLite).
+    """
+    settings = settings or get_settings()
+    url = make_url(url or settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+    if "+" not in url.drivername or url.drivername.endswith(("+psycopg2", "+pysqlite")):
+        url = to_async_url(url)
+
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            engine = create_async_engine(url, poolclass=StaticPool)
+        else:
+            engine = create_async_engine(
+                url,
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+    else:
+        engine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    instrument_engine(engine.sync_engine)
+    query_profiler.instrument(engine.sync_engine)
+    return engine
+
+# Pools whose usage is exported, by engine label
+monitored_pools: Dict[str, Pool] = {}
+
+def register_pool_metrics(engine: Engine, label: str = "sync"):
+    """Export the engine's pool usage as gauges read at scrape time, labelled by engine"""
+    if hasattr(engine.pool, "checkedout"):
+        monitored_pools[label] = engine.pool
+
+def _pool_gauge(read):
+    return lambda: {(("engine", label),): read(pool) for label, pool in list(monitored_pools.items())}
+
+metrics.register_callback(
+    "nhl_db_pool_in_use", "Connections currently checked out of the pool", "gauge",
+    _pool_gauge(lambda pool: pool.checkedout())
+)
+metrics.register_callback(
+    "nhl_db_pool_size", "Configured pool size, excluding overflow", "gauge",
+    _pool_gauge(lambda pool: pool.size())
+)
+metrics.register_callback(
+    "nhl_db_pool_overflow", "Overflow connections currently open", "gauge",
+    _pool_gauge(lambda pool: max(pool.overflow(), 0))
+)
+
+engine = create_db_engine()
+register_pool_metrics(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+@lru_cache()
+def get_async_session_factory() -> async_sessionmaker:
+    # Built on first use so the async driver is only needed by async callers
+    async_engine = create_async_db_engine()
+    # Request handlers use this engine, so its pool is the one under load
+    register_pool_metrics(async_engine.sync_engine, "async")
+    return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
+
+async def execute(db: Session | AsyncSession, statement):
+    """Run a statement on either a sync Session or an AsyncSession"""
+    if not query_profiler.enabled:
+        if isinstance(db, AsyncSession):
+            return await db.execute(statement)
+        return db.execute(statement)
+
+    # The profiler can't see past the greenlet an async session runs statements in
+    token = call_site.set(describe_frame(sys._getframe(1)))
+    try:
+        if isinstance(db, AsyncSession):
+            return await db.execute(statement)
+        return db.execute(statement)
+    finally:
+        call_site.reset(token)
+
+async def commit(db: Session | AsyncSession):
+    """Commit either a sync Session or an AsyncSession"""
+    if isinstance(db, AsyncSession):
+        await db.commit()
+    else:
+        db.commit()
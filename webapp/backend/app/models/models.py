@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, DateTime, Integer, String, Float, Boolean, ForeignKey, Date, UniqueConstraint
+from sqlalchemy import Column, DateTime, Integer, String, Float, Boolean, ForeignKey, Date, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -9,6 +9,7 @@ class Player(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     team = Column(String)
+    position = Column(String)
     raw_position = Column(String)
     stats = relationship("PlayerStats", back_populates="player")
     salaries = relationship("PlayerSalary", back_populates="player")
@@ -16,6 +17,9 @@ class Player(Base):
 
     __table_args__ = (
         UniqueConstraint('name', 'team', 'position', name='unique_player_identifier'),
+        # Filtered listings walk these in id order for keyset pagination
+        Index('ix_players_team_id', 'team', 'id'),
+        Index('ix_players_position_id', 'position', 'id'),
     )
 
 class PlayerStats(Base):
@@ -32,6 +36,11 @@ class PlayerStats(Base):
 
     player = relationship("Player", back_populates="stats")
 
+    __table_args__ = (
+        Index('ix_player_stats_player_id_date', 'player_id', 'date'),
+        Index('ix_player_stats_date', 'date'),
+    )
+
 class PlayerSalary(Base):
     __tablename__ = "player_salaries"
 
@@ -42,6 +51,10 @@ class PlayerSalary(Base):
 
     player = relationship("Player", back_populates="salaries")
 
+    __table_args__ = (
+        Index('ix_player_salaries_player_id_updated_at', 'player_id', 'updated_at'),
+    )
+
 class PlayerInjury(Base):
     __tablename__ = "player_injuries"
 
@@ -56,6 +69,15 @@ class PlayerInjury(Base):
 
     player = relationship("Player", back_populates="injuries")
 
+    __table_args__ = (
+        # Only active injuries are ever read on the request path
+        Index(
+            'ix_player_injuries_active_player_id', 'player_id',
+            postgresql_where=text('is_active = true'),
+            sqlite_where=text('is_active = 1'),
+        ),
+    )
+
 class TeamStandings(Base):
     __tablename__ = "team_standings"
 
@@ -75,6 +97,9 @@ class LeagueSettings(Base):
     num_goalies = Column(Integer)
     max_players_per_team = Column(Integer, default=5)
     max_defense_per_team = Column(Integer, default=1)
+    min_forwards_per_team = Column(Integer, default=0)
+    max_forwards_per_team = Column(Integer, nullable=True)
     points_goal = Column(Float)
     points_assist = Column(Float)
-    points_goalie_win = Column(Float)
\ No newline at end of file
+    points_goalie_win = Column(Float)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 class PlayerBase(BaseModel):
     name: str
@@ -16,6 +16,23 @@ class Player(PlayerBase):
     class Config:
         from_attributes = True
 
+class PlayerProjection(BaseModel):
+    id: int
+    name: str
+    team: str
+    position: str
+    proj_goals_per_game: float
+    proj_assists_per_game: float
+    games_this_week: int
+    schedule_multiplier: Optional[float] = None
+    proj_fantasy_pts: float
+    salary: float
+    injured: bool
+    injury_status: Optional[str] = None
+
+class PlayerMatch(Player):
+    score: float  # 1 for an exact name match, lower for prefix and fuzzy matches
+
 class PlayerStatsBase(BaseModel):
     date: date
     toi: float
@@ -52,7 +69,7 @@ class LeagueSettingsBase(BaseModel):
 
     # Optional additional settings
     min_forwards_per_team: int = 0  # If you want to require min forwards from same team
-    max_forwards_per_team: int = int | None  # If you want to limit forwards from same team
+    max_forwards_per_team: Optional[int] = None  # If you want to limit forwards from same team
     max_defense_per_team: int = 1  # Your current 1 defenseman per team rule
 
 class LeagueSettingsCreate(LeagueSettingsBase):
@@ -79,3 +96,38 @@ class OptimizedLineup(BaseModel):
     goalies: List[OptimizedPlayer]
     total_points: float
     total_salary: float
+
+class CapSweep(BaseModel):
+    max_cap: float = Field(..., gt=0)  # Highest max_salary_cap, the sweep walks down from here
+    min_cap: float = Field(..., gt=0)
+    step: float = Field(1.0, gt=0)
+    min_salary_cap_pcts: Optional[List[Annotated[float, Field(ge=0, le=1)]]] = None  # Each is swept separately, defaults to the league's
+
+class CapSweepPoint(BaseModel):
+    max_salary_cap: float
+    min_salary_cap_pct: float
+    total_points: float
+    solved: bool  # False when the lineup of a higher cap was proven still optimal
+    lineup: OptimizedLineup
+
+class CapSweepResult(BaseModel):
+    frontier: List[CapSweepPoint]
+    solves: int
+    seconds: float
+
+class PlanSettings(BaseModel):
+    num_weeks: int = Field(4, ge=1, le=26)
+    max_transfers: int = Field(3, ge=0)  # Roster changes allowed between weeks
+    lookahead_weeks: int = Field(2, ge=1)  # Weeks solved together at each step
+    candidates_per_position: int = Field(40, ge=1)  # Players per position considered each step
+    start_date: Optional[date] = None  # Defaults to today
+
+class WeeklyLineup(OptimizedLineup):
+    week_start: date
+    transfers_in: List[int] = []
+    transfers_out: List[int] = []
+
+class LineupPlan(BaseModel):
+    weeks: List[WeeklyLineup]
+    total_points: float
+    total_transfers: int
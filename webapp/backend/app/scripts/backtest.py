@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import os
+from datetime import timedelta
+import pandas as pd
+from app.database import SessionLocal
+from app.api.endpoints.settings import get_default_settings
+from app.core.constants import get_season_start
+from app.schemas import schemas
+from app.services.backtest import BacktestRunner
+from app.services.optimizer import FantasyOptimizer
+from app.services.schedule import ScheduleService
+
+async def load_inputs(season_year: int, settings: schemas.LeagueSettings):
+    """Load a season's stats, results and salaries once for the whole run"""
+    db = SessionLocal()
+    try:
+        season_start = get_season_start(season_year)
+        optimizer = FantasyOptimizer(db=db, settings=settings)
+
+        history = await optimizer.get_player_data(
+            since=pd.to_datetime(season_start).date() - timedelta(days=365)
+        )
+        game_data = await ScheduleService(db).fetch_game_data(season_year, with_results=True)
+        salaries = await optimizer.salary_service.get_player_salaries()
+
+        return history, game_data, salaries, season_start
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest projections and lineups over a past season")
+    parser.add_argument("season", type=int, help="Season end year, e.g. 2024 for 2023-24")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-schedule-multiplier", action="store_true", help="Score every game equally")
+    parser.add_argument("--out-dir", default="backtest_results", help="Where to write the result tables")
+    args = parser.parse_args()
+
+    settings = schemas.LeagueSettings(**asyncio.run(get_default_settings()))
+    history, game_data, salaries, season_start = asyncio.run(load_inputs(args.season, settings))
+
+    runner = BacktestRunner(
+        history=history,
+        game_data=game_data,
+        salaries=salaries,
+        settings=settings,
+        season_start=season_start,
+        use_schedule_multiplier=not args.no_schedule_multiplier,
+    )
+    accuracy, lineups, skipped = runner.run(workers=args.workers)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    accuracy.to_csv(os.path.join(args.out_dir, f"accuracy_{args.season}.csv"), index=False)
+    lineups.to_csv(os.path.join(args.out_dir, f"lineups_{args.season}.csv"), index=False)
+    skipped.to_csv(os.path.join(args.out_dir, f"skipped_{args.season}.csv"), index=False)
+
+    print(accuracy.to_string(index=False))
+    print(lineups.to_string(index=False))
+    if not skipped.empty:
+        print(f"Skipped {len(skipped)} weeks:")
+        print(skipped.to_string(index=False))
+    if not lineups.empty:
+        print(f"Lineup points captured: {lineups['actual_points'].sum() / lineups['hindsight_points'].sum():.1%} of hindsight")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Query-plan regression check for the optimize hot path.
+
+Runs the service queries against a database, asks it for their plans and
+fails when an expected index is not used. By default a scratch SQLite
+database is built through the migrations, so the check also covers them:
+
+    python -m app.scripts.check_query_plans
+    python -m app.scripts.check_query_plans --url postgresql://...
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Dict, List, Set
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from app.api.endpoints.settings import get_default_settings
+from app.database import create_db_engine
+from app.schemas import schemas
+from app.scripts.init_db import init_db
+from app.services.injuries import InjuryService
+from app.services.optimizer import FantasyOptimizer
+from app.services.salary import SalaryService
+
+# Every statement a check issues must use at least one of these indexes
+EXPECTED_INDEXES: Dict[str, Set[str]] = {
+    'player_stats': {'ix_player_stats_date', 'ix_player_stats_player_id_date'},
+    'salaries': {'ix_player_salaries_player_id_updated_at'},
+    'injuries': {'ix_player_injuries_active_player_id'},
+}
+
+async def run_query(name: str, db):
+    if name == 'player_stats':
+        settings = schemas.LeagueSettings(**await get_default_settings())
+        await FantasyOptimizer(db, settings).get_player_data()
+    elif name == 'salaries':
+        await SalaryService(db).get_player_salaries()
+    elif name == 'injuries':
+        await InjuryService(db).read_current_injuries()
+
+def capture_statements(engine: Engine, name: str) -> List[tuple]:
+    """Run one service query and return the statements it executed"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    db = sessionmaker(bind=engine)()
+    try:
+        asyncio.run(run_query(name, db))
+    finally:
+        db.close()
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    return statements
+
+def explain(engine: Engine, statement: str, parameters) -> str:
+    with engine.connect() as conn:
+        if engine.dialect.name == 'sqlite':
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            return "\n".join(row[-1] for row in rows)
+
+        # Tables are small in development, so ask whether an index *can* be
+        # used rather than whether the planner prefers it on this data
+        conn.execute(text("SET enable_seqscan = off"))
+        rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+        return "\n".join(row[0] for row in rows)
+
+def check_query_plans(engine: Engine) -> bool:
+    ok = True
+    for name, indexes in EXPECTED_INDEXES.items():
+        for statement, parameters in capture_statements(engine, name):
+            plan = explain(engine, statement, parameters)
+            used = sorted(index for index in indexes if index in plan)
+            status = 'ok' if used else 'FAIL'
+            print(f"[{status}] {name}: {', '.join(used) or 'no expected index used'}")
+            if not used:
+                print(f"  {statement}\n  " + plan.replace("\n", "\n  "))
+                ok = False
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the hot-path queries use their indexes")
+    parser.add_argument('--url', help="Database to check, defaults to a scratch SQLite database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url
+        if not url:
+            url = f"sqlite:///{os.path.join(tmp, 'plans.db')}"
+            init_db(url)
+
+        engine = create_db_engine(url=url)
+        try:
+            ok = check_query_plans(engine)
+        finally:
+            engine.dispose()
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Generate a synthetic league into a database for benchmarks and local runs.
+
+Fills players, game logs, salaries, injuries and standings, and writes a
+schedule.csv fixture for REFRESH_FIXTURES_DIR so nothing is scraped. The
+same seed and end date always produce the same data.
+
+    python -m app.scripts.generate_synthetic_data --url sqlite:///league.db --fixtures-dir fixtures
+    python -m app.scripts.generate_synthetic_data --url sqlite:///big.db --players-per-team 60 --days 365
+"""
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from itertools import product
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.core.constants import TEAM_ABBREVIATIONS
+from app.database import create_db_engine
+from app.models import models
+from app.scripts.init_db import init_db
+
+FIRST_NAMES = [
+    'Alex', 'Brady', 'Connor', 'Dylan', 'Elias', 'Filip', 'Gabriel', 'Henrik', 'Igor', 'Jack',
+    'Kirill', 'Leon', 'Mathew', 'Nikita', 'Oskar', 'Patrik', 'Quinn', 'Rasmus', 'Sidney', 'Tage',
+    'Uwe', 'Viktor', 'William', 'Yanni', 'Zach', 'Jérôme', 'Mikaël', 'Émile', 'Jesperi', 'Jiří',
+]
+LAST_NAMES = [
+    'Andersson', 'Bouchard', 'Carlson', 'Dahlin', 'Eriksson', 'Forsberg', 'Gaudreau', 'Hughes',
+    'Iginla', 'Jarvis', 'Kapanen', 'Laine', 'MacKinnon', 'Nylander', 'Ovechkin', 'Pastrňák',
+    'Quick', 'Rantanen', 'Stützle', 'Tkachuk', 'Ullmark', 'Vasilevskiy', 'Werenski', 'Zegras',
+    'Bergeron', 'Dubé', 'Lafrenière', 'Slafkovský', 'Šimek', 'Tavares',
+]
+INJURY_STATUSES = ['IR', 'DTD', 'Out', 'LTIR']
+
+def player_names(count: int, rng: np.random.Generator) -> list:
+    """Unique, realistic looking names, numbered once the combinations run out"""
+    combos = [f"{first} {last}" for first, last in product(FIRST_NAMES, LAST_NAMES)]
+    order = rng.permutation(len(combos))
+    return [
+        combos[order[i % len(combos)]] + (f" {i // len(combos) + 1}" if i >= len(combos) else "")
+        for i in range(count)
+    ]
+
+def schedule_fixture(start: date, end: date, rng: np.random.Generator, games_per_day: int = 7) -> pd.DataFrame:
+    """A game schedule in the scraped format, every team playing every other day or so"""
+    teams = list(TEAM_ABBREVIATIONS)
+    games = []
+    day = start
+    while day <= end:
+        order = rng.permutation(teams)
+        games.extend(
+            {'Date': day, 'Visitor': order[k], 'Home': order[k + 1]}
+            for k in range(0, games_per_day * 2, 2)
+        )
+        day += timedelta(days=1)
+    return pd.DataFrame(games)
+
+def generate_league(
+    url: str,
+    fixtures_dir: Optional[str] = None,
+    players_per_team: int = 24,
+    days: int = 180,
+    weeks_ahead: int = 4,
+    injury_rate: float = 0.05,
+    seed: int = 0,
+    end: Optional[date] = None
+) -> Dict[str, int]:
+    """
+    Create the schema at url and fill it with a synthetic league.
+
+    Args:
+        url (str): Database to fill, created through the migrations
+        fixtures_dir (Optional[str]): Where to write schedule.csv, skipped when None
+        players_per_team (int): Skaters per team, two forwards for every defenseman
+        days (int): Days of game logs up to end
+        weeks_ahead (int): Weeks of schedule after end
+        injury_rate (float): Share of players with an active injury
+        seed (int): Random seed
+        end (Optional[date]): Last day of game logs, defaults to today
+
+    Returns:
+        Dict[str, int]: Rows written per table
+    """
+    rng = np.random.default_rng(seed)
+    end = end or date.today()
+    teams = sorted(TEAM_ABBREVIATIONS.values())
+    names = player_names(len(teams) * players_per_team, rng)
+
+    players, stats, salaries, injuries = [], [], [], []
+    log_dates = [end - timedelta(days=day) for day in range(days, 0, -1)]
+    for player_id, name in enumerate(names, start=1):
+        team = teams[(player_id - 1) // players_per_team]
+        position = 'D' if (player_id - 1) % 3 == 2 else 'F'
+        players.append({'id': player_id, 'name': name, 'team': team, 'position': position, 'raw_position': position})
+
+        # Each player has a true scoring rate, and plays most of their team's games
+        goal_rate = rng.gamma(2.0, 0.35 if position == 'F' else 0.12)
+        assist_rate = rng.gamma(2.0, 0.55 if position == 'F' else 0.4)
+        toi = rng.uniform(12, 20) if position == 'F' else rng.uniform(16, 25)
+        played = rng.random(len(log_dates)) < 0.45
+        for day in np.flatnonzero(played):
+            game_toi = max(5.0, rng.normal(toi, 2.5))
+            stats.append({
+                'player_id': player_id,
+                'date': log_dates[day],
+                'toi': round(game_toi, 2),
+                'goals_per_60': round(rng.poisson(goal_rate * game_toi / 60) * 60 / game_toi, 3),
+                'assists_per_60': round(rng.poisson(assist_rate * game_toi / 60) * 60 / game_toi, 3),
+                'shots_per_60': round(rng.gamma(4.0, 2.0), 3),
+                'ixg_per_60': round(rng.gamma(2.0, 0.4), 3),
+            })
+
+        # Salary follows scoring, with an older salary the latest one replaces
+        salary = float(np.clip(1.0 + (goal_rate * 2 + assist_rate) * 4 + rng.normal(0, 1), 0.5, 13.0))
+        salaries.append({'player_id': player_id, 'salary': round(salary * rng.uniform(0.85, 1.15), 2),
+                         'updated_at': datetime.combine(end - timedelta(days=30), datetime.min.time())})
+        salaries.append({'player_id': player_id, 'salary': round(salary, 2),
+                         'updated_at': datetime.combine(end, datetime.min.time())})
+
+        if rng.random() < injury_rate:
+            injuries.append({
+                'player_id': player_id,
+                'status': str(rng.choice(INJURY_STATUSES)),
+                'description': 'Upper body',
+                'expected_return': end + timedelta(days=int(rng.integers(3, 30))),
+                'is_active': True,
+            })
+        elif rng.random() < injury_rate:
+            # Healed injuries stay in the table, inactive
+            injuries.append({
+                'player_id': player_id,
+                'status': 'DTD',
+                'description': 'Lower body',
+                'expected_return': end - timedelta(days=int(rng.integers(1, 30))),
+                'is_active': False,
+            })
+
+    standings = [
+        {'team': team, 'points_percentage': round(float(rng.uniform(0.35, 0.7)), 3)}
+        for team in teams
+    ]
+
+    init_db(url)
+    engine = create_db_engine(url=url)
+    db = sessionmaker(bind=engine)()
+    try:
+        for model, rows in [
+            (models.Player, players),
+            (models.PlayerStats, stats),
+            (models.PlayerSalary, salaries),
+            (models.PlayerInjury, injuries),
+            (models.TeamStandings, standings),
+        ]:
+            if rows:
+                db.execute(insert(model), rows)
+        db.commit()
+    finally:
+        db.close()
+        engine.dispose()
+
+    counts = {
+        'players': len(players),
+        'player_stats': len(stats),
+        'player_salaries': len(salaries),
+        'player_injuries': len(injuries),
+        'team_standings': len(standings),
+    }
+    if fixtures_dir:
+        schedule = schedule_fixture(end - timedelta(days=days), end + timedelta(weeks=weeks_ahead), rng)
+        schedule.to_csv(os.path.join(fixtures_dir, 'schedule.csv'), index=False)
+        counts['schedule'] = len(schedule)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic league for benchmarks and local runs")
+    parser.add_argument('--url', required=True, help="Database to fill, e.g. sqlite:///league.db")
+    parser.add_argument('--fixtures-dir', help="Where to write schedule.csv for REFRESH_FIXTURES_DIR")
+    parser.add_argument('--players-per-team', type=int, default=24)
+    parser.add_argument('--days', type=int, default=180, help="Days of game logs")
+    parser.add_argument('--weeks-ahead', type=int, default=4, help="Weeks of schedule after today")
+    parser.add_argument('--injury-rate', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--end', type=date.fromisoformat, help="Last day of game logs, defaults to today")
+    args = parser.parse_args()
+
+    if args.fixtures_dir:
+        os.makedirs(args.fixtures_dir, exist_ok=True)
+    counts = generate_league(
+        args.url,
+        fixtures_dir=args.fixtures_dir,
+        players_per_team=args.players_per_team,
+        days=args.days,
+        weeks_ahead=args.weeks_ahead,
+        injury_rate=args.injury_rate,
+        seed=args.seed,
+        end=args.end
+    )
+    for table, count in counts.items():
+        print(f"{table:16s} {count:9d}")
+
+if __name__ == "__main__":
+    main()
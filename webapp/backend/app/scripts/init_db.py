@@ -1,12 +1,25 @@
+import os
 import pandas as pd
+from alembic import command
+from alembic.config import Config
 from sqlalchemy.orm import Session
+from app.core.sql_profiler import query_scope
 from app.database import engine, SessionLocal
 from app.models import models
 from datetime import datetime
 
-def init_db():
-    # Create all tables
-    models.Base.metadata.create_all(bind=engine)
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), '..', '..', 'alembic.ini')
+
+def get_alembic_config(url: str = None) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option('script_location', os.path.join(os.path.dirname(ALEMBIC_INI), 'migrations'))
+    if url:
+        config.set_main_option('sqlalchemy.url', url)
+    return config
+
+def init_db(url: str = None):
+    # Create or upgrade all tables through the migrations
+    command.upgrade(get_alembic_config(url), 'head')
 
 def seed_salary_data():
     df = pd.read_csv('nhl_players.csv')
@@ -53,4 +66,6 @@ if __name__ == "__main__":
     print("Initializing database...")
     init_db()
     print("Seeding salary data...")
-    seed_salary_data()
\ No newline at end of file
+    # Reports the per-row player lookups as N+1 when SQL profiling is on
+    with query_scope("seed_salary_data"):
+        seed_salary_data()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Replay captured optimize problems offline.
+
+With CAPTURE_DIR set, every solve writes its full input to a bundle. This
+rebuilds each problem from its bundle, solves it again with the captured
+or another solver and reports the timing and whether the lineup matches:
+
+    python -m app.scripts.replay_bundles captures/
+    python -m app.scripts.replay_bundles captures/20250112T*.json.gz --solver HiGHS --repeat 5
+    python -m app.scripts.replay_bundles captures/ --json > replay.json
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+import pulp
+from app.core.config import get_settings
+from app.schemas import schemas
+from app.services.capture import bundle_pool, read_bundle
+from app.services.optimizer import FantasyOptimizer
+
+def bundle_paths(paths: List[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(glob.glob(os.path.join(path, '*.json.gz'))))
+        else:
+            found.append(path)
+    return found
+
+def make_solver(bundle: Dict[str, Any], name: Optional[str], time_limit: Optional[float]) -> pulp.LpSolver:
+    """The captured solver, or the named backend with the captured options that apply to it"""
+    if name is None:
+        options = dict(bundle['solver'])
+    else:
+        options = {'solver': name, 'msg': False, 'warmStart': bundle['solver'].get('warmStart', False)}
+    if time_limit is not None:
+        options['timeLimit'] = time_limit
+    return pulp.getSolverFromDict(options)
+
+async def replay(path: str, solver_name: Optional[str], repeat: int, time_limit: Optional[float]) -> Dict[str, Any]:
+    bundle = read_bundle(path)
+    df = bundle_pool(bundle)
+    optimizer = FantasyOptimizer(
+        None,
+        schemas.LeagueSettings(**bundle['settings']),
+        bundle['exclude_players'],
+        bundle['force_players']
+    )
+
+    timings = []
+    for _ in range(repeat):
+        solver = make_solver(bundle, solver_name, time_limit)
+        start = time.perf_counter()
+        lineup = await optimizer.select_best_team(df, warm_start=bundle['warm_start'], solver=solver)
+        timings.append(time.perf_counter() - start)
+
+    captured = bundle['result']
+    total_points = float(lineup['proj_fantasy_pts'].sum())
+    return {
+        'bundle': os.path.basename(path),
+        'as_of': bundle['as_of'],
+        'players': len(df),
+        'solver': solver.name,
+        'seconds': statistics.median(timings),
+        'captured_seconds': captured['seconds'],
+        'total_points': total_points,
+        'captured_points': captured['total_points'],
+        'same_lineup': sorted(lineup['player_id'].tolist()) == sorted(captured['player_ids']),
+    }
+
+async def replay_all(args) -> List[Dict[str, Any]]:
+    results = []
+    for path in bundle_paths(args.paths):
+        try:
+            results.append(await replay(path, args.solver, args.repeat, args.time_limit))
+        except Exception as e:
+            print(f"Error replaying {path}: {e}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help="Bundle files or directories of bundles")
+    parser.add_argument('--solver', help=f"PuLP solver to use instead of the captured one: {', '.join(pulp.listSolvers())}")
+    parser.add_argument('--repeat', type=int, default=1, help="Solves per bundle, the median time is reported")
+    parser.add_argument('--time-limit', type=float, help="Solver time limit in seconds")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    # Replays would otherwise be captured again into the corpus
+    get_settings().CAPTURE_DIR = None
+    results = asyncio.run(replay_all(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'bundle':32s} {'players':>7s} {'solver':>14s} {'ms':>9s} {'captured':>9s} {'points':>8s}  same")
+    for result in results:
+        print(
+            f"{result['bundle']:32s} {result['players']:7d} {result['solver']:>14s} "
+            f"{result['seconds'] * 1000:9.1f} {result['captured_seconds'] * 1000:9.1f} "
+            f"{result['total_points']:8.2f}  {'yes' if result['same_lineup'] else 'NO'}"
+        )
+    if results:
+        print(f"total {sum(result['seconds'] for result in results) * 1000:.1f} ms over {len(results)} bundles")
+
+if __name__ == "__main__":
+    main()
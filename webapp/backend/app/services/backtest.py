@@ -0,0 +1,273 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.constants import SHUTOUT, TEAM_ABBREVIATIONS
+from app.schemas import schemas
+from .optimizer import FantasyOptimizer
+from .projections import ProjectionService
+from .schedule_strength import ScheduleMatrix
+
+# Read-only inputs shared by every week of a backtest run. Under fork the
+# parent fills this before the pool starts so workers inherit it without
+# copying; under spawn the worker initializer receives it once per process.
+_shared_inputs: Dict[str, Any] = {}
+
+def _init_worker(inputs: Dict[str, Any]):
+    _shared_inputs.update(inputs)
+
+def _run_week(week_start: date) -> Dict[str, dict]:
+    return asyncio.run(backtest_week(week_start, **_shared_inputs))
+
+def standings_as_of(game_data: pd.DataFrame, as_of: date) -> pd.DataFrame:
+    """Points percentage per team from results of games played before as_of"""
+    played = game_data[(game_data['Date'] < as_of) & game_data['HomeGoals'].notna()]
+    if played.empty:
+        return pd.DataFrame(columns=['Team', 'PTS%'])
+
+    home_win = played['HomeGoals'] > played['VisitorGoals']
+    results = pd.concat([
+        pd.DataFrame({'Team': played['Home'], 'Win': home_win}),
+        pd.DataFrame({'Team': played['Visitor'], 'Win': ~home_win}),
+    ])
+
+    # Smoothed toward .500 so early-season records never divide by zero
+    grouped = results.groupby('Team')['Win']
+    standings = ((grouped.sum() + 1) / (grouped.count() + 2)).rename('PTS%').reset_index()
+    standings['Team'] = standings['Team'].map(TEAM_ABBREVIATIONS)
+
+    return standings.dropna(subset=['Team'])
+
+def salaries_as_of(salaries: pd.DataFrame, as_of: date) -> pd.DataFrame:
+    """
+    Latest salary known before as_of. Players first priced later are left
+    out, so they cannot be picked that week.
+    """
+    if 'updated_at' not in salaries.columns:
+        return salaries
+
+    ordered = salaries.assign(
+        updated_at=pd.to_datetime(salaries['updated_at'], utc=True).dt.tz_localize(None)
+    ).sort_values('updated_at')
+    known = ordered[ordered['updated_at'] < pd.Timestamp(as_of)]
+
+    return known.drop_duplicates(['Player', 'Team'], keep='last')
+
+def actual_week_points(
+    history: pd.DataFrame,
+    game_data: pd.DataFrame,
+    week_dates: List[date],
+    settings: schemas.LeagueSettings
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    Score what actually happened in a week.
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: Skater points keyed by (Player, Team) and
+        team goaltending points keyed by team abbreviation
+    """
+    played = history[history['Date'].dt.date.isin(week_dates)]
+    minutes = played['TOI/GP'] / 60
+    skater_points = (
+        (played['Goals/60'] * minutes * settings.points_goal +
+        played['Total Assists/60'] * minutes * settings.points_assist)
+        .groupby([played['Player'], played['Team']])
+        .sum()
+    )
+
+    games = game_data[game_data['Date'].isin(week_dates) & game_data['HomeGoals'].notna()]
+    shutout_points = getattr(settings, 'points_shutout', SHUTOUT)
+    goalie_rows = pd.concat([
+        pd.DataFrame({
+            'Team': games['Home'],
+            'Points': (games['HomeGoals'] > games['VisitorGoals']) * settings.points_goalie_win
+                + (games['VisitorGoals'] == 0) * shutout_points,
+        }),
+        pd.DataFrame({
+            'Team': games['Visitor'],
+            'Points': (games['VisitorGoals'] > games['HomeGoals']) * settings.points_goalie_win
+                + (games['HomeGoals'] == 0) * shutout_points,
+        }),
+    ])
+    goalie_points = goalie_rows.groupby(goalie_rows['Team'].map(TEAM_ABBREVIATIONS))['Points'].sum()
+
+    return skater_points, goalie_points
+
+async def backtest_week(
+    week_start: date,
+    history: pd.DataFrame,
+    game_data: pd.DataFrame,
+    salaries: pd.DataFrame,
+    settings: schemas.LeagueSettings,
+    season_start: str,
+    use_schedule_multiplier: bool = True,
+) -> Optional[Dict[str, dict]]:
+    """
+    Replay one week: project with data known before week_start, pick a lineup
+    and score it against what actually happened that week.
+
+    Returns:
+        Dict[str, dict]: Projection accuracy and lineup score rows, or a
+        skipped row with the reason when the week cannot be replayed
+    """
+    week_dates = [week_start + timedelta(days=d) for d in range(7)]
+
+    def skipped(reason: str) -> Dict[str, dict]:
+        return {'skipped': {'week_start': week_start, 'reason': reason}}
+
+    optimizer = FantasyOptimizer(db=None, settings=settings)
+    optimizer.projection_service = ProjectionService(None, season_start, as_of=week_start)
+
+    known = history[history['Date'] < pd.Timestamp(week_start)]
+    if known.empty:
+        return skipped("No player stats before the week")
+
+    priced = salaries_as_of(salaries, week_start)
+    try:
+        pool = await optimizer.assemble_player_pool(known.copy(), pd.DataFrame(), priced)
+    except ValueError as e:
+        return skipped(str(e))
+
+    # Schedule impact as it looked at the start of the week
+    matrix = ScheduleMatrix(game_data, standings_as_of(game_data, week_start))
+    games_count, multipliers, expected_wins = matrix.window(week_dates[0], week_dates[-1])
+    if not games_count:
+        return skipped("No games that week")
+
+    if not use_schedule_multiplier:
+        multipliers = {team: 1.0 for team in games_count}
+        expected_wins = None
+
+    skaters = optimizer.apply_schedule(pool, games_count, multipliers)
+    skaters = skaters[skaters['games_this_week'] > 0]
+    goalies = await optimizer.build_goalie_pool(games_count, multipliers, expected_wins)
+    final_df = pd.concat([skaters, goalies], ignore_index=True)
+
+    # Score against actual results
+    skater_points, goalie_points = actual_week_points(history, game_data, week_dates, settings)
+    final_df['actual_pts'] = np.where(
+        final_df['Position'] == 'G',
+        final_df['Team'].map(goalie_points),
+        pd.MultiIndex.from_frame(final_df[['Player', 'Team']]).map(skater_points),
+    )
+    final_df['actual_pts'] = final_df['actual_pts'].astype(float).fillna(0)
+
+    lineup = await optimizer.select_best_team(final_df)
+    hindsight = await optimizer.select_best_team(final_df.assign(proj_fantasy_pts=final_df['actual_pts']))
+
+    scored = final_df[final_df['Position'] != 'G']
+    error = scored['proj_fantasy_pts'] - scored['actual_pts']
+
+    return {
+        'accuracy': {
+            'week_start': week_start,
+            'players': len(scored),
+            # Players with stats but no salary yet, left out of the week
+            'unpriced_players': int(known[['Player', 'Team']].drop_duplicates().merge(
+                priced[['Player', 'Team']].drop_duplicates(), how='left', indicator=True
+            )['_merge'].eq('left_only').sum()),
+            'mae': float(error.abs().mean()),
+            'rmse': float(np.sqrt((error ** 2).mean())),
+            'bias': float(error.mean()),
+            'correlation': float(scored['proj_fantasy_pts'].corr(scored['actual_pts'])),
+        },
+        'lineup': {
+            'week_start': week_start,
+            'projected_points': float(lineup['proj_fantasy_pts'].sum()),
+            'actual_points': float(lineup['actual_pts'].sum()),
+            'hindsight_points': float(hindsight['actual_pts'].sum()),
+            'total_salary': float(lineup['pv'].sum()),
+        },
+    }
+
+class BacktestRunner:
+    """
+    Replay a past season week by week across a process pool.
+
+    Every week only sees player stats and results from before its start
+    date. The inputs are loaded once and shared read-only with the workers.
+    """
+
+    def __init__(
+        self,
+        history: pd.DataFrame,
+        game_data: pd.DataFrame,
+        salaries: pd.DataFrame,
+        settings: schemas.LeagueSettings,
+        season_start: str,
+        use_schedule_multiplier: bool = True,
+    ):
+        history = history.copy()
+        history['Date'] = pd.to_datetime(history['Date'])
+
+        self.inputs = {
+            'history': history,
+            'game_data': game_data,
+            'salaries': salaries,
+            'settings': settings,
+            'season_start': season_start,
+            'use_schedule_multiplier': use_schedule_multiplier,
+        }
+
+    def get_week_starts(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[date]:
+        """Weekly start dates from the first played game (plus a week of history) to the last"""
+        played = self.inputs['game_data'].dropna(subset=['HomeGoals'])['Date']
+        if played.empty:
+            return []
+
+        start_date = start_date or played.min() + timedelta(days=7)
+        end_date = end_date or played.max()
+
+        week_starts = []
+        while start_date <= end_date:
+            week_starts.append(start_date)
+            start_date += timedelta(days=7)
+
+        return week_starts
+
+    def run(
+        self,
+        week_starts: Optional[List[date]] = None,
+        workers: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Backtest every week and collect the results.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]: Per-week projection
+            accuracy, per-week lineup scores and the weeks skipped with why
+        """
+        week_starts = week_starts or self.get_week_starts()
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+            _shared_inputs.update(self.inputs)
+            initializer, initargs = None, ()
+        else:
+            context = multiprocessing.get_context('spawn')
+            initializer, initargs = _init_worker, (self.inputs,)
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=initializer,
+                initargs=initargs
+            ) as executor:
+                results = list(executor.map(_run_week, week_starts))
+        finally:
+            _shared_inputs.clear()
+
+        accuracy = pd.DataFrame([result['accuracy'] for result in results if 'accuracy' in result])
+        lineups = pd.DataFrame([result['lineup'] for result in results if 'lineup' in result])
+        skipped = pd.DataFrame(
+            [result['skipped'] for result in results if 'skipped' in result],
+            columns=['week_start', 'reason']
+        )
+
+        return accuracy, lineups, skipped
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from typing import List, NamedTuple, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import pulp
+import pandas as pd
+from app.schemas import schemas
+from app.core.instrumentation import instrumented
+from .constraints import ConstraintTemplate
+from .optimizer import FantasyOptimizer
+
+MAX_SWEEP_CAPS = 200
+# Salaries are compared with this much slack against floating point drift
+SALARY_TOLERANCE = 1e-6
+
+class Solution(NamedTuple):
+    selected: List  # Pool indices
+    salary: float
+
+class SalaryCapSweep:
+    """
+    Best lineup at each salary cap in a range, from one pool and one model.
+
+    Caps are walked from the highest down. Each step only changes the salary
+    bounds of the model built for the first one, and the solver starts from
+    the previous lineup. Many steps need no solve at all: the best lineup
+    under the cap alone, ignoring the salary floor, stays best for every
+    lower cap it still fits under, so when it also clears that cap's floor
+    it is provably the answer. That lineup does not depend on the floor, so
+    it is solved once per cap and shared by every min_salary_cap_pct.
+    """
+
+    def __init__(
+            self,
+            db: Session | AsyncSession,
+            settings: schemas.LeagueSettings,
+            sweep: schemas.CapSweep,
+            exclude_players: Optional[List[int]] = None,
+            force_players: Optional[List[int]] = None,
+            template: Optional[ConstraintTemplate] = None,
+    ):
+        if sweep.min_cap > sweep.max_cap:
+            raise ValueError("min_cap is above max_cap")
+        count = int((sweep.max_cap - sweep.min_cap) / sweep.step + SALARY_TOLERANCE) + 1
+        pcts = sweep.min_salary_cap_pcts or [settings.min_salary_cap_pct]
+        if count * len(pcts) > MAX_SWEEP_CAPS:
+            raise ValueError(
+                f"The sweep has {count} caps for {len(pcts)} salary floors, "
+                f"at most {MAX_SWEEP_CAPS} points are allowed"
+            )
+
+        self.caps = [round(sweep.max_cap - k * sweep.step, 6) for k in range(count)]
+        self.pcts = pcts
+        self.optimizer = FantasyOptimizer(
+            db=db,
+            settings=settings,
+            exclude_players=exclude_players,
+            force_players=force_players,
+            template=template
+        )
+        self.solves = 0
+
+    async def solve(
+        self,
+        prob: pulp.LpProblem,
+        player_vars,
+        df: pd.DataFrame,
+        cap: float,
+        floor: float,
+        start: Optional[Solution]
+    ) -> Optional[Solution]:
+        """Solve with the given salary bounds, None when no lineup fits them"""
+        prob.constraints["salary_max"].changeRHS(cap)
+        prob.constraints["salary_min"].changeRHS(floor)
+
+        warm = start is not None and floor - SALARY_TOLERANCE <= start.salary <= cap + SALARY_TOLERANCE
+        if warm:
+            starting = set(start.selected)
+            for i in df.index:
+                player_vars[i].setInitialValue(1 if i in starting else 0)
+
+        self.solves += 1
+        await asyncio.to_thread(prob.solve, pulp.PULP_CBC_CMD(msg=False, warmStart=warm))
+        if prob.status != pulp.LpStatusOptimal:
+            return None
+
+        selected = [i for i in df.index if player_vars[i].varValue > 0.5]
+        return Solution(selected, float(df.loc[selected, 'pv'].sum()))
+
+    @instrumented("cap_sweep")
+    async def sweep(self) -> schemas.CapSweepResult:
+        """Main sweep function"""
+        try:
+            start = time.perf_counter()
+            df = await self.optimizer.build_week_pool()
+            prob, player_vars = self.optimizer.build_problem(df)
+
+            # Per min_salary_cap_pct: its points, and its lineup at the previous cap
+            frontiers: List[List[schemas.CapSweepPoint]] = [[] for _ in self.pcts]
+            previous: List[Optional[Solution]] = [None for _ in self.pcts]
+            lineups: List[Optional[schemas.OptimizedLineup]] = [None for _ in self.pcts]
+            # Best lineup under a cap at or above the current one with no salary floor
+            relaxed: Optional[Solution] = None
+
+            for cap in self.caps:
+                resolved = relaxed is None or relaxed.salary > cap + SALARY_TOLERANCE
+                if resolved:
+                    fits = [solution for solution in previous if solution is not None and solution.salary <= cap]
+                    relaxed = await self.solve(prob, player_vars, df, cap, 0.0, fits[0] if fits else None)
+                    if relaxed is None:
+                        # Nothing fits under this cap, or any lower one
+                        break
+
+                for k, pct in enumerate(self.pcts):
+                    floor = cap * pct
+                    if relaxed.salary >= floor - SALARY_TOLERANCE:
+                        best, solved = relaxed, resolved
+                    else:
+                        best, solved = await self.solve(prob, player_vars, df, cap, floor, previous[k]), True
+                        if best is None:
+                            continue
+
+                    if best is not previous[k]:
+                        lineups[k] = self.optimizer.format_lineup(df.loc[best.selected])
+                    frontiers[k].append(schemas.CapSweepPoint(
+                        max_salary_cap=cap,
+                        min_salary_cap_pct=pct,
+                        total_points=lineups[k].total_points,
+                        solved=solved,
+                        lineup=lineups[k],
+                    ))
+                    previous[k] = best
+
+            return schemas.CapSweepResult(
+                frontier=[point for points in frontiers for point in points],
+                solves=self.solves,
+                seconds=time.perf_counter() - start,
+            )
+
+        except Exception as e:
+            raise ValueError(f"Salary cap sweep failed: {str(e)}")
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+import random
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from app.core.config import get_settings
+
+BUNDLE_FORMAT = 1
+# Everything select_best_team and format_lineup read from the pool
+BUNDLE_COLUMNS = ['player_id', 'Player', 'Team', 'Position', 'pv', 'proj_fantasy_pts', 'games_this_week']
+
+def capture_enabled() -> bool:
+    """Whether to capture this solve, CAPTURE_DIR turns capture on and the sample rate thins it out"""
+    settings = get_settings()
+    return bool(settings.CAPTURE_DIR) and random.random() < settings.CAPTURE_SAMPLE_RATE
+
+def make_bundle(
+    optimizer,
+    df: pd.DataFrame,
+    warm_start: Optional[List[int]],
+    solver_options: Dict[str, Any],
+    lineup: pd.DataFrame,
+    status: str,
+    seconds: float
+) -> Dict[str, Any]:
+    """
+    Everything needed to re-run one solve without the database or the schedule.
+
+    The pool keeps its index, which names the solver variables, so a replay
+    builds exactly the same problem.
+    """
+    columns = [column for column in BUNDLE_COLUMNS if column in df.columns]
+    pool = df[columns]
+    return {
+        'format': BUNDLE_FORMAT,
+        'captured_at': datetime.now(timezone.utc).isoformat(),
+        'as_of': date.today().isoformat(),
+        'settings': optimizer.settings.model_dump(),
+        'exclude_players': list(optimizer.exclude_players),
+        'force_players': list(optimizer.force_players),
+        'warm_start': warm_start,
+        'solver': solver_options,
+        'pool': {
+            'index': pool.index.tolist(),
+            'columns': {column: pool[column].tolist() for column in columns},
+        },
+        'result': {
+            'status': status,
+            'player_ids': lineup['player_id'].tolist(),
+            'total_points': float(lineup['proj_fantasy_pts'].sum()),
+            'seconds': seconds,  # Building and solving the problem
+        },
+    }
+
+def write_bundle(bundle: Dict[str, Any], directory: str) -> str:
+    """Write a bundle as gzipped JSON, named so a directory listing sorts by capture time"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(directory, f"{stamp}-{uuid.uuid4().hex[:8]}.json.gz")
+    with gzip.open(path, 'wt') as f:
+        json.dump(bundle, f, separators=(',', ':'))
+    return path
+
+def read_bundle(path: str) -> Dict[str, Any]:
+    with gzip.open(path, 'rt') as f:
+        bundle = json.load(f)
+    if bundle.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported bundle format {bundle.get('format')} in {path}")
+    return bundle
+
+def bundle_pool(bundle: Dict[str, Any]) -> pd.DataFrame:
+    """The solver input of a bundle, with its original index"""
+    pool = bundle['pool']
+    return pd.DataFrame(pool['columns'], index=pool['index'])
+
+def capture_solve(optimizer, df, warm_start, solver_options, lineup, status, seconds):
+    """Write a bundle for a finished solve, capture failures never fail the request"""
+    try:
+        bundle = make_bundle(optimizer, df, warm_start, solver_options, lineup, status, seconds)
+        write_bundle(bundle, get_settings().CAPTURE_DIR)
+    except Exception as e:
+        print(f"Error capturing solver bundle: {e}")
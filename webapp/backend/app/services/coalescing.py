@@ -0,0 +1,77 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from app.core.instrumentation import metrics
+from app.schemas import schemas
+
+class SingleFlight:
+    """
+    Share one in-flight computation between concurrent callers with the same key.
+
+    The first caller for a key starts the work, callers arriving before it
+    finishes await the same result (or exception). Nothing is cached once the
+    work completes.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the run already in flight for it"""
+        self.requests += 1
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shielded so one caller going away does not cancel the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every caller left
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+def optimize_request_key(
+    settings: schemas.LeagueSettings,
+    exclude_players: Optional[List[int]] = None,
+    force_players: Optional[List[int]] = None
+) -> str:
+    """Canonical key for an optimize request, independent of field and list order"""
+    return json.dumps({
+        "settings": settings.model_dump(exclude={"id"}),
+        "exclude": sorted(set(exclude_players or [])),
+        "force": sorted(set(force_players or [])),
+    }, sort_keys=True, default=str)
+
+optimize_flight = SingleFlight()
+
+metrics.register_callback(
+    "nhl_optimize_requests_total", "Optimize requests received", "counter",
+    lambda: {(): optimize_flight.requests}
+)
+metrics.register_callback(
+    "nhl_optimize_coalesced_total", "Optimize requests served by another request's run", "counter",
+    lambda: {(): optimize_flight.coalesced}
+)
+metrics.register_callback(
+    "nhl_optimize_in_flight", "Optimize runs currently in progress", "gauge",
+    lambda: {(): len(optimize_flight._in_flight)}
+)
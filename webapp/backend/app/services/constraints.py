@@ -0,0 +1,73 @@
+from typing import Dict, List, NamedTuple, Optional
+import pulp
+import pandas as pd
+from app.schemas import schemas
+
+class TeamCap(NamedTuple):
+    prefix: str  # Constraint names are prefix_TEAM
+    position: Optional[str]  # None caps every position together
+    limit: int
+
+class ConstraintTemplate:
+    """
+    The roster and salary rules of a league, compiled once from its settings.
+
+    Binding it to a week's pool only groups the pool by position and team
+    and writes each rule as one expression over those groups, instead of
+    filtering the pool once per rule and team.
+    """
+
+    def __init__(self, salary_min: float, salary_max: float, positions: Dict[str, int], team_caps: List[TeamCap]):
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.positions = positions
+        self.team_caps = team_caps
+
+    @classmethod
+    def compile(cls, settings: schemas.LeagueSettings) -> "ConstraintTemplate":
+        team_caps = [TeamCap("team", None, settings.max_players_per_team)]
+        if settings.max_defense_per_team:
+            team_caps.append(TeamCap("team_defense", "D", settings.max_defense_per_team))
+        if settings.max_forwards_per_team:
+            team_caps.append(TeamCap("team_forwards", "F", settings.max_forwards_per_team))
+
+        return cls(
+            salary_min=settings.max_salary_cap * settings.min_salary_cap_pct,
+            salary_max=settings.max_salary_cap,
+            positions={'F': settings.num_forwards, 'D': settings.num_defense, 'G': settings.num_goalies},
+            team_caps=team_caps,
+        )
+
+    def bind(self, prob: pulp.LpProblem, df: pd.DataFrame, player_vars, name: str = ""):
+        """Add the rules for one lineup drawn from df to the problem"""
+        variables = [player_vars[i] for i in df.index]
+
+        def total(positions, coefficients=None) -> pulp.LpAffineExpression:
+            if coefficients is None:
+                return pulp.LpAffineExpression([(variables[p], 1) for p in positions])
+            return pulp.LpAffineExpression([(variables[p], coefficients[p]) for p in positions])
+
+        def add(expression, sense, constraint_name, rhs):
+            prob.addConstraint(pulp.LpConstraint(expression, sense, f"{constraint_name}{name}", rhs))
+
+        # Salary cap
+        everyone = range(len(variables))
+        salaries = df['pv'].tolist()
+        add(total(everyone, salaries), pulp.LpConstraintLE, "salary_max", self.salary_max)
+        add(total(everyone, salaries), pulp.LpConstraintGE, "salary_min", self.salary_min)
+
+        # Position requirements
+        by_position = df.groupby('Position', sort=False).indices
+        for position, constraint_name in (('F', "forwards"), ('D', "defense"), ('G', "goalies")):
+            add(total(by_position.get(position, [])), pulp.LpConstraintEQ, constraint_name, self.positions[position])
+
+        # Players per team, overall and for capped positions
+        by_team = df.groupby('Team', sort=False).indices
+        by_team_position = df.groupby(['Team', 'Position'], sort=False).indices
+        for cap in self.team_caps:
+            for team, positions in by_team.items():
+                if cap.position is not None:
+                    positions = by_team_position.get((team, cap.position))
+                    if positions is None:
+                        continue
+                add(total(positions), pulp.LpConstraintLE, f"{cap.prefix}_{team}", cap.limit)
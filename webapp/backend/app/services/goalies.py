@@ -1,12 +1,18 @@
 from sqlalchemy.orm import Session
 import pandas as pd
-from typing import Dict, Tuple
-from ..core.constants import GOALIE_WIN, SHUTOUT, OT_LOSS
+from typing import Dict, Optional, Tuple
+from ..core.constants import GOALIE_WIN, SHUTOUT, OT_LOSS, TEAM_ABBREVIATIONS
+from ..core.instrumentation import instrumented
+
+# Team goaltending has no row in the players table, so each team gets a
+# stable negative id that can be forced, excluded or tracked across weeks
+GOALIE_IDS = {team: -(i + 1) for i, team in enumerate(sorted(TEAM_ABBREVIATIONS.values()))}
 
 class GoalieService:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrumented("estimate_goaltending")
     async def estimate_team_goaltending_points(
         self,
         multipliers: Dict[str, float],
@@ -15,7 +21,8 @@ class GoalieService:
         shutout_bonus: float = SHUTOUT,
         ot_loss_points: float = OT_LOSS,
         avg_shutout_freq: float = 0.05,
-        avg_ot_loss_freq: float = 0.1
+        avg_ot_loss_freq: float = 0.1,
+        expected_wins: Optional[Dict[str, float]] = None
     ) -> Dict[str, Tuple[float, int]]:
         """
         Calculate projected goalie points for each team
@@ -28,6 +35,8 @@ class GoalieService:
         ot_loss_points (float): Points for OT loss
         avg_shutout_freq (float): Average frequency of shutouts
         avg_ot_loss_freq (float): Average frequency of OT losses
+        expected_wins (Optional[Dict[str, float]]): Opponent-aware expected wins
+            per team, replacing the multiplier estimate when given
 
         Returns:
             Dict[str, Tuple[float, int]]: Team goalie projections and games
@@ -37,8 +46,11 @@ class GoalieService:
         for team, multiplier in multipliers.items():
             games = games_count.get(team, 0)
 
-            # Estimate wins based on multiplier (inverse relation)
-            projected_wins = games / multiplier if multiplier > 0 else 0
+            if expected_wins is not None and team in expected_wins:
+                projected_wins = expected_wins[team]
+            else:
+                # Estimate wins based on multiplier (inverse relation)
+                projected_wins = games / multiplier if multiplier > 0 else 0
             projected_shutouts = games * avg_shutout_freq
 
             total_points = (
@@ -59,6 +71,7 @@ class GoalieService:
         goalie_rows = []
         for team, (points, games) in goalie_data.items():
             goalie_rows.append({
+                'player_id': GOALIE_IDS.get(team, -(len(GOALIE_IDS) + len(goalie_rows) + 1)),
                 'Player': f"{team} Goaltending",
                 'Team': team,
                 'Position': 'G',
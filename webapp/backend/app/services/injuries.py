@@ -1,25 +1,38 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import pandas as pd
 from datetime import datetime
+from ..database import execute
 from ..models import models
+from ..core.instrumentation import instrumented
+from .snapshots import data_snapshots
 
 class InjuryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
+    @instrumented("get_current_injuries")
     async def get_current_injuries(self) -> pd.DataFrame:
+        """Get active injuries, from the background snapshot when there is one"""
+        snapshot = data_snapshots.get('injuries')
+        if snapshot is not None:
+            return snapshot
+
+        return await self.read_current_injuries()
+
+    async def read_current_injuries(self) -> pd.DataFrame:
         """Get active injuries with player information"""
-        active_injuries = (
-            self.db.query(models.Player)
-            .join(models.PlayerInjury)
-            .filter(models.PlayerInjury.is_active == True)
-            .with_entities(
+        active_injuries = await execute(
+            self.db,
+            select(
                 models.Player.name.label('Player'),
                 models.Player.team.label('Team'),
                 models.PlayerInjury.status.label('Injury Status'),
                 models.PlayerInjury.expected_return.label('Expected Return')
             )
-            .all()
+            .join(models.PlayerInjury)
+            .where(models.PlayerInjury.is_active == True)
         )
 
-        return pd.DataFrame(active_injuries)
\ No newline at end of file
+        return pd.DataFrame(active_injuries.all())
\ No newline at end of file
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..database import commit, execute
+from ..models import models
+from ..schemas import schemas
+
+# Settings stored as columns of league_settings
+SETTINGS_FIELDS = list(schemas.LeagueSettingsBase.model_fields)
+
+class LeagueSettingsService:
+    def __init__(self, db: Session | AsyncSession):
+        self.db = db
+
+    async def get(self, league_id: int) -> Optional[models.LeagueSettings]:
+        result = await execute(self.db, select(models.LeagueSettings).where(models.LeagueSettings.id == league_id))
+        return result.scalar_one_or_none()
+
+    async def save(self, settings: schemas.LeagueSettings) -> models.LeagueSettings:
+        """
+        Store a league's settings, updating the league when settings.id is
+        given and creating a new one otherwise.
+        """
+        row = await self.get(settings.id) if settings.id is not None else None
+        if row is None:
+            row = models.LeagueSettings(id=settings.id)
+            self.db.add(row)
+
+        for field in SETTINGS_FIELDS:
+            setattr(row, field, getattr(settings, field))
+        # Naive UTC, as the column reads back, so the saved row matches later reads
+        row.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        await commit(self.db)
+        return row
+
+def settings_of(row: models.LeagueSettings) -> schemas.LeagueSettings:
+    # Columns left empty by older rows take the schema defaults
+    values = {field: getattr(row, field) for field in SETTINGS_FIELDS if getattr(row, field) is not None}
+    return schemas.LeagueSettings(id=row.id, **values)
+
+class LeagueTemplates:
+    """
+    Settings and compiled constraint templates of saved leagues, by league id.
+
+    Each lookup reads the league's row, so a league saved through another
+    worker is seen at once, and recompiles only when its updated_at moved.
+    """
+
+    def __init__(self):
+        self._compiled: Dict[int, Tuple[datetime, schemas.LeagueSettings, Any]] = {}
+
+    async def get(
+        self,
+        db: Session | AsyncSession,
+        league_id: int
+    ) -> Optional[Tuple[schemas.LeagueSettings, Any]]:
+        row = await LeagueSettingsService(db).get(league_id)
+        if row is None:
+            self._compiled.pop(league_id, None)
+            return None
+
+        compiled = self._compiled.get(league_id)
+        if compiled is None or compiled[0] != row.updated_at:
+            return self.put(row)
+        return compiled[1], compiled[2]
+
+    def put(self, row: models.LeagueSettings) -> Tuple[schemas.LeagueSettings, Any]:
+        # Imported on first use, templates pull in pulp and pandas
+        from .constraints import ConstraintTemplate
+
+        settings = settings_of(row)
+        template = ConstraintTemplate.compile(settings)
+        self._compiled[row.id] = (row.updated_at, settings, template)
+        return settings, template
+
+league_templates = LeagueTemplates()
@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from app.core.config import get_settings
+from app.core.instrumentation import metrics
+from app.database import get_async_session_factory
+from app.schemas import schemas
+
+class PlayerChanges:
+    """Injury and salary changes seen together, keyed by player id"""
+
+    def __init__(self):
+        self.injuries: Dict[int, bool] = {}  # Player id -> injury now active
+        self.salaries: Dict[int, float] = {}  # Player id -> new salary
+
+    @property
+    def player_ids(self) -> Set[int]:
+        return set(self.injuries) | set(self.salaries)
+
+    def merge(self, other: "PlayerChanges"):
+        self.injuries.update(other.injuries)
+        self.salaries.update(other.salaries)
+
+    @classmethod
+    def between(cls, old, new) -> "PlayerChanges":
+        """Injury flags and salaries that differ between two player pools"""
+        changes = cls()
+        before = old.drop_duplicates('player_id').set_index('player_id')
+        after = new.drop_duplicates('player_id').set_index('player_id')
+        common = before.index.intersection(after.index)
+
+        injured = after.loc[common, 'Injured']
+        for pid in common[(injured != before.loc[common, 'Injured']).to_numpy()]:
+            changes.injuries[int(pid)] = bool(injured[pid])
+
+        salaries = after.loc[common, 'pv']
+        for pid in common[(salaries != before.loc[common, 'pv']).to_numpy()]:
+            changes.salaries[int(pid)] = float(salaries[pid])
+        return changes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'injuries': [{'player_id': pid, 'active': active} for pid, active in self.injuries.items()],
+            'salaries': [{'player_id': pid, 'salary': salary} for pid, salary in self.salaries.items()],
+        }
+
+class ChangeFeed:
+    """
+    Fan events out to asyncio subscribers.
+
+    Publishing is safe from any thread. Until the feed is bound to the app's
+    event loop, events are dropped. A slow subscriber loses its oldest events rather
+    than holding up the others.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(self.max_queue)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, item: Any):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(item)
+        else:
+            loop.call_soon_threadsafe(self._deliver, item)
+
+    def _deliver(self, item: Any):
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(item)
+
+class SavedLineup:
+    """An optimized lineup with the solver input it was picked from"""
+
+    def __init__(self, lineup_id: str, optimizer, lineup: schemas.OptimizedLineup):
+        self.lineup_id = lineup_id
+        self.settings = optimizer.settings
+        self.exclude_players = optimizer.exclude_players
+        self.force_players = optimizer.force_players
+        self.final_df = optimizer.final_df
+        self.lineup = lineup
+
+    @property
+    def player_ids(self) -> Set[int]:
+        return {player.id for player in self.lineup.forwards + self.lineup.defense + self.lineup.goalies}
+
+def lineup_id_for(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+class LineupRegistry:
+    """Most recently optimized lineups, watched for injury and salary changes"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lineups: "OrderedDict[str, SavedLineup]" = OrderedDict()
+
+    def record(self, key: str, optimizer, lineup: schemas.OptimizedLineup) -> str:
+        lineup_id = lineup_id_for(key)
+        if optimizer.final_df is None:
+            return lineup_id
+
+        self._lineups[lineup_id] = SavedLineup(lineup_id, optimizer, lineup)
+        self._lineups.move_to_end(lineup_id)
+        while len(self._lineups) > self.max_size:
+            self._lineups.popitem(last=False)
+        return lineup_id
+
+    def get(self, lineup_id: str) -> Optional[SavedLineup]:
+        return self._lineups.get(lineup_id)
+
+    def affected(self, changes: "PlayerChanges") -> List[SavedLineup]:
+        """
+        Saved lineups that include any of the changed players, or that could
+        pick up a player back from injury
+        """
+        returning = [pid for pid, active in changes.injuries.items() if not active]
+        return [
+            saved for saved in list(self._lineups.values())
+            if saved.player_ids & changes.player_ids
+            or (returning and saved.final_df['player_id'].isin(returning).any())
+        ]
+
+    def __len__(self):
+        return len(self._lineups)
+
+class LineupWatcher:
+    """
+    Re-solve saved lineups in the background when their players change.
+
+    An injury or salary change only touches a few rows of the solver input,
+    so the saved input is patched and re-solved warm-started from the old
+    lineup instead of rebuilding the pool. A player coming back from injury
+    needs their projection restored, so those lineups are re-optimized from
+    scratch. Every result is pushed to the lineup update feed.
+
+    Changes are found by polling: every LINEUP_WATCH_SECONDS the player pool
+    behind the projection table is compared with the one seen last time.
+    That costs one fingerprint query unless the source tables changed. Writes
+    from any process are picked up whether or not the background refresh
+    runs, but a re-solve can trail the write by up to the interval. The pool
+    compared against comes from the warm-up, or without one the first check.
+    """
+
+    def __init__(self, registry: LineupRegistry, changes: ChangeFeed, updates: ChangeFeed, interval: float):
+        self.registry = registry
+        self.changes = changes
+        self.updates = updates
+        self.interval = interval
+        self.resolved = 0
+        self._pool = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def check(self):
+        """Publish the injury and salary changes since the player pool was last checked"""
+        from .player_projections import projection_table
+
+        async with get_async_session_factory()() as db:
+            await projection_table.get(db)
+
+        pool, previous = projection_table.pool, self._pool
+        self._pool = pool
+        if previous is None or pool is None or pool is previous:
+            return
+
+        changes = PlayerChanges.between(previous, pool)
+        if changes.player_ids:
+            self.changes.publish(changes)
+
+    async def poll(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Error checking players for lineup changes: {e}")
+
+    async def resolve(self, saved: SavedLineup, changes: PlayerChanges) -> schemas.OptimizedLineup:
+        from .optimizer import FantasyOptimizer
+
+        if any(not active and pid in saved.final_df['player_id'].values for pid, active in changes.injuries.items()):
+            async with get_async_session_factory()() as db:
+                optimizer = FantasyOptimizer(db, saved.settings, saved.exclude_players, saved.force_players)
+                lineup = await optimizer.optimize(fresh_pool=True)
+        else:
+            df = saved.final_df.copy()
+            injured = df['player_id'].isin([pid for pid, active in changes.injuries.items() if active])
+            df.loc[injured, 'Injured'] = True
+            df.loc[injured, 'proj_fantasy_pts'] = 0.0
+            salaries = df['player_id'].map(changes.salaries)
+            df['pv'] = salaries.fillna(df['pv'])
+
+            optimizer = FantasyOptimizer(None, saved.settings, saved.exclude_players, saved.force_players)
+            optimizer.final_df = df
+            lineup = optimizer.format_lineup(
+                await optimizer.select_best_team(df, warm_start=list(saved.player_ids))
+            )
+
+        saved.final_df = optimizer.final_df
+        saved.lineup = lineup
+        self.resolved += 1
+        return lineup
+
+    async def handle(self, changes: PlayerChanges):
+        for saved in self.registry.affected(changes):
+            previous = saved.player_ids
+            try:
+                lineup = await self.resolve(saved, changes)
+            except Exception as e:
+                print(f"Error re-solving lineup {saved.lineup_id}: {e}")
+                continue
+
+            self.updates.publish({
+                'lineup_id': saved.lineup_id,
+                'changes': changes.to_dict(),
+                'changed': saved.player_ids != previous,
+                'lineup': lineup.model_dump(),
+            })
+
+    async def run(self):
+        queue = self.changes.subscribe()
+        try:
+            while True:
+                changes = await queue.get()
+                # Fold in whatever else arrived meanwhile, bursts become one pass
+                while not queue.empty():
+                    changes.merge(queue.get_nowait())
+                await self.handle(changes)
+        finally:
+            self.changes.unsubscribe(queue)
+
+    def start(self):
+        from .player_projections import projection_table
+
+        self._pool = projection_table.pool
+        loop = asyncio.get_running_loop()
+        self.changes.bind(loop)
+        self.updates.bind(loop)
+        self._tasks = [asyncio.create_task(self.run()), asyncio.create_task(self.poll())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+player_changes = ChangeFeed()
+lineup_updates = ChangeFeed()
+lineup_registry = LineupRegistry(get_settings().SAVED_LINEUPS_MAX)
+lineup_watcher = LineupWatcher(lineup_registry, player_changes, lineup_updates, get_settings().LINEUP_WATCH_SECONDS)
+
+metrics.register_callback(
+    "nhl_saved_lineups",
+    "Optimized lineups watched for injury and salary changes",
+    "gauge",
+    lambda: {(): len(lineup_registry)},
+)
+metrics.register_callback(
+    "nhl_lineup_resolves_total",
+    "Saved lineups re-solved after an injury or salary change",
+    "counter",
+    lambda: {(): lineup_watcher.resolved},
+)
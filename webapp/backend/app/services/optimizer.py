@@ -1,29 +1,56 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.database import execute
 from app.schemas import schemas
 from app.models import models
+from app.core.config import get_settings
+from app.core.instrumentation import instrumented, metrics, stage_timer
+from app.core.request_profiler import profiled
+from .capture import capture_enabled, capture_solve
+from .constraints import ConstraintTemplate
 from .injuries import InjuryService
 from .salary import SalaryService
 from .goalies import GoalieService
 from .schedule import ScheduleService
 from .projections import ProjectionService
+from .shared_pool import shared_pool
+from .snapshots import data_snapshots
+import asyncio
+import time
 import pulp
 import pandas as pd
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+# Pool columns of a lineup and their names in the response
+LINEUP_COLUMNS = {
+    'player_id': 'id',
+    'Player': 'name',
+    'Team': 'team',
+    'Position': 'position',
+    'proj_fantasy_pts': 'projected_points',
+    'pv': 'salary',
+    'games_this_week': 'games_this_week',
+}
 
 class FantasyOptimizer:
     def __init__(
             self,
-            db: Session,
+            db: Session | AsyncSession,
             settings: schemas.LeagueSettings,
             exclude_players: Optional[List[int]] = None,
             force_players: Optional[List[int]] = None,
+            template: Optional[ConstraintTemplate] = None,
     ):
         self.db = db
         self.settings = settings
+        # Saved leagues pass the template compiled when they were saved
+        self.template = template or ConstraintTemplate.compile(settings)
         self.exclude_players = exclude_players or []
         self.force_players = force_players or []
-        self.position_mapping = settings.position_mapping
+        self.position_mapping = getattr(settings, 'position_mapping', None)
+        self.final_df: Optional[pd.DataFrame] = None
 
         self.injury_service = InjuryService(db)
         self.salary_service = SalaryService(db)
@@ -43,12 +70,14 @@ class FantasyOptimizer:
         if settings.max_defense_per_team:
             self.MAX_DEFENSE_PER_TEAM = settings.max_defense_per_team
 
-    async def get_player_data(self):
-        """Get player data using SQLAlchemy ORM"""
-        player_stats = (
-            self.db.query(models.Player)
-            .join(models.PlayerStats)
-            .with_entities(
+    @instrumented("get_player_data")
+    async def get_player_data(self, since: Optional[date] = None):
+        """Get player data using SQLAlchemy ORM, by default for the last year"""
+        since = since or date.today() - timedelta(days=365)
+        player_stats = await execute(
+            self.db,
+            select(
+                models.Player.id.label('player_id'),
                 models.Player.name.label('Player'),
                 models.Player.team.label('Team'),
                 models.Player.position.label('Position'),
@@ -62,14 +91,27 @@ class FantasyOptimizer:
                 models.PlayerStats.ixg_per_60.label('ixG/60'),
                 # ... any other stats needed for projections
             )
-            .filter(models.PlayerStats.date >= date.today() - timedelta(days=365))
-            .all()
+            .join(models.PlayerStats)
+            .where(models.PlayerStats.date >= since)
         )
 
-        return pd.DataFrame(player_stats)
+        return pd.DataFrame(player_stats.all())
+
+    def add_lineup_constraints(self, prob, df, player_vars, name: str = ""):
+        """Add the roster and salary rules for one lineup to the problem"""
+        self.template.bind(prob, df, player_vars, name)
+
+        # Force/exclude players
+        forced = df.index[df['player_id'].isin(self.force_players)]
+        for i in forced:
+            prob += player_vars[i] == 1, f"force_{i}{name}"
+
+        excluded = df.index[df['player_id'].isin(self.exclude_players)]
+        for i in excluded:
+            prob += player_vars[i] == 0, f"exclude_{i}{name}"
 
-    async def select_best_team(self, df):
-        """Your existing optimization logic"""
+    def build_problem(self, df: pd.DataFrame):
+        """The lineup problem over a pool, returned with its variables by pool index"""
         # Create a linear programming problem
         prob = pulp.LpProblem("FantasyHockeyTeam", pulp.LpMaximize)
 
@@ -77,138 +119,245 @@ class FantasyOptimizer:
         player_vars = pulp.LpVariable.dicts("player", df.index, cat="Binary")
 
         # Objective: Maximize total fantasy points
-        prob += pulp.lpSum(df['proj_fantasy_pts'][i] * player_vars[i] for i in df.index)
+        prob += pulp.LpAffineExpression(zip((player_vars[i] for i in df.index), df['proj_fantasy_pts'].tolist()))
 
         # Constraints
-        # Salary cap
-        prob += pulp.lpSum(df['pv'][i] * player_vars[i] for i in df.index) <= self.MAX_COST
-        prob += pulp.lpSum(df['pv'][i] * player_vars[i] for i in df.index) >= self.MIN_COST
+        self.add_lineup_constraints(prob, df, player_vars)
 
-        # Position requirements
-        prob += pulp.lpSum(player_vars[i] for i in df[df['Position'] == 'F'].index) == self.NUM_FORWARDS
-        prob += pulp.lpSum(player_vars[i] for i in df[df['Position'] == 'D'].index) == self.NUM_DEFENSE
-        prob += pulp.lpSum(player_vars[i] for i in df[df['Position'] == 'G'].index) == self.NUM_GOALIES
+        metrics.observe_problem(prob.numVariables(), prob.numConstraints())
+        return prob, player_vars
 
-        # Max players per team
-        teams = df['Team'].unique()
-        for team in teams:
-            team_player_indices = df[df['Team'] == team].index
-            prob += pulp.lpSum(player_vars[i] for i in team_player_indices) <= self.MAX_PLAYERS_PER_TEAM
-
-        # Force/exclude players
-        for player_id in self.force_players:
-            if player_id in df.index:
-                prob += player_vars[player_id] == 1
-
-        for player_id in self.exclude_players:
-            if player_id in df.index:
-                prob += player_vars[player_id] == 0
-
-        # Solve the problem
-        prob.solve(pulp.PULP_CBC_CMD())
+    async def select_best_team(
+        self,
+        df,
+        warm_start: Optional[List[int]] = None,
+        solver: Optional[pulp.LpSolver] = None
+    ):
+        """
+        Pick the lineup with the most projected points.
+
+        Args:
+            df (pd.DataFrame): Player pool with projections and salaries
+            warm_start (Optional[List[int]]): Player ids of a known good lineup,
+                handed to CBC as the starting solution when re-solving after a
+                small change to the pool
+            solver (Optional[pulp.LpSolver]): Solver to use instead of CBC, for
+                replaying captured problems
+        """
+        start = time.perf_counter()
+        prob, player_vars = self.build_problem(df)
+
+        if warm_start is not None:
+            starting = set(df.index[df['player_id'].isin(warm_start)])
+            for i in df.index:
+                player_vars[i].setInitialValue(1 if i in starting else 0)
+
+        if solver is None:
+            solver = pulp.PULP_CBC_CMD(msg=False, warmStart=warm_start is not None)
+
+        # Solve the problem off the event loop so other requests keep moving
+        with stage_timer("solve"):
+            await asyncio.to_thread(prob.solve, solver)
 
         # Extract selected players
         selected_players = [i for i in df.index if player_vars[i].varValue == 1]
         best_team = df.loc[selected_players]
 
+        if capture_enabled():
+            await asyncio.to_thread(
+                capture_solve, self, df, warm_start, solver.toDict(),
+                best_team, pulp.LpStatus[prob.status], time.perf_counter() - start
+            )
+
         return best_team
 
-    async def optimize(self):
-        """Main optimization function"""
-        try:
-            # Get player data
-            player_data = await self.get_player_data()
-            if player_data.empty:
-                raise ValueError("No player data available")
-
-            # TODO: Normalize data using settings
-            # player_data['Position'] = player_data['raw_position'].map(self.position_mapping)
-
-            # Get schedule info
-            games_count, multipliers = await self.schedule_service.get_weekly_schedule_info()
-            if not games_count:
-                raise ValueError("Failed to get schedule information")
-
-            remaining_games = sum(games_count.values())
-            if remaining_games == 0:
-                raise ValueError("No remaining games this week to optimize")
-
-            # Get initial features
-            player_features = await self.projection_service.create_player_features(player_data)
-            if player_features.empty:
-                raise ValueError("Failed to create player features")
-
-            # Get weights based on time of season
-            weights = self.projection_service.get_projection_weights()
-
-            # Calculate weighted projections
-            projections = await self.projection_service.calculate_weighted_projections(player_features, weights)
-
-            # Add schedule impact
-            projections['games_this_week'] = projections['Team'].map(games_count)
-            projections['schedule_multiplier'] = projections['Team'].map(multipliers)
-
-            # Calculate final fantasy points
-            projections['proj_fantasy_pts'] = (
-                (projections['proj_goals_per_game'] * 2 +
-                projections['proj_assists_per_game'] * 1) *
-                projections['games_this_week'] *
-                projections['schedule_multiplier']
+    async def build_player_pool(self) -> pd.DataFrame:
+        """
+        Build per-game projections for every skater with salary and injury status.
+
+        The pool does not depend on the schedule, so it can be reused across weeks.
+        It comes from the pool shared between workers or the background
+        snapshot when there is one.
+        """
+        shared = shared_pool.get()
+        if shared is not None:
+            return shared
+
+        snapshot = data_snapshots.get('player_pool')
+        if snapshot is not None:
+            return snapshot
+
+        return await self.read_player_pool()
+
+    async def read_player_pool(self) -> pd.DataFrame:
+        """Build the per-game pool from the database"""
+        # Get player data
+        player_data = await self.get_player_data()
+        if player_data.empty:
+            raise ValueError("No player data available")
+
+        # TODO: Normalize data using settings
+        # player_data['Position'] = player_data['raw_position'].map(self.position_mapping)
+
+        injuries_df = await self.injury_service.get_current_injuries()
+        salary_df = await self.salary_service.get_player_salaries()
+
+        return await self.assemble_player_pool(player_data, injuries_df, salary_df)
+
+    async def assemble_player_pool(
+        self,
+        player_data: pd.DataFrame,
+        injuries_df: pd.DataFrame,
+        salary_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Turn raw player stats, injuries and salaries into the per-game pool"""
+        if get_settings().PROJECTION_ENGINE == "polars":
+            from . import polars_engine
+            return polars_engine.assemble_player_pool(
+                player_data,
+                injuries_df,
+                salary_df,
+                self.projection_service.season_start,
+                self.projection_service.get_projection_weights()
             )
 
-            # Filter to active teams
-            active_teams = [team for team, count in games_count.items() if count > 0]
-            projections = projections[projections['Team'].isin(active_teams)]
-
-            # Add injury information
-            injuries_df = await self.injury_service.get_current_injuries()
-            if not injuries_df.empty:
-                projections = projections.merge(
-                    injuries_df[['Player', 'Injury Status']],
-                    on='Player',
-                    how='left'
-                )
-                projections['Injured'] = ~projections['Injury Status'].isnull()
-                projections.loc[projections['Injured'], 'proj_fantasy_pts'] = 0
-
-            # Add salary information
-            salary_df = await self.salary_service.get_player_salaries()
-            projections = projections.merge(
-                salary_df[['Player', 'Team', 'pv']],
-                on=['Player', 'Team'],
+        # Get initial features
+        player_features = await self.projection_service.create_player_features(player_data)
+        if player_features.empty:
+            raise ValueError("Failed to create player features")
+
+        # Calculate weighted per-game projections, schedule is applied per week
+        pool = await self.projection_service.calculate_weighted_projections(player_features, {}, {})
+        if pool.empty:
+            raise ValueError("Failed to calculate projections")
+
+        return self.merge_injuries_salaries(pool, injuries_df, salary_df)
+
+    @instrumented("merge_injuries_salaries")
+    def merge_injuries_salaries(
+        self,
+        pool: pd.DataFrame,
+        injuries_df: pd.DataFrame,
+        salary_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Flag injured players and attach salaries, dropping players without one"""
+        # Add injury information
+        pool['Injured'] = False
+        if not injuries_df.empty:
+            pool = pool.merge(
+                injuries_df[['Player', 'Injury Status']],
+                on='Player',
                 how='left'
             )
+            pool['Injured'] = ~pool['Injury Status'].isnull()
+
+        # Add salary information, players without a salary cannot be picked
+        if salary_df.empty:
+            raise ValueError("No salary data available")
+        pool = pool.merge(
+            salary_df[['Player', 'Team', 'pv']].drop_duplicates(['Player', 'Team']),
+            on=['Player', 'Team'],
+            how='left'
+        )
 
-            goalie_data = await self.goalie_service.estimate_team_goaltending_points(
-                multipliers, games_count
-            )
-            goalie_df = await self.goalie_service.create_goalie_dataframe(goalie_data)
+        return pool.dropna(subset=['pv']).reset_index(drop=True)
+
+    def apply_schedule(
+        self,
+        pool: pd.DataFrame,
+        games_count: Dict[str, int],
+        multipliers: Dict[str, float]
+    ) -> pd.DataFrame:
+        """Project fantasy points for one week of games from the per-game pool"""
+        # The pool is shared and read-only, only the columns replaced below are new
+        projections = pool.copy(deep=False)
+
+        # Add schedule impact
+        projections['games_this_week'] = projections['Team'].map(games_count).fillna(0).astype(int)
+        projections['schedule_multiplier'] = projections['Team'].map(multipliers)
+
+        # Calculate final fantasy points
+        projections['proj_fantasy_pts'] = (
+            (projections['proj_goals_per_game'] * self.settings.points_goal +
+            projections['proj_assists_per_game'] * self.settings.points_assist) *
+            projections['games_this_week'] *
+            projections['schedule_multiplier']
+        ).fillna(0)
+        projections.loc[projections['Injured'], 'proj_fantasy_pts'] = 0
+
+        return projections
+
+    async def build_goalie_pool(
+        self,
+        games_count: Dict[str, int],
+        multipliers: Dict[str, float],
+        expected_wins: Optional[Dict[str, float]] = None
+    ) -> pd.DataFrame:
+        """Project team goaltending for one week of games"""
+        goalie_data = await self.goalie_service.estimate_team_goaltending_points(
+            multipliers, games_count, expected_wins=expected_wins
+        )
+        return await self.goalie_service.create_goalie_dataframe(goalie_data)
+
+    def format_lineup(self, lineup: pd.DataFrame) -> schemas.OptimizedLineup:
+        """Convert selected players into the API response"""
+        # Only the response columns, the pool carries every stat
+        players = lineup[list(LINEUP_COLUMNS)].rename(columns=LINEUP_COLUMNS).to_dict('records')
+
+        def by_position(position):
+            return [schemas.OptimizedPlayer(**player) for player in players if player['position'] == position]
+
+        return schemas.OptimizedLineup(
+            forwards=by_position('F'),
+            defense=by_position('D'),
+            goalies=by_position('G'),
+            total_points=float(lineup['proj_fantasy_pts'].sum()),
+            total_salary=float(lineup['pv'].sum())
+        )
+
+    async def build_week_pool(self, fresh_pool: bool = False) -> pd.DataFrame:
+        """
+        Skaters and goalies projected for this week, the pool the lineup is picked from.
+
+        With fresh_pool the skaters are read from the database rather than a
+        shared or background snapshot that may predate the latest changes.
+        """
+        # Get schedule info
+        games_count, multipliers, expected_wins = await self.schedule_service.get_weekly_schedule_info()
+        if not games_count:
+            raise ValueError("Failed to get schedule information")
+
+        remaining_games = sum(games_count.values())
+        if remaining_games == 0:
+            raise ValueError("No remaining games this week to optimize")
+
+        # Project skaters for this week
+        pool = await (self.read_player_pool() if fresh_pool else self.build_player_pool())
+        projections = self.apply_schedule(pool, games_count, multipliers)
 
-            # Combine skaters and goalies
-            final_df = pd.concat([projections, goalie_df], ignore_index=True)
+        # Filter to active teams
+        active_teams = [team for team, count in games_count.items() if count > 0]
+        projections = projections[projections['Team'].isin(active_teams)]
+
+        goalie_df = await self.build_goalie_pool(games_count, multipliers, expected_wins)
+
+        # Combine skaters and goalies, kept so the lineup can be re-solved later
+        final_df = pd.concat([projections, goalie_df], ignore_index=True)
+        self.final_df = final_df
+        return final_df
+
+    @instrumented("optimize")
+    @profiled("FantasyOptimizer.optimize")
+    async def optimize(self, fresh_pool: bool = False):
+        """Main optimization function"""
+        try:
+            final_df = await self.build_week_pool(fresh_pool)
 
             # Run optimization
             optimal_lineup = await self.select_best_team(final_df)
 
             # Format result
-            result = schemas.OptimizedLineup(
-                forwards=[
-                    schemas.OptimizedPlayer(**player)
-                    for player in optimal_lineup[optimal_lineup['Position'] == 'F'].to_dict('records')
-                ],
-                defense=[
-                    schemas.OptimizedPlayer(**player)
-                    for player in optimal_lineup[optimal_lineup['Position'] == 'D'].to_dict('records')
-                ],
-                goalies=[
-                    schemas.OptimizedPlayer(**player)
-                    for player in optimal_lineup[optimal_lineup['Position'] == 'G'].to_dict('records')
-                ],
-                total_points=float(optimal_lineup['proj_fantasy_pts'].sum()),
-                total_salary=float(optimal_lineup['pv'].sum())
-            )
-
-            return result
+            return self.format_lineup(optimal_lineup)
 
         except Exception as e:
-            raise ValueError(f"Optimization failed: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Optimization failed: {str(e)}")
@@ -0,0 +1,210 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.schemas import schemas
+from app.core.instrumentation import instrumented, metrics
+from .constraints import ConstraintTemplate
+from .optimizer import FantasyOptimizer
+import asyncio
+import pulp
+import pandas as pd
+from datetime import date
+from typing import List, Optional
+
+class LineupPlanner:
+    """
+    Plan lineups over several weeks with a cap on transfers between weeks.
+
+    Rather than solving one model for the whole horizon, the planner rolls a
+    short lookahead window forward: each step solves the next few weeks
+    together, commits only the first of them and moves on. Every step is a
+    small ILP, so a long horizon costs a handful of quick solves.
+    """
+
+    def __init__(
+            self,
+            db: Session | AsyncSession,
+            settings: schemas.LeagueSettings,
+            plan: schemas.PlanSettings,
+            exclude_players: Optional[List[int]] = None,
+            force_players: Optional[List[int]] = None,
+            template: Optional[ConstraintTemplate] = None,
+    ):
+        self.db = db
+        self.settings = settings
+        self.num_weeks = plan.num_weeks
+        self.max_transfers = plan.max_transfers
+        self.lookahead_weeks = max(1, plan.lookahead_weeks)
+        self.candidates_per_position = plan.candidates_per_position
+        self.start_date = plan.start_date or date.today()
+
+        self.optimizer = FantasyOptimizer(
+            db=db,
+            settings=settings,
+            exclude_players=exclude_players,
+            force_players=force_players,
+            template=template
+        )
+        self.schedule_service = self.optimizer.schedule_service
+
+    async def build_weekly_points(self) -> tuple[pd.DataFrame, List[date], List[pd.DataFrame]]:
+        """
+        Project every player for every week of the horizon.
+
+        Returns:
+            tuple: The player universe (one row per player), the week start
+            dates and a projection frame per week aligned to the universe
+        """
+        schedule = await self.schedule_service.get_multi_week_schedule_info(
+            self.start_date, self.num_weeks
+        )
+        if not schedule:
+            raise ValueError("Failed to get schedule information")
+
+        pool = await self.optimizer.build_player_pool()
+
+        weeks = []
+        for _, games_count, multipliers, expected_wins in schedule:
+            skaters = self.optimizer.apply_schedule(pool, games_count, multipliers)
+            goalies = await self.optimizer.build_goalie_pool(games_count, multipliers, expected_wins)
+            weeks.append(pd.concat([skaters, goalies], ignore_index=True))
+
+        # Players can be held through weeks without games, so every week
+        # shares the same universe and simply scores zero when idle
+        universe = (
+            pd.concat(weeks, ignore_index=True)
+            .drop_duplicates('player_id')
+            [['player_id', 'Player', 'Team', 'Position', 'pv']]
+            .fillna({'pv': 0.0})
+            .reset_index(drop=True)
+        )
+
+        weekly = []
+        for week in weeks:
+            week = week.drop_duplicates('player_id').set_index('player_id')
+            aligned = universe.copy()
+            aligned['games_this_week'] = aligned['player_id'].map(week['games_this_week']).fillna(0).astype(int)
+            aligned['proj_fantasy_pts'] = aligned['player_id'].map(week['proj_fantasy_pts']).fillna(0)
+            weekly.append(aligned)
+
+        return universe, [week[0] for week in schedule], weekly
+
+    def select_candidates(
+        self,
+        universe: pd.DataFrame,
+        window: List[pd.DataFrame],
+        previous: Optional[List[int]]
+    ) -> pd.Index:
+        """
+        Restrict a window's model to players who could plausibly be picked.
+
+        Keeps the best players of each position by window points and by points
+        per salary, plus the current roster and forced players so that holding
+        them is always an option.
+        """
+        points = sum(week['proj_fantasy_pts'] for week in window)
+        value = points / universe['pv'].where(universe['pv'] > 0)
+
+        keep = set(previous or [])
+        keep.update(universe.index[universe['player_id'].isin(self.optimizer.force_players)])
+        for _, group in universe.groupby('Position'):
+            keep.update(points[group.index].nlargest(self.candidates_per_position).index)
+            keep.update(value[group.index].nlargest(self.candidates_per_position).index)
+
+        return universe.index[universe.index.isin(keep)]
+
+    @instrumented("plan_window")
+    async def solve_window(
+        self,
+        universe: pd.DataFrame,
+        window: List[pd.DataFrame],
+        previous: Optional[List[int]],
+        name: str
+    ) -> List[int]:
+        """
+        Solve the lineups of a lookahead window and return the first week's picks.
+
+        Args:
+            universe (pd.DataFrame): One row per selectable player
+            window (List[pd.DataFrame]): Weekly projections aligned to the universe
+            previous (Optional[List[int]]): Universe indices of the committed
+                lineup before the window, None at the start of the plan
+            name (str): Problem name
+
+        Returns:
+            List[int]: Universe indices selected for the first week of the window
+        """
+        prob = pulp.LpProblem(name, pulp.LpMaximize)
+        held_before = set(previous or [])
+
+        lineup_vars = [
+            pulp.LpVariable.dicts(f"player_w{w}", universe.index, cat="Binary")
+            for w in range(len(window))
+        ]
+
+        prob += pulp.lpSum(
+            week['proj_fantasy_pts'][i] * lineup_vars[w][i]
+            for w, week in enumerate(window)
+            for i in universe.index
+        )
+
+        for w in range(len(window)):
+            self.optimizer.add_lineup_constraints(prob, universe, lineup_vars[w], name=f"_w{w}")
+
+        # Transfers: a player counts once, in the week they join the roster
+        for w in range(len(window)):
+            if w == 0 and previous is None:
+                continue
+
+            transfer_vars = pulp.LpVariable.dicts(f"transfer_w{w}", universe.index, cat="Binary")
+            for i in universe.index:
+                held = (1 if i in held_before else 0) if w == 0 else lineup_vars[w - 1][i]
+                prob += transfer_vars[i] >= lineup_vars[w][i] - held, f"transfer_w{w}_{i}"
+
+            prob += pulp.lpSum(transfer_vars.values()) <= self.max_transfers, f"max_transfers_w{w}"
+
+        metrics.observe_problem(prob.numVariables(), prob.numConstraints())
+        # Solved in a worker thread so the event loop keeps serving other requests
+        await asyncio.to_thread(prob.solve, pulp.PULP_CBC_CMD(msg=False))
+        if pulp.LpStatus[prob.status] != "Optimal":
+            raise ValueError(f"No feasible lineup for {name}: {pulp.LpStatus[prob.status]}")
+
+        return [i for i in universe.index if lineup_vars[0][i].varValue > 0.5]
+
+    async def plan(self) -> schemas.LineupPlan:
+        """Main planning function"""
+        try:
+            universe, week_starts, weekly = await self.build_weekly_points()
+
+            lineups = []
+            previous = None
+            for week in range(len(weekly)):
+                window = weekly[week:week + self.lookahead_weeks]
+                candidates = self.select_candidates(universe, window, previous)
+                selected = await self.solve_window(
+                    universe.loc[candidates],
+                    [frame.loc[candidates] for frame in window],
+                    previous,
+                    f"FantasyHockeyPlan_w{week}"
+                )
+
+                lineup = weekly[week].loc[selected]
+                previous_ids = {int(i) for i in universe.loc[previous, 'player_id']} if previous is not None else set()
+                selected_ids = {int(i) for i in lineup['player_id']}
+
+                weekly_lineup = self.optimizer.format_lineup(lineup)
+                lineups.append(schemas.WeeklyLineup(
+                    **weekly_lineup.model_dump(),
+                    week_start=week_starts[week],
+                    transfers_in=sorted(selected_ids - previous_ids) if previous is not None else [],
+                    transfers_out=sorted(previous_ids - selected_ids),
+                ))
+                previous = selected
+
+            return schemas.LineupPlan(
+                weeks=lineups,
+                total_points=sum(week.total_points for week in lineups),
+                total_transfers=sum(len(week.transfers_in) for week in lineups),
+            )
+
+        except Exception as e:
+            raise ValueError(f"Planning failed: {str(e)}")
@@ -0,0 +1,175 @@
+import asyncio
+import io
+from datetime import date
+from typing import Iterator, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import pandas as pd
+from ..database import execute
+from ..models import models
+from ..schemas import schemas
+from ..core.constants import (
+    ASSIST, GOAL, GOALIE_WIN, MAX_COST, MAX_PLAYERS_PER_TEAM, NUM_DEFENSE, NUM_FORWARDS, NUM_GOALIES
+)
+from ..core.instrumentation import instrumented
+from .optimizer import FantasyOptimizer
+from .shared_pool import shared_pool
+from .snapshots import data_snapshots
+
+# Pool columns served by /api/players/stats and their names in the response
+PROJECTION_COLUMNS = {
+    'player_id': 'id',
+    'Player': 'name',
+    'Team': 'team',
+    'Position': 'position',
+    'proj_goals_per_game': 'proj_goals_per_game',
+    'proj_assists_per_game': 'proj_assists_per_game',
+    'games_this_week': 'games_this_week',
+    'schedule_multiplier': 'schedule_multiplier',
+    'proj_fantasy_pts': 'proj_fantasy_pts',
+    'pv': 'salary',
+    'Injured': 'injured',
+    'Injury Status': 'injury_status',
+}
+
+# Tables whose changes invalidate the projections
+SOURCE_TABLES = [
+    (models.PlayerStats, models.PlayerStats.date),
+    (models.PlayerSalary, models.PlayerSalary.updated_at),
+    (models.PlayerInjury, models.PlayerInjury.updated_at),
+    (models.TeamStandings, models.TeamStandings.updated_at),
+]
+# Background snapshots the projections are built from
+SOURCE_SNAPSHOTS = ['schedule', 'standings', 'injuries']
+
+def default_league_settings() -> schemas.LeagueSettings:
+    return schemas.LeagueSettings(
+        max_salary_cap=MAX_COST,
+        num_forwards=NUM_FORWARDS,
+        num_defense=NUM_DEFENSE,
+        num_goalies=NUM_GOALIES,
+        max_players_per_team=MAX_PLAYERS_PER_TEAM,
+        points_goal=GOAL,
+        points_assist=ASSIST,
+        points_goalie_win=GOALIE_WIN,
+    )
+
+async def data_fingerprint(db: Session | AsyncSession) -> Tuple:
+    """Row counts and latest updates of the source tables, in one round trip, plus snapshot versions"""
+    columns = []
+    for model, updated_column in SOURCE_TABLES:
+        columns.append(select(func.count(model.id)).scalar_subquery())
+        columns.append(select(func.max(updated_column)).scalar_subquery())
+
+    result = await execute(db, select(*columns))
+    # Games this week depend on the day too, and followers rebuild when a new shared pool is published
+    return (
+        date.today(),
+        data_snapshots.versions_of(SOURCE_SNAPSHOTS),
+        shared_pool.followed_version(),
+        *result.one()
+    )
+
+def rescore(frame: pd.DataFrame, points_goal: float, points_assist: float) -> pd.DataFrame:
+    """Recompute fantasy points for a different scoring system"""
+    frame = frame.copy()
+    frame['proj_fantasy_pts'] = (
+        (frame['proj_goals_per_game'] * points_goal + frame['proj_assists_per_game'] * points_assist) *
+        frame['games_this_week'] *
+        frame['schedule_multiplier'].fillna(0)
+    ).where(~frame['injured'], 0.0)
+    return frame
+
+class ProjectionTable:
+    """
+    This week's skater projections, kept in memory between requests.
+
+    Each read checks a fingerprint of the source tables and rebuilds the
+    table only when it changed, so most requests are a single small query
+    plus slicing a DataFrame.
+    """
+
+    def __init__(self):
+        self.frame: Optional[pd.DataFrame] = None
+        self.pool: Optional[pd.DataFrame] = None
+        self.fingerprint: Optional[Tuple] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: Session | AsyncSession) -> pd.DataFrame:
+        fingerprint = await data_fingerprint(db)
+        if self.frame is not None and fingerprint == self.fingerprint:
+            return self.frame
+
+        async with self._lock:
+            # Another request may have rebuilt it while we waited
+            if self.frame is None or fingerprint != self.fingerprint:
+                self.frame = await self.build(db)
+                self.fingerprint = fingerprint
+
+        return self.frame
+
+    def invalidate(self):
+        self.fingerprint = None
+
+    async def read_pool(self, optimizer: FantasyOptimizer) -> pd.DataFrame:
+        """
+        Per-game pool for the table.
+
+        With a shared pool, only the publishing worker reads it from the
+        database, the others map what it published.
+        """
+        if not shared_pool.enabled:
+            return await optimizer.read_player_pool()
+
+        if not shared_pool.try_lead():
+            shared = shared_pool.get()
+            if shared is not None:
+                return shared
+            # Nothing published yet, build it here rather than wait
+            return await optimizer.read_player_pool()
+
+        pool = await optimizer.read_player_pool()
+        return shared_pool.publish(pool, data_snapshots.version)
+
+    @instrumented("build_projection_table")
+    async def build(self, db: Session | AsyncSession) -> pd.DataFrame:
+        optimizer = FantasyOptimizer(db, default_league_settings())
+
+        games_count, multipliers, _ = await optimizer.schedule_service.get_weekly_schedule_info()
+        pool = await self.read_pool(optimizer)
+        projections = optimizer.apply_schedule(pool, games_count or {}, multipliers or {})
+        self.pool = pool
+
+        if 'Injury Status' not in projections.columns:
+            projections['Injury Status'] = None
+
+        return (
+            projections[list(PROJECTION_COLUMNS)]
+            .rename(columns=PROJECTION_COLUMNS)
+            .drop_duplicates('id')
+            .reset_index(drop=True)
+        )
+
+def iter_ndjson(frame: pd.DataFrame, chunk_rows: int = 1000) -> Iterator[str]:
+    """Encode a frame as newline-delimited JSON a chunk of rows at a time"""
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows].to_json(orient='records', lines=True)
+        # Older pandas leave off the final newline
+        yield chunk if chunk.endswith('\n') else chunk + '\n'
+
+def iter_arrow(frame: pd.DataFrame, chunk_rows: int = 10000) -> Iterator[bytes]:
+    """Encode a frame as an Arrow IPC stream, one record batch at a time"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+projection_table = ProjectionTable()
@@ -0,0 +1,198 @@
+import asyncio
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..database import execute
+from ..models import models
+from ..core.config import get_settings
+from ..core.instrumentation import instrumented
+
+# Letters NFKD does not split into a base letter and an accent
+FOLD_LETTERS = str.maketrans({
+    'ø': 'o', 'ł': 'l', 'đ': 'd', 'ð': 'd', 'þ': 'th', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ı': 'i',
+})
+# Dropped rather than split on, so "O'Reilly" is "oreilly" and "J.T." is "jt"
+DROPPED = str.maketrans('', '', "'’.")
+
+# Rank of each kind of match, lower first
+EXACT, NAME_PREFIX, WORD_PREFIX, FUZZY = range(4)
+MIN_SIMILARITY = 0.3
+
+def normalize_name(name: str) -> str:
+    """Lower case ASCII words of a name: "Tim Stützle" is "tim stutzle" """
+    decomposed = unicodedata.normalize('NFKD', name.casefold().translate(FOLD_LETTERS).translate(DROPPED))
+    letters = [char if char.isalnum() else ' ' for char in decomposed if not unicodedata.combining(char)]
+    return ' '.join(''.join(letters).split())
+
+def trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def jaccard(query_trigrams: Set[str], key_trigrams, postings: Dict[str, List]) -> Dict:
+    """Keys sharing at least MIN_SIMILARITY of their combined trigrams with the query"""
+    shared: Dict = defaultdict(int)
+    for gram in query_trigrams:
+        for key in postings.get(gram, ()):
+            shared[key] += 1
+
+    similar = {}
+    for key, count in shared.items():
+        similarity = count / (len(query_trigrams) + len(key_trigrams[key]) - count)
+        if similarity >= MIN_SIMILARITY:
+            similar[key] = similarity
+    return similar
+
+class PlayerSearchIndex:
+    """
+    Prefix and trigram index over normalized player names.
+
+    Every word of a name is a key in a sorted list, so a prefix is a range
+    found by bisection, and queries of several words match names with a
+    word starting with each. Trigrams catch misspellings the prefixes miss.
+    """
+
+    def __init__(self, players: List[dict]):
+        self.players = players
+        self.names = [normalize_name(player['name']) for player in players]
+
+        words = sorted({(word, i) for i, name in enumerate(self.names) for word in name.split()})
+        self.words = [word for word, _ in words]
+        self.word_players = [i for _, i in words]
+
+        # Misspelled words are compared with each distinct word, longer queries with whole names
+        self.players_by_word: Dict[str, List[int]] = defaultdict(list)
+        for word, i in words:
+            self.players_by_word[word].append(i)
+        self.word_trigrams = {word: trigrams(word) for word in self.players_by_word}
+        self.trigram_words: Dict[str, List[str]] = defaultdict(list)
+        for word, grams in self.word_trigrams.items():
+            for gram in grams:
+                self.trigram_words[gram].append(word)
+        self.name_trigrams = [trigrams(name) for name in self.names]
+        self.trigram_players: Dict[str, List[int]] = defaultdict(list)
+        for i, grams in enumerate(self.name_trigrams):
+            for gram in grams:
+                self.trigram_players[gram].append(i)
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def with_prefix(self, prefix: str) -> Set[int]:
+        """Players with a word starting with prefix"""
+        found = set()
+        for i in range(bisect_left(self.words, prefix), len(self.words)):
+            if not self.words[i].startswith(prefix):
+                break
+            found.add(self.word_players[i])
+        return found
+
+    def similar(self, query: str) -> Dict[int, float]:
+        """
+        Players whose name shares enough trigrams with the query, by Jaccard
+        similarity. A one word query is compared with each word of the names.
+        """
+        if ' ' not in query:
+            similar = {}
+            for word, similarity in jaccard(trigrams(query), self.word_trigrams, self.trigram_words).items():
+                for i in self.players_by_word[word]:
+                    similar[i] = max(similar.get(i, 0.0), similarity)
+            return similar
+        return jaccard(trigrams(query), self.name_trigrams, self.trigram_players)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        team: Optional[str] = None,
+        position: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Best matches for a query, exact names first, then names and words
+        starting with it, then misspellings.
+
+        Returns:
+            List[dict]: Player name, team, position, id and a score from 0 to 1
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        words = query.split()
+        prefixed = self.with_prefix(words[0])
+        for word in words[1:]:
+            prefixed &= self.with_prefix(word)
+
+        # Exact names score 1, prefixes between 0.5 and 1 and misspellings below 0.5
+        ranked: Dict[int, Tuple[int, float]] = {}
+        for i in self.matching(prefixed, team, position):
+            name = self.names[i]
+            if name == query:
+                ranked[i] = (EXACT, 1.0)
+            else:
+                # Shorter names are closer to a prefix
+                ranked[i] = (NAME_PREFIX if name.startswith(query) else WORD_PREFIX, 0.5 + len(query) / len(name) / 2)
+
+        # Misspellings only fill up what prefixes left
+        if len(ranked) < limit and len(query) >= 3:
+            similar = self.similar(query)
+            for i in self.matching(similar, team, position):
+                if i not in ranked:
+                    ranked[i] = (FUZZY, similar[i] / 2)
+
+        matches = sorted(ranked, key=lambda i: (ranked[i][0], -ranked[i][1], self.players[i]['name']))
+        return [{**self.players[i], 'score': ranked[i][1]} for i in matches[:limit]]
+
+    def matching(self, candidates, team: Optional[str], position: Optional[str]) -> List[int]:
+        return [
+            i for i in candidates
+            if (not team or self.players[i]['team'] == team) and (not position or self.players[i]['position'] == position)
+        ]
+
+class PlayerSearch:
+    """
+    The search index for the players table, kept in memory between requests.
+
+    Players are only ever added, so the row count and highest id tell when
+    the table changed. They are checked at most every
+    PLAYER_SEARCH_CHECK_SECONDS and the index is rebuilt when they moved.
+    """
+
+    def __init__(self):
+        self.index: Optional[PlayerSearchIndex] = None
+        self.fingerprint: Optional[Tuple] = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: Session | AsyncSession) -> PlayerSearchIndex:
+        now = time.monotonic()
+        if self.index is not None and now - self.checked_at < get_settings().PLAYER_SEARCH_CHECK_SECONDS:
+            return self.index
+
+        result = await execute(db, select(func.count(models.Player.id), func.max(models.Player.id)))
+        fingerprint = tuple(result.one())
+        if self.index is None or fingerprint != self.fingerprint:
+            async with self._lock:
+                # Another request may have rebuilt it while we waited
+                if self.index is None or fingerprint != self.fingerprint:
+                    self.index = await self.build(db)
+                    self.fingerprint = fingerprint
+        self.checked_at = now
+        return self.index
+
+    @instrumented("build_player_search")
+    async def build(self, db: Session | AsyncSession) -> PlayerSearchIndex:
+        result = await execute(db, select(
+            models.Player.name,
+            models.Player.team,
+            models.Player.position,
+            models.Player.id,
+        ).order_by(models.Player.id))
+        players = [row._asdict() for row in result.all()]
+        return await asyncio.to_thread(PlayerSearchIndex, players)
+
+player_search = PlayerSearch()
@@ -0,0 +1,59 @@
+import hashlib
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import execute
+from ..models import models
+from ..core.instrumentation import instrumented
+
+class PlayerService:
+    def __init__(self, db: Session | AsyncSession):
+        self.db = db
+
+    @instrumented("list_players")
+    async def list_players(
+        self,
+        after: Optional[int] = None,
+        limit: int = 100,
+        team: Optional[str] = None,
+        position: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Get one page of players ordered by id.
+
+        Pages are addressed by the last id of the previous page rather than an
+        offset, so every page is an index range scan no matter how deep it is.
+
+        Args:
+            after (Optional[int]): Last player id of the previous page
+            limit (int): Page size
+            team (Optional[str]): Only players of this team
+            position (Optional[str]): Only players at this position
+
+        Returns:
+            List[dict]: Player name, team, position and id
+        """
+        # Same key order as schemas.Player, so rows are encoded as they are
+        stmt = select(
+            models.Player.name,
+            models.Player.team,
+            models.Player.position,
+            models.Player.id,
+        )
+        if after is not None:
+            stmt = stmt.where(models.Player.id > after)
+        if team:
+            stmt = stmt.where(models.Player.team == team)
+        if position:
+            stmt = stmt.where(models.Player.position == position)
+
+        result = await execute(self.db, stmt.order_by(models.Player.id).limit(limit))
+        return [row._asdict() for row in result.all()]
+
+def page_etag(rows: List[dict]) -> str:
+    """Weak ETag for a page, changing whenever any of its rows change"""
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        digest.update(repr(tuple(row.values())).encode())
+    return f'W/"{digest.hexdigest()}"'
@@ -4,12 +4,14 @@ from sqlalchemy.orm import Session
 import pandas as pd
 from typing import Dict, Optional, Tuple
 from app.core.constants import SEASON_START
-from app.core.data_sources import DataService
+from app.services.data_service import DataService
+from app.core.instrumentation import instrumented
 
 class ProjectionService:
-    def __init__(self,db: Session, season_start: str = SEASON_START):
+    def __init__(self,db: Session, season_start: str = SEASON_START, as_of: Optional[date] = None):
         self.db = db
         self.season_start = season_start
+        self.as_of = as_of  # Projection date, defaults to today
         self.data_service = DataService(db)
 
     async def get_weekly_lineup(self, schedule_service, goalie_service) -> pd.DataFrame:
@@ -90,13 +92,14 @@ class ProjectionService:
 
         return merged_df
 
+    @instrumented("create_player_features")
     async def create_player_features(self, df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             print("No player data provided")
             return pd.DataFrame()
 
         required_columns = ['Date', 'Player', 'Team', 'Goals/60', 'Total Assists/60',
-                        'Shots/60', 'ixG/60', 'TOI/GP', 'IPP', 'iHDCF/60']
+                        'Shots/60', 'ixG/60', 'TOI/GP']
 
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
@@ -130,8 +133,9 @@ class ProjectionService:
 
             grouped = current_season.groupby('Player')
 
-            stats = ['Goals/60', 'Total Assists/60', 'Shots/60', 'ixG/60',
-                    'TOI/GP', 'IPP', 'iHDCF/60']
+            # IPP and iHDCF/60 only come from the scraped files, not player_stats
+            stats = [stat for stat in ['Goals/60', 'Total Assists/60', 'Shots/60', 'ixG/60',
+                    'TOI/GP', 'IPP', 'iHDCF/60'] if stat in current_season.columns]
 
             for stat in stats:
                 print(f"Calculating rolling averages for {stat}")
@@ -156,7 +160,7 @@ class ProjectionService:
         """
         Get appropriate weights based on time of season
         """
-        current_date = date.today()
+        current_date = self.as_of or date.today()
         season_start_date = pd.to_datetime(self.season_start).date()
         weeks_into_season = ((current_date - season_start_date).days // 7)
 
@@ -196,6 +200,7 @@ class ProjectionService:
             'rolling_10': 0.3
         }
 
+    @instrumented("calculate_weighted_projections")
     async def calculate_weighted_projections(
         self,
         df: pd.DataFrame,
@@ -206,6 +211,8 @@ class ProjectionService:
         try:
             # Keep key identifying columns
             key_columns = ['Player', 'Team', 'Position', 'TOI/GP']
+            if 'player_id' in df.columns:
+                key_columns.insert(0, 'player_id')
             base_df = df[key_columns].drop_duplicates()
 
             # Split data into current and historical
@@ -0,0 +1,159 @@
+import asyncio
+import os
+from typing import Callable, List, Optional
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import Settings
+from app.core.constants import CURRENT_YEAR
+from app.core.data_sources import BaseDataSource, FixtureDataSource
+from .injuries import InjuryService
+from .player_projections import projection_table
+from .schedule import ScheduleService, scrape_game_data
+from .snapshots import DataSnapshots, data_snapshots
+from .status import data_status
+
+class ScheduleSource(BaseDataSource):
+    """Current season schedule scraped from hockey-reference"""
+
+    def __init__(self, year: int = CURRENT_YEAR):
+        self.year = year
+
+    async def get_data(self) -> pd.DataFrame:
+        return await asyncio.to_thread(scrape_game_data, self.year)
+
+class StandingsSource(BaseDataSource):
+    """Team points percentages from the database"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get_data(self) -> pd.DataFrame:
+        async with self.session_factory() as db:
+            return await ScheduleService(db).read_standings()
+
+class InjurySource(BaseDataSource):
+    """Active injuries from the database"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get_data(self) -> pd.DataFrame:
+        async with self.session_factory() as db:
+            return await InjuryService(db).read_current_injuries()
+
+    async def validate_data(self, df: pd.DataFrame) -> bool:
+        # No injuries is a perfectly good answer
+        return True
+
+class ProjectionSource(BaseDataSource):
+    """This week's projections, rebuilt from the other snapshots when they change"""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], snapshots: DataSnapshots = data_snapshots):
+        self.session_factory = session_factory
+        self.snapshots = snapshots
+
+    async def get_data(self) -> pd.DataFrame:
+        async with self.session_factory() as db:
+            frame = await projection_table.get(db)
+
+        # The per-game pool behind the projections does not depend on league
+        # settings, so optimize and plan requests reuse it too
+        self.snapshots.swap('player_pool', projection_table.pool)
+        return frame
+
+class RefreshJob:
+    def __init__(self, name: str, source: BaseDataSource, interval: float):
+        self.name = name
+        self.source = source
+        self.interval = interval
+
+class RefreshScheduler:
+    """
+    Refresh external data in the background on per-source intervals.
+
+    Jobs run once in order at startup, so derived data such as projections
+    is built from fresh inputs, and then each on its own interval. A failed
+    or empty refresh keeps the previous snapshot.
+    """
+
+    def __init__(self, jobs: List[RefreshJob], snapshots: DataSnapshots = data_snapshots):
+        self.jobs = jobs
+        self.snapshots = snapshots
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, job: RefreshJob) -> bool:
+        """Run one job and swap in its result, returning whether the data changed"""
+        try:
+            data = await job.source.get_data()
+            if not await job.source.validate_data(data):
+                print(f"Refresh of {job.name} returned no data, keeping the previous snapshot")
+                return False
+        except Exception as e:
+            print(f"Error refreshing {job.name}: {e}")
+            return False
+
+        changed = self.snapshots.swap(job.name, data)
+        if job.name == 'schedule':
+            # Fixture schedules never pass through the scraper, which records
+            # itself; the database tables are recorded by the status refresh
+            data_status.record_source('schedule', len(data))
+        return changed
+
+    async def refresh_all(self):
+        for job in self.jobs:
+            await self.refresh(job)
+
+    async def _run_job(self, job: RefreshJob):
+        while True:
+            await asyncio.sleep(job.interval)
+            await self.refresh(job)
+
+    async def _run(self, initial_refresh: bool):
+        if initial_refresh:
+            await self.refresh_all()
+        await asyncio.gather(*(self._run_job(job) for job in self.jobs))
+
+    def start(self, initial_refresh: bool = True):
+        """Start refreshing, skipping the first pass when a warm-up already ran it"""
+        self._task = asyncio.create_task(self._run(initial_refresh))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+def default_refresh_jobs(
+    settings: Settings,
+    session_factory: Callable[[], AsyncSession]
+) -> List[RefreshJob]:
+    """
+    The standard jobs, in dependency order.
+
+    With REFRESH_FIXTURES_DIR set, schedule.csv, standings.csv and
+    injuries.csv found there replace the live sources.
+    """
+    sources = {
+        'schedule': ScheduleSource(),
+        'standings': StandingsSource(session_factory),
+        'injuries': InjurySource(session_factory),
+    }
+
+    fixtures = settings.REFRESH_FIXTURES_DIR
+    if fixtures:
+        date_columns = {'schedule': ['Date'], 'injuries': ['Expected Return']}
+        for name in sources:
+            path = os.path.join(fixtures, f"{name}.csv")
+            if os.path.exists(path):
+                sources[name] = FixtureDataSource(path, date_columns.get(name))
+
+    return [
+        RefreshJob('schedule', sources['schedule'], settings.SCHEDULE_REFRESH_SECONDS),
+        RefreshJob('standings', sources['standings'], settings.STANDINGS_REFRESH_SECONDS),
+        RefreshJob('injuries', sources['injuries'], settings.INJURIES_REFRESH_SECONDS),
+        RefreshJob('projections', ProjectionSource(session_factory), settings.PROJECTIONS_REFRESH_SECONDS),
+    ]
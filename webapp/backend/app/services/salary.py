@@ -1,36 +1,43 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import pandas as pd
+from ..database import execute
 from ..models import models
 from ..core.constants import TEAM_ABBREVIATIONS
+from ..core.instrumentation import instrumented
 
 class SalaryService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
 
 
+    @instrumented("get_player_salaries")
     async def get_player_salaries(self) -> pd.DataFrame:
         """Get latest player salaries from database"""
         # Using the relationship
         try:
-            players_with_salaries = (
-                self.db.query(models.Player)
-                .join(models.PlayerSalary)
-                .with_entities(
+            result = await execute(
+                self.db,
+                select(
                     models.Player.name.label('Player'),
                     models.Player.team.label('Team'),
                     models.Player.position.label('Position'),
-                    models.PlayerSalary.salary.label('pv')
+                    models.PlayerSalary.salary.label('pv'),
+                    models.PlayerSalary.updated_at.label('updated_at')
                 )
+                .join(models.PlayerSalary)
                 .order_by(models.PlayerSalary.updated_at.desc())
-                .all()
             )
+            players_with_salaries = result.all()
 
             if not players_with_salaries:
                 print("No player salaries found")
                 return pd.DataFrame()
 
             salary_df = pd.DataFrame(players_with_salaries)
-            salary_df['Team'] = salary_df['Team'].map(TEAM_ABBREVIATIONS)
+            # Teams may be stored as full names or abbreviations
+            salary_df['Team'] = salary_df['Team'].map(TEAM_ABBREVIATIONS).fillna(salary_df['Team'])
 
             return salary_df
         except Exception as e:
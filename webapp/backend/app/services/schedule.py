@@ -1,25 +1,56 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
+import asyncio
 import pandas as pd
+from typing import Optional
+from app.database import execute
 from app.models import models
 from app.core.constants import TEAM_ABBREVIATIONS, CURRENT_YEAR
+from app.core.instrumentation import instrumented
+from app.services.schedule_strength import ScheduleMatrix
+from app.services.snapshots import data_snapshots
+from app.services.status import data_status
+
+def scrape_game_data(year: int, with_results: bool = False) -> pd.DataFrame:
+    """Scrape NHL games and teams involved for a given year, optionally with final scores."""
+    url = f"https://www.hockey-reference.com/leagues/NHL_{year}_games.html"
+    dfs = pd.read_html(url)
+    df = dfs[0]
+
+    # Convert the "Date" column to datetime.date format
+    df["Date"] = pd.to_datetime(df["Date"]).dt.date
+
+    # Extract relevant columns
+    if with_results:
+        # Scores are blank for games that have not been played yet
+        game_data = df[["Date", "Visitor", "Home", "G", "G.1"]].rename(
+            columns={"G": "VisitorGoals", "G.1": "HomeGoals"}
+        )
+    else:
+        game_data = df[["Date", "Visitor", "Home"]]
+
+    data_status.record_source('schedule', len(game_data))
+
+    return game_data
+
+# Latest schedule matrix per season with the inputs it was built from
+_matrix_cache: dict = {}
 
 class ScheduleService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session | AsyncSession):
         self.db = db
-    async def fetch_game_data(self, year: int) -> pd.DataFrame:
-        """Fetches NHL games and teams involved for a given year."""
-        url = f"https://www.hockey-reference.com/leagues/NHL_{year}_games.html"
-        dfs = pd.read_html(url)
-        df = dfs[0]
-
-        # Convert the "Date" column to datetime.date format
-        df["Date"] = pd.to_datetime(df["Date"]).dt.date
 
-        # Extract relevant columns
-        game_data = df[["Date", "Visitor", "Home"]]
+    @instrumented("fetch_game_data")
+    async def fetch_game_data(self, year: int, with_results: bool = False) -> pd.DataFrame:
+        """Fetches NHL games and teams involved for a given year, optionally with final scores."""
+        # The current schedule is kept fresh by the background refresh
+        snapshot = data_snapshots.get('schedule')
+        if snapshot is not None and year == CURRENT_YEAR and not with_results:
+            return snapshot
 
-        return game_data
+        return await asyncio.to_thread(scrape_game_data, year, with_results)
 
     async def filter_dates_for_week(self,dates, start_date) -> list:
         """Filter dates for current week's remaining games."""
@@ -34,11 +65,8 @@ class ScheduleService:
 
         return week_dates
 
-    async def games_count_for_team_for_week(self, year: int, start_date: date) -> dict[str, int]:
-        """Get number of games per team for the week."""
-        game_data = await self.fetch_game_data(year)
-
-        week_dates = await self.filter_dates_for_week(game_data["Date"].tolist(), start_date)
+    def count_games(self, game_data: pd.DataFrame, week_dates: list) -> dict[str, int]:
+        """Count games per team played on the given dates."""
         week_games = game_data[game_data["Date"].isin(week_dates)]
 
         visitor_counts = week_games["Visitor"].value_counts().to_dict()
@@ -50,31 +78,91 @@ class ScheduleService:
 
         return total_counts
 
+    async def games_count_for_team_for_week(self, year: int, start_date: date) -> dict[str, int]:
+        """Get number of games per team for the week."""
+        game_data = await self.fetch_game_data(year)
+
+        week_dates = await self.filter_dates_for_week(game_data["Date"].tolist(), start_date)
 
-    async def get_weekly_schedule_info(self, start_date=date.today()) -> tuple[dict[str, int], dict[str, float]]:
-        """Get schedule information for remaining games this week"""
+        return self.count_games(game_data, week_dates)
 
-        # Get games per team
-        games_count_full = await self.games_count_for_team_for_week(CURRENT_YEAR, start_date)
+    async def get_standings(self) -> pd.DataFrame:
+        """Get team standings, from the background snapshot when there is one"""
+        snapshot = data_snapshots.get('standings')
+        if snapshot is not None:
+            return snapshot
 
-        # Convert full team names to abbreviations
-        games_count = {TEAM_ABBREVIATIONS[team]: count
-                    for team, count in games_count_full.items()
-                    if team in TEAM_ABBREVIATIONS}
+        return await self.read_standings()
 
-        # Get team standings from database
-        standings = self.db.query(models.TeamStandings).all()
-        points_df = pd.DataFrame([{
+    async def read_standings(self) -> pd.DataFrame:
+        """Get team standings from database"""
+        standings = (await execute(self.db, select(models.TeamStandings))).scalars().all()
+        return pd.DataFrame([{
             'Team': s.team,
             'PTS%': s.points_percentage,
         } for s in standings])
 
-        # Calculate multipliers
-        multipliers = {}
-        for team, count in games_count.items():
-            if count > 0:
-                team_row = points_df[points_df['Team'] == team]
-                if not team_row.empty:
-                    multipliers[team] = 0.5 / team_row['PTS%'].iloc[0]
+    @instrumented("get_schedule_matrix")
+    async def get_schedule_matrix(self, year: int = CURRENT_YEAR) -> ScheduleMatrix:
+        """
+        Opponent strength matrix for a season.
+
+        Reused while the schedule and standings it was built from are the
+        same objects, which they are between background refreshes.
+        """
+        game_data = await self.fetch_game_data(year)
+        standings = await self.get_standings()
+
+        cached = _matrix_cache.get(year)
+        if cached and cached[0] is game_data and cached[1] is standings:
+            return cached[2]
+
+        matrix = ScheduleMatrix(game_data, standings)
+        _matrix_cache[year] = (game_data, standings, matrix)
+        return matrix
+
+    @instrumented("get_weekly_schedule_info")
+    async def get_weekly_schedule_info(
+        self,
+        start_date: Optional[date] = None
+    ) -> tuple[dict[str, int], dict[str, float], dict[str, float]]:
+        """
+        Get schedule information for remaining games this week.
+
+        Returns:
+            tuple: Games per team, opponent strength multipliers and expected
+            goalie wins, for teams with games left this week
+        """
+        start_date = start_date or date.today()
+        matrix = await self.get_schedule_matrix(CURRENT_YEAR)
+
+        return matrix.window(max(start_date, date.today()), start_date + timedelta(days=6))
+
+    async def get_multi_week_schedule_info(
+        self,
+        start_date: date,
+        num_weeks: int
+    ) -> list[tuple[date, dict[str, int], dict[str, float], dict[str, float]]]:
+        """
+        Get schedule information for consecutive weeks starting at start_date.
+
+        The schedule matrix is built once and sliced into weeks, so planning
+        several weeks ahead costs a single scrape.
+
+        Returns:
+            list[tuple[date, dict[str, int], dict[str, float], dict[str, float]]]:
+            Week start, games per team, team multipliers and expected goalie
+            wins for each week
+        """
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+
+        matrix = await self.get_schedule_matrix(CURRENT_YEAR)
+        today = date.today()
+
+        weeks = []
+        for week in range(num_weeks):
+            week_start = start_date + timedelta(weeks=week)
+            weeks.append((week_start, *matrix.window(max(week_start, today), week_start + timedelta(days=6))))
 
-        return games_count, multipliers
\ No newline at end of file
+        return weeks
@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+from app.core.constants import HOME_ADVANTAGE, TEAM_ABBREVIATIONS
+
+class ScheduleMatrix:
+    """
+    Team x date matrices of games and opponent strength for a season.
+
+    Built once from the schedule and standings. Every cell holds what a
+    team's games on that date are worth given who they play and where, so
+    the schedule strength of any date window is a column slice and a sum.
+
+    - games: number of games
+    - opponent_factor: skater scoring factor, 0.5 / opponent PTS%, scaled
+      up at home and down on the road
+    - win_probability: log5 chance of winning against the opponent, with
+      the same home/away adjustment on the odds
+    """
+
+    def __init__(self, game_data: pd.DataFrame, standings: pd.DataFrame, home_advantage: float = HOME_ADVANTAGE):
+        self.teams = sorted(TEAM_ABBREVIATIONS.values())
+        team_index = {team: i for i, team in enumerate(self.teams)}
+
+        games = pd.DataFrame({
+            'Date': pd.to_datetime(game_data['Date']).dt.date,
+            'Home': game_data['Home'].map(TEAM_ABBREVIATIONS).map(team_index),
+            'Visitor': game_data['Visitor'].map(TEAM_ABBREVIATIONS).map(team_index),
+        }).dropna()
+
+        self.dates = np.array(sorted(games['Date'].unique()))
+        date_index = np.searchsorted(self.dates, games['Date'].to_numpy())
+        home = games['Home'].to_numpy(dtype=int)
+        visitor = games['Visitor'].to_numpy(dtype=int)
+
+        # Unknown teams play like a .500 team, and nobody is a sure thing
+        strength = np.full(len(self.teams), 0.5)
+        if not standings.empty:
+            known = standings.assign(index=standings['Team'].map(team_index)).dropna(subset=['index', 'PTS%'])
+            strength[known['index'].to_numpy(dtype=int)] = known['PTS%'].to_numpy(dtype=float)
+        strength = np.clip(strength, 0.05, 0.95)
+        odds = strength / (1 - strength)
+
+        shape = (len(self.teams), len(self.dates))
+        self.games = np.zeros(shape)
+        self.opponent_factor = np.zeros(shape)
+        self.win_probability = np.zeros(shape)
+
+        for team, opponent, venue in ((home, visitor, home_advantage), (visitor, home, 1 / home_advantage)):
+            game_odds = odds[team] / odds[opponent] * venue
+            np.add.at(self.games, (team, date_index), 1)
+            np.add.at(self.opponent_factor, (team, date_index), 0.5 / strength[opponent] * venue)
+            np.add.at(self.win_probability, (team, date_index), game_odds / (1 + game_odds))
+
+    def window(self, start: date, end: date) -> Tuple[Dict[str, int], Dict[str, float], Dict[str, float]]:
+        """
+        Schedule strength for the games from start to end, inclusive.
+
+        Returns:
+            Tuple[Dict[str, int], Dict[str, float], Dict[str, float]]: Games,
+            average opponent factor and expected wins for each team with games
+        """
+        first = np.searchsorted(self.dates, start, side='left')
+        last = np.searchsorted(self.dates, end, side='right')
+        games = self.games[:, first:last].sum(axis=1)
+        factor = self.opponent_factor[:, first:last].sum(axis=1)
+        wins = self.win_probability[:, first:last].sum(axis=1)
+
+        playing = np.flatnonzero(games)
+        return (
+            {self.teams[i]: int(games[i]) for i in playing},
+            {self.teams[i]: float(factor[i] / games[i]) for i in playing},
+            {self.teams[i]: float(wins[i]) for i in playing},
+        )
@@ -0,0 +1,185 @@
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from app.core.config import get_settings
+from app.core.instrumentation import metrics
+
+try:
+    import fcntl
+except ImportError:
+    # No POSIX file locks (Windows), every worker builds its own pool
+    fcntl = None
+
+CURRENT = 'CURRENT'
+LOCK = 'publisher.lock'
+
+class SharedPlayerPool:
+    """
+    The per-game player pool, published once to memory-mapped files for every worker.
+
+    One worker, whichever holds the publisher lock, builds the pool and
+    writes it out as a read-only columnar matrix: float, integer and flag
+    columns each stored column-major in one .npy file, and the text columns
+    (name, team, position, injury status) in a JSON index next to it. Every
+    publish goes to a new numbered directory, and the CURRENT file points at
+    the latest one, so a reader never sees a half written pool.
+
+    Workers map the files and wrap the numeric columns in a DataFrame
+    without copying them. On a tmpfs such as /dev/shm all workers share the
+    same physical pages, so the pool is in memory once however many
+    workers there are, and built by only one of them.
+    """
+
+    def __init__(self, directory: Optional[str], keep: int = 2):
+        if directory and fcntl is None:
+            print("The shared player pool needs POSIX file locks, each worker builds its own pool instead")
+            directory = None
+        self.directory = directory
+        self.keep = keep  # Published versions kept on disk, older ones are removed
+        self.version: Optional[int] = None  # Version the frame below was attached from
+        self._frame: Optional[pd.DataFrame] = None
+        self._lock_file = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @property
+    def leading(self) -> bool:
+        return self._lock_file is not None
+
+    def try_lead(self) -> bool:
+        """Become the publishing worker unless another worker already is"""
+        if self._lock_file is not None:
+            return True
+
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(os.path.join(self.directory, LOCK), 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        return True
+
+    def close(self):
+        """Give up the publisher lock, another worker takes over on its next build"""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def current_version(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.directory, CURRENT)) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def followed_version(self) -> Optional[int]:
+        """Version published by another worker, None while this worker publishes itself"""
+        if not self.enabled or self.leading:
+            return None
+        return self.current_version()
+
+    def _path(self, version: int) -> str:
+        return os.path.join(self.directory, f"pool-{version:08d}")
+
+    def publish(self, pool: pd.DataFrame, data_version: int) -> pd.DataFrame:
+        """Write the pool as the next version and return it attached from the shared files"""
+        version = (self.current_version() or 0) + 1
+        staging = f"{self._path(version)}.{os.getpid()}.tmp"
+        os.makedirs(staging)
+
+        index: Dict[str, Any] = {
+            'version': version,
+            'data_version': data_version,
+            'published_at': datetime.now(timezone.utc).isoformat(),
+            'rows': len(pool),
+            'columns': list(pool.columns),
+            'blocks': {},
+            'text': {},
+        }
+        blocks = {'float': [], 'int': [], 'flag': []}
+        for column in pool.columns:
+            kind = pool[column].dtype.kind
+            if kind == 'f':
+                blocks['float'].append(column)
+            elif kind in 'iu':
+                blocks['int'].append(column)
+            elif kind == 'b':
+                blocks['flag'].append(column)
+            else:
+                index['text'][column] = [None if pd.isna(value) else str(value) for value in pool[column]]
+
+        dtypes = {'float': np.float64, 'int': np.int64, 'flag': np.bool_}
+        for block, columns in blocks.items():
+            if columns:
+                matrix = np.vstack([pool[column].to_numpy(dtype=dtypes[block]) for column in columns])
+                np.save(os.path.join(staging, f"{block}.npy"), matrix)
+                index['blocks'][block] = columns
+
+        with open(os.path.join(staging, 'index.json'), 'w') as f:
+            json.dump(index, f)
+
+        # Readers follow CURRENT, so the version only becomes visible once complete
+        os.rename(staging, self._path(version))
+        pointer = os.path.join(self.directory, f"{CURRENT}.{os.getpid()}.tmp")
+        with open(pointer, 'w') as f:
+            f.write(str(version))
+        os.replace(pointer, os.path.join(self.directory, CURRENT))
+
+        self._prune(version)
+        return self.get()
+
+    def _prune(self, version: int):
+        for name in os.listdir(self.directory):
+            if name.startswith('pool-') and not name.endswith('.tmp'):
+                if int(name[len('pool-'):]) <= version - self.keep:
+                    # Workers still reading an old version keep their mapping
+                    shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _attach(self, version: int) -> pd.DataFrame:
+        path = self._path(version)
+        with open(os.path.join(path, 'index.json')) as f:
+            index = json.load(f)
+
+        columns: Dict[str, Any] = {}
+        for block, names in index['blocks'].items():
+            matrix = np.load(os.path.join(path, f"{block}.npy"), mmap_mode='r')
+            for i, name in enumerate(names):
+                columns[name] = matrix[i]
+        for name, values in index['text'].items():
+            columns[name] = pd.Series(values)
+
+        # Numeric columns stay views of the mapped files, writes copy them first
+        return pd.DataFrame({name: columns[name] for name in index['columns']}, copy=False)
+
+    def get(self) -> Optional[pd.DataFrame]:
+        """The latest published pool, None until one is published"""
+        if not self.enabled:
+            return None
+
+        version = self.current_version()
+        if version is not None and version != self.version:
+            try:
+                self._frame = self._attach(version)
+                self.version = version
+            except FileNotFoundError:
+                # Pruned while we were reading, the next call picks up the newer one
+                pass
+        return self._frame
+
+shared_pool = SharedPlayerPool(get_settings().SHARED_POOL_DIR)
+
+metrics.register_callback(
+    "nhl_shared_pool_version",
+    "Version of the shared player pool this worker reads from",
+    "gauge",
+    lambda: {(): shared_pool.version or 0},
+)
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.core.instrumentation import metrics
+
+def _same(old: Any, new: Any) -> bool:
+    if old is new:
+        return True
+    # DataFrames compare by content; checked by type so pandas is not imported here
+    if type(old) is type(new) and hasattr(old, 'equals'):
+        return bool(old.equals(new))
+    return False
+
+class DataSnapshots:
+    """
+    Latest copy of each background-refreshed dataset.
+
+    A refresh builds its new value off to the side and swaps the reference
+    in one assignment, so readers see either the old or the new snapshot and
+    never a partial one. The version counter goes up whenever a swap
+    actually changes something, which lets derived data tell when to rebuild.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Any] = {}
+        self.versions: Dict[str, int] = {}
+        self.refreshed_at: Dict[str, datetime] = {}
+        self.version = 0
+
+    def get(self, name: str) -> Optional[Any]:
+        return self._values.get(name)
+
+    def swap(self, name: str, value: Any) -> bool:
+        """Replace a snapshot, returning whether its content changed"""
+        self.refreshed_at[name] = datetime.now(timezone.utc)
+        if name in self._values and _same(self._values[name], value):
+            return False
+
+        self._values[name] = value
+        self.version += 1
+        self.versions[name] = self.version
+        return True
+
+    def versions_of(self, names: Iterable[str]) -> Tuple[Optional[int], ...]:
+        return tuple(self.versions.get(name) for name in names)
+
+    def clear(self):
+        self._values.clear()
+        self.versions.clear()
+        self.refreshed_at.clear()
+
+data_snapshots = DataSnapshots()
+
+metrics.register_callback(
+    "nhl_data_version",
+    "Data version, bumped whenever a background refresh changes a snapshot",
+    "gauge",
+    lambda: {(): data_snapshots.version},
+)
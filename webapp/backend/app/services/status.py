@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..models import models
+
+# Tables reported by /api/status with the column that tells how fresh they are
+TRACKED_TABLES = {
+    'player_stats': (models.PlayerStats, models.PlayerStats.date),
+    'salaries': (models.PlayerSalary, models.PlayerSalary.updated_at),
+    'injuries': (models.PlayerInjury, models.PlayerInjury.updated_at),
+    'standings': (models.TeamStandings, models.TeamStandings.updated_at),
+}
+TRACKED_SOURCES = list(TRACKED_TABLES) + ['schedule']
+
+class DataStatus:
+    """
+    In-memory readiness and data-freshness state for the status endpoint.
+
+    Everything here is written by background refreshes and the data
+    services, so reading it never touches the database.
+    """
+
+    def __init__(self):
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.db_ok: Optional[bool] = None
+        self.db_error: Optional[str] = None
+        self.db_checked_at: Optional[datetime] = None
+        self.solver_available: Optional[bool] = None
+        self.started_at = datetime.now(timezone.utc)
+
+    def record_source(self, name: str, rows: int, last_updated=None):
+        """Record the size and freshness of a table or scraped source"""
+        self.sources[name] = {
+            'rows': rows,
+            'last_updated': last_updated,
+            'refreshed_at': datetime.now(timezone.utc),
+        }
+
+    def record_db_check(self, error: Optional[Exception] = None):
+        self.db_ok = error is None
+        self.db_error = str(error) if error else None
+        self.db_checked_at = datetime.now(timezone.utc)
+
+    @property
+    def cache_warm(self) -> bool:
+        return all(name in self.sources for name in TRACKED_SOURCES)
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.db_ok) and bool(self.solver_available)
+
+    def snapshot(self, engine: Engine) -> Dict[str, Any]:
+        pool = engine.pool
+        pool_status = {'status': pool.status()}
+        if hasattr(pool, 'checkedout'):
+            pool_status.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+            })
+
+        return {
+            'ready': self.ready,
+            'started_at': self.started_at,
+            'database': {
+                'ok': self.db_ok,
+                'error': self.db_error,
+                'checked_at': self.db_checked_at,
+                'pool': pool_status,
+            },
+            'cache_warm': self.cache_warm,
+            'data': {name: self.sources.get(name) for name in TRACKED_SOURCES},
+            'solver_available': self.solver_available,
+        }
+
+data_status = DataStatus()
+
+class StatusService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh_table_stats(self):
+        """Count rows and find the latest update of each tracked table"""
+        try:
+            for name, (model, updated_column) in TRACKED_TABLES.items():
+                rows, last_updated = self.db.query(func.count(model.id), func.max(updated_column)).one()
+                data_status.record_source(name, rows, last_updated)
+            data_status.record_db_check()
+        except Exception as e:
+            print(f"Error refreshing table stats: {e}")
+            data_status.record_db_check(e)
+
+def check_solver() -> bool:
+    """Check the CBC binary bundled with pulp can be run"""
+    import pulp
+    data_status.solver_available = bool(pulp.PULP_CBC_CMD(msg=False).available())
+    return data_status.solver_available
+
+def refresh_status(session_factory: Callable[[], Session]):
+    db = session_factory()
+    try:
+        StatusService(db).refresh_table_stats()
+    finally:
+        db.close()
+
+async def run_status_refresh(session_factory: Callable[[], Session], interval: float):
+    """Keep the status snapshot fresh in the background"""
+    await asyncio.to_thread(check_solver)
+    while True:
+        await asyncio.to_thread(refresh_status, session_factory)
+        await asyncio.sleep(interval)
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from typing import Optional
+from sqlalchemy import text
+from app.core.config import Settings
+from app.database import get_async_session_factory
+from .refresh import RefreshScheduler
+from .status import check_solver
+
+async def open_connections(count: int):
+    """Check out several connections at once so the pool starts full"""
+    session_factory = get_async_session_factory()
+
+    async def connect():
+        async with session_factory() as db:
+            await db.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(connect() for _ in range(count)))
+
+async def warm_up(settings: Settings, scheduler: Optional[RefreshScheduler] = None):
+    """
+    Pay the cold-start costs before the worker reports ready.
+
+    Imports the optimizer, fills the connection pool, checks the solver and
+    builds the snapshots, projections and player search index the first
+    requests would otherwise wait for. Each step is best effort, a failure
+    only means that request pays for it later.
+    """
+    start = time.perf_counter()
+
+    from . import optimizer, planner  # noqa: F401
+
+    steps = [
+        ("connection pool", open_connections(settings.DB_POOL_SIZE)),
+        ("solver", asyncio.to_thread(check_solver)),
+    ]
+    if scheduler:
+        steps.append(("snapshots", scheduler.refresh_all()))
+    else:
+        steps.append(("projections", build_projections()))
+    steps.append(("player search", build_player_search()))
+
+    for name, step in steps:
+        try:
+            await step
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+
+    print(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+async def build_projections():
+    from .player_projections import projection_table
+
+    async with get_async_session_factory()() as db:
+        await projection_table.get(db)
+
+async def build_player_search():
+    from .player_search import player_search
+
+    async with get_async_session_factory()() as db:
+        await player_search.get(db)
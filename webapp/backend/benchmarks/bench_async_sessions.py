@@ -0,0 +1,116 @@
+"""
+Compare request throughput of the sync and async session paths.
+
+Each simulated request runs the injury, salary and standings queries an
+optimize call makes, first through a sync Session (blocking the event loop
+like the old handlers) and then through an AsyncSession.
+
+    python -m benchmarks.bench_async_sessions --requests 200 --concurrency 20 --latency-ms 5
+
+--latency-ms adds a per-statement delay inside the driver's thread to stand
+in for a network round trip when benchmarking against SQLite. Pass --url to
+run against a real Postgres instead.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.database import Base, create_async_db_engine, create_db_engine
+from app.models import models
+from app.services.injuries import InjuryService
+from app.services.salary import SalaryService
+from app.services.schedule import ScheduleService
+
+def seed(session_factory, num_players: int):
+    db = session_factory()
+    try:
+        teams = [f"T{i:02d}" for i in range(32)]
+        for team in teams:
+            db.add(models.TeamStandings(team=team, points_percentage=0.5))
+        for i in range(num_players):
+            player = models.Player(name=f"Player {i}", team=teams[i % 32], position="FDG"[i % 3])
+            db.add(player)
+            db.flush()
+            db.add(models.PlayerSalary(player_id=player.id, salary=1 + i % 10, updated_at=datetime.now()))
+            if i % 20 == 0:
+                db.add(models.PlayerInjury(player_id=player.id, status="IR", is_active=True))
+        db.commit()
+    finally:
+        db.close()
+
+def add_latency(engine, latency: float):
+    """Delay every statement inside the thread that runs it"""
+    def delay(_statement):
+        time.sleep(latency)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        if hasattr(dbapi_connection, "run_async"):
+            dbapi_connection.run_async(lambda conn: conn.set_trace_callback(delay))
+        else:
+            dbapi_connection.set_trace_callback(delay)
+
+async def run_queries(db):
+    await InjuryService(db).get_current_injuries()
+    await SalaryService(db).get_player_salaries()
+    await ScheduleService(db).get_standings()
+
+async def sync_request(session_factory):
+    db = session_factory()
+    try:
+        await run_queries(db)
+    finally:
+        db.close()
+
+async def async_request(session_factory):
+    async with session_factory() as db:
+        await run_queries(db)
+
+async def measure(request, session_factory, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await request(session_factory)
+
+    await one()  # Warm the pool
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - start)
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL, defaults to a temporary SQLite file")
+    parser.add_argument("--players", type=int, default=800)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    sync_engine = create_db_engine(url=url)
+    async_engine = create_async_db_engine(url=url)
+    if args.latency_ms and sync_engine.url.get_backend_name() == "sqlite":
+        add_latency(sync_engine, args.latency_ms / 1000)
+        add_latency(async_engine.sync_engine, args.latency_ms / 1000)
+
+    if not args.url:
+        Base.metadata.create_all(sync_engine)
+        seed(sessionmaker(bind=sync_engine), args.players)
+
+    sync_rps = await measure(sync_request, sessionmaker(bind=sync_engine), args.requests, args.concurrency)
+    async_rps = await measure(
+        async_request, async_sessionmaker(async_engine, expire_on_commit=False), args.requests, args.concurrency
+    )
+    await async_engine.dispose()
+
+    print(f"sync session:  {sync_rps:8.1f} req/s")
+    print(f"async session: {async_rps:8.1f} req/s ({async_rps / sync_rps:.2f}x)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
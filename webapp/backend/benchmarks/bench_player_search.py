@@ -0,0 +1,74 @@
+"""
+Time player search queries against an index of a full league.
+
+Builds the index from synthetic names, including accented ones, then
+times prefixes of growing length, accent-free spellings, two-word queries
+and misspellings of names in the league:
+
+    python -m benchmarks.bench_player_search --players 1500 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import time
+import numpy as np
+from app.core.constants import TEAM_ABBREVIATIONS
+from app.scripts.generate_synthetic_data import player_names
+from app.services.player_search import PlayerSearchIndex, normalize_name
+
+def sample_queries(names, count: int, rng: random.Random):
+    queries = []
+    for _ in range(count):
+        name = rng.choice(names)
+        first, last = name.split()[:2]
+        kind = rng.randrange(4)
+        if kind == 0:
+            queries.append(last[:rng.randint(1, len(last))])
+        elif kind == 1:
+            queries.append(normalize_name(name))
+        elif kind == 2:
+            queries.append(f"{first[:2]} {last[:3]}")
+        else:
+            # Drop a letter from the last name
+            cut = rng.randrange(len(last))
+            queries.append(f"{first} {last[:cut]}{last[cut + 1:]}")
+    return queries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=1500)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    teams = list(TEAM_ABBREVIATIONS.values())
+    names = player_names(args.players, np.random.default_rng(args.seed))
+    players = [
+        {'name': name, 'team': teams[i % len(teams)], 'position': 'DF'[i % 3 > 0], 'id': i + 1}
+        for i, name in enumerate(names)
+    ]
+
+    start = time.perf_counter()
+    index = PlayerSearchIndex(players)
+    print(f"index of {len(index)} players built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    timings = []
+    empty = 0
+    for query in sample_queries(names, args.queries, rng):
+        start = time.perf_counter()
+        matches = index.search(query, args.limit)
+        timings.append(time.perf_counter() - start)
+        empty += not matches
+
+    timings.sort()
+    us = [timing * 1e6 for timing in timings]
+    print(f"{len(us)} queries: p50 {statistics.median(us):.0f} us, p99 {us[int(len(us) * 0.99) - 1]:.0f} us, "
+          f"max {us[-1]:.0f} us, {empty} without matches")
+    for query in ["stutzle", "Stützle", "dube", "con mcd", "pastrnak", "pastrank"]:
+        matches = ", ".join(f"{match['name']} ({match['score']:.2f})" for match in index.search(query, 3))
+        print(f"  {query!r:12s} -> {matches or '-'}")
+
+if __name__ == "__main__":
+    main()
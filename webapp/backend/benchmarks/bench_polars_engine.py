@@ -0,0 +1,120 @@
+"""
+Compare the pandas and polars player pool engines.
+
+Builds the per-game pool from the same synthetic stats, injuries and
+salaries with both engines, checks that the pools and the weekly
+final_df the optimizer solves over are identical, then times each engine.
+
+    python -m benchmarks.bench_polars_engine --players 2000 --days 120 --runs 5
+
+Needs the optional polars and pyarrow packages.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from app.core.constants import TEAM_ABBREVIATIONS
+from app.services import polars_engine
+from app.services.optimizer import FantasyOptimizer
+from app.services.player_projections import default_league_settings
+
+def synthetic_inputs(players: int, days: int, seed: int = 0):
+    """Game logs every other day plus injuries and salaries, some players missing each"""
+    rng = np.random.default_rng(seed)
+    teams = list(TEAM_ABBREVIATIONS.values())
+    names = [f"Player {i}" for i in range(players)]
+    player_teams = [teams[i % len(teams)] for i in range(players)]
+    dates = [date.today() - timedelta(days=day) for day in range(1, days, 2)]
+
+    rows = len(names) * len(dates)
+    player_index = np.repeat(np.arange(players), len(dates))
+    goals = rng.poisson(0.8, rows) * 4.0
+    goals[rng.random(rows) < 0.02] = np.nan  # Missing values are skipped, not zeroed
+    player_data = pd.DataFrame({
+        'player_id': player_index + 1,
+        'Player': np.array(names)[player_index],
+        'Team': np.array(player_teams)[player_index],
+        'Position': np.where(player_index % 3 == 0, 'D', 'F'),
+        'Date': np.tile(dates, players),
+        'TOI': rng.uniform(8, 24, rows),
+        'TOI/GP': rng.uniform(8, 24, rows),
+        'Goals/60': goals,
+        'Total Assists/60': rng.poisson(1.2, rows) * 4.0,
+        'Shots/60': rng.uniform(2, 12, rows),
+        'ixG/60': rng.uniform(0, 2, rows),
+    })
+
+    injured = rng.choice(players, players // 20, replace=False)
+    injuries_df = pd.DataFrame({
+        'Player': [names[i] for i in injured],
+        'Injury Status': rng.choice(['Day-To-Day', 'Out', 'IR'], len(injured)),
+    })
+
+    # A few players without a salary, and older salary rows behind the latest
+    paid = rng.choice(players, int(players * 0.95), replace=False)
+    salary_df = pd.DataFrame({
+        'Player': [names[i] for i in paid] * 2,
+        'Team': [player_teams[i] for i in paid] * 2,
+        'pv': np.round(rng.uniform(0.5, 12, len(paid) * 2), 2),
+    })
+    return player_data, injuries_df, salary_df
+
+async def pandas_pool(optimizer: FantasyOptimizer, player_data, injuries_df, salary_df) -> pd.DataFrame:
+    # The pandas path converts dates in place
+    return await optimizer.assemble_player_pool(player_data.copy(), injuries_df, salary_df)
+
+def polars_pool(optimizer: FantasyOptimizer, player_data, injuries_df, salary_df) -> pd.DataFrame:
+    return polars_engine.assemble_player_pool(
+        player_data, injuries_df, salary_df,
+        optimizer.projection_service.season_start,
+        optimizer.projection_service.get_projection_weights()
+    )
+
+def check_parity(optimizer: FantasyOptimizer, expected: pd.DataFrame, actual: pd.DataFrame):
+    """Same pool, and the same final_df once this week's schedule is applied"""
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+
+    teams = sorted(expected['Team'].unique())
+    games_count = {team: 2 + i % 3 for i, team in enumerate(teams)}
+    multipliers = {team: 0.9 + (i % 5) * 0.05 for i, team in enumerate(teams)}
+    pd.testing.assert_frame_equal(
+        optimizer.apply_schedule(expected.copy(), games_count, multipliers),
+        optimizer.apply_schedule(actual.copy(), games_count, multipliers),
+        check_dtype=False
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    optimizer = FantasyOptimizer(None, default_league_settings())
+    inputs = synthetic_inputs(args.players, args.days)
+    print(f"{len(inputs[0])} stat rows, {args.players} players")
+
+    expected = await pandas_pool(optimizer, *inputs)
+    actual = polars_pool(optimizer, *inputs)
+    check_parity(optimizer, expected, actual)
+    print(f"parity: ok ({len(expected)} players in the pool)")
+
+    timings = {"pandas": [], "polars": []}
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        await pandas_pool(optimizer, *inputs)
+        timings["pandas"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        polars_pool(optimizer, *inputs)
+        timings["polars"].append(time.perf_counter() - start)
+
+    for engine, values in timings.items():
+        print(f"  {engine:8s} {statistics.median(values) * 1000:9.1f} ms")
+    print(f"  speedup  {statistics.median(timings['pandas']) / statistics.median(timings['polars']):9.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""
+Encode time per 10k rows for each response format.
+
+Compares the previous path (response model validation, jsonable_encoder
+and json.dumps, or DataFrame.to_json for projections) with the encoders
+in app.api.encoders, for player list rows, projection rows and lineups:
+
+    python -m benchmarks.bench_serialization --rows 10000 --runs 5
+
+MessagePack and Arrow are skipped when msgpack or pyarrow is not installed.
+"""
+import argparse
+import importlib.util
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from app.api.encoders import MSGPACK, arrow_stream, column_records, dumps_json, frame_columns, records_response
+from app.core.constants import TEAM_ABBREVIATIONS
+from app.schemas import schemas
+
+def player_rows(rows: int) -> List[dict]:
+    teams = list(TEAM_ABBREVIATIONS.values())
+    return [
+        {'name': f"Player {i}", 'team': teams[i % len(teams)], 'position': 'DF'[i % 3 > 0], 'id': i + 1}
+        for i in range(rows)
+    ]
+
+def projection_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    players = pd.DataFrame(player_rows(rows))
+    injured = rng.random(rows) < 0.05
+    return pd.DataFrame({
+        'id': players['id'],
+        'name': players['name'],
+        'team': players['team'],
+        'position': players['position'],
+        'proj_goals_per_game': rng.random(rows) * 0.6,
+        'proj_assists_per_game': rng.random(rows) * 0.8,
+        'games_this_week': rng.integers(0, 5, rows),
+        'schedule_multiplier': np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(0.8, 1.2, rows)),
+        'proj_fantasy_pts': rng.random(rows) * 10,
+        'salary': rng.uniform(0.5, 12, rows).round(2),
+        'injured': injured,
+        'injury_status': np.where(injured, 'IR', None),
+    })
+
+def lineup(rng: np.random.Generator) -> schemas.OptimizedLineup:
+    def players(position: str, count: int):
+        return [
+            schemas.OptimizedPlayer(id=i, name=f"Player {i}", team='BOS', position=position,
+                                    projected_points=float(rng.random() * 10), salary=float(rng.uniform(0.5, 12)),
+                                    games_this_week=3)
+            for i in range(count)
+        ]
+    return schemas.OptimizedLineup(forwards=players('F', 6), defense=players('D', 4), goalies=players('G', 2),
+                                   total_points=80.0, total_salary=62.5)
+
+def time_ms(fn: Callable, runs: int) -> float:
+    fn()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    has_msgpack = importlib.util.find_spec("msgpack") is not None
+    has_arrow = importlib.util.find_spec("pyarrow") is not None
+    per_10k = 10000 / args.rows
+
+    rows = player_rows(args.rows)
+    frame = projection_frame(args.rows)
+    lineups = [lineup(np.random.default_rng(i)) for i in range(max(1, args.rows // 12))]
+
+    cases: Dict[str, Dict[str, Callable]] = {
+        'players': {
+            'response model + json': lambda: json.dumps(jsonable_encoder([schemas.Player(**row) for row in rows])),
+            'json (orjson)': lambda: dumps_json(rows),
+        },
+        'projections': {
+            'DataFrame.to_json': lambda: frame.to_json(orient='records'),
+            'json (orjson)': lambda: dumps_json(column_records(frame_columns(frame))),
+        },
+        'lineups': {
+            'response model + json': lambda: [json.dumps(jsonable_encoder(item)) for item in lineups],
+            'json (model_dump_json)': lambda: [item.model_dump_json() for item in lineups],
+        },
+    }
+    if has_msgpack:
+        cases['players']['msgpack'] = lambda: records_response(rows, MSGPACK)
+        cases['projections']['msgpack'] = lambda: records_response(column_records(frame_columns(frame)), MSGPACK)
+    if has_arrow:
+        cases['players']['arrow'] = lambda: arrow_stream({name: [row[name] for row in rows] for name in rows[0]})
+        cases['projections']['arrow'] = lambda: arrow_stream(frame_columns(frame))
+
+    print(f"encode time per 10k rows ({args.rows} rows, median of {args.runs})")
+    for name, encoders in cases.items():
+        # A lineup is 12 rows
+        scale = per_10k if name != 'lineups' else 10000 / (len(lineups) * 12)
+        print(f"{name}:")
+        for encoder, fn in encoders.items():
+            print(f"  {encoder:26s} {time_ms(fn, args.runs) * scale:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measure worker startup: import time of the app and latency of the first requests.
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported or cached. Two startup modes are compared:
+
+- cold: the background refresh starts with the app and races the first requests
+- warm-up: WARMUP_ENABLED builds everything before the app takes traffic
+
+    python -m benchmarks.bench_startup --runs 5
+
+Runs against a temporary SQLite database filled with a synthetic league and
+a schedule fixture, so no network access is needed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "cold": {"WARMUP_ENABLED": "false"},
+    "warm-up": {"WARMUP_ENABLED": "true"},
+}
+
+def child():
+    """Run inside the fresh interpreter: time the import, startup and first requests"""
+    start = time.perf_counter()
+    import main
+    from fastapi.testclient import TestClient
+    import_seconds = time.perf_counter() - start
+
+    timings = {"import": import_seconds}
+    start = time.perf_counter()
+    with TestClient(main.app) as client:
+        timings["startup"] = time.perf_counter() - start
+        settings = client.get("/api/settings/default").json()
+
+        for name, request in [
+            ("first_players_stats", lambda: client.get("/api/players/stats?limit=50")),
+            ("first_optimize", lambda: client.post("/api/optimize/lineup", json={"settings": settings})),
+            ("second_optimize", lambda: client.post("/api/optimize/lineup", json={"settings": settings})),
+        ]:
+            start = time.perf_counter()
+            response = request()
+            timings[name] = time.perf_counter() - start
+            if response.status_code != 200:
+                timings[f"{name}_status"] = response.status_code
+
+    print(json.dumps(timings))
+
+def run_child(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        env={**os.environ, **env}, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    tmp = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+    # Imported here, the child must not have the app imported before it times it
+    from app.scripts.generate_synthetic_data import generate_league
+    generate_league(url, fixtures_dir=tmp, players_per_team=20, days=30)
+    env = {"DATABASE_URL": url, "REFRESH_ENABLED": "true", "REFRESH_FIXTURES_DIR": tmp}
+
+    for mode, mode_env in MODES.items():
+        runs = [run_child({**env, **mode_env}) for _ in range(args.runs)]
+        print(f"{mode}:")
+        for name in runs[0]:
+            values = [run[name] for run in runs]
+            if name.endswith("_status"):
+                print(f"  {name:22s} {values}")
+            else:
+                print(f"  {name:22s} {statistics.median(values) * 1000:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
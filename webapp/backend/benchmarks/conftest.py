@@ -0,0 +1,133 @@
+"""
+Pytest benchmark suite for the projection and optimize pipeline.
+
+Each run generates a synthetic league into a scratch SQLite database, times
+every benchmark over a few rounds and reports the median next to the stored
+baseline in baselines.json. Timings vary between machines and runs, so only
+with --benchmark-compare does a benchmark slower than its baseline by more
+than the threshold fail.
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --benchmark-compare --benchmark-threshold 0.5 --benchmark-rounds 10
+    python -m pytest benchmarks --benchmark-update
+
+Baselines only compare like with like: they are recorded together with the
+league scale, and a run at another scale only reports its timings.
+"""
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict
+import pytest
+
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption('--benchmark-compare', action='store_true', help="Fail benchmarks slower than their baselines")
+    group.addoption('--benchmark-update', action='store_true', help="Store this run's timings as the baselines")
+    group.addoption('--benchmark-threshold', type=float, default=0.25,
+                    help="Allowed slowdown over the baseline, 0.25 is 25%% slower")
+    group.addoption('--benchmark-rounds', type=int, default=5, help="Timed rounds per benchmark")
+    group.addoption('--benchmark-players-per-team', type=int, default=24)
+    group.addoption('--benchmark-days', type=int, default=180, help="Days of game logs")
+
+def pytest_configure(config):
+    # The app reads its settings on first import, so point it at the
+    # synthetic league before any test module imports it
+    config.benchmark_dir = tempfile.mkdtemp(prefix='nhl-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(config.benchmark_dir, 'league.db')}"
+    os.environ.pop('ASYNC_DATABASE_URL', None)
+    os.environ['REFRESH_FIXTURES_DIR'] = config.benchmark_dir
+    os.environ['WARMUP_ENABLED'] = 'false'
+    config.benchmark_results = {}
+
+def benchmark_scale(config) -> Dict[str, int]:
+    return {
+        'players_per_team': config.getoption('--benchmark-players-per-team'),
+        'days': config.getoption('--benchmark-days'),
+    }
+
+def read_baselines(config) -> Dict[str, float]:
+    """Stored baselines recorded at this run's scale"""
+    if not os.path.exists(BASELINES):
+        return {}
+    with open(BASELINES) as f:
+        stored = json.load(f)
+    if stored.get('scale') != benchmark_scale(config):
+        return {}
+    return stored.get('results', {})
+
+def load_baselines(config) -> Dict[str, float]:
+    """Baselines to compare against, none while recording new ones"""
+    if config.getoption('--benchmark-update'):
+        return {}
+    return read_baselines(config)
+
+@pytest.fixture(scope='session')
+def league(pytestconfig):
+    """The synthetic league database and schedule fixture, generated once per run"""
+    from app.scripts.generate_synthetic_data import generate_league
+
+    scale = benchmark_scale(pytestconfig)
+    return generate_league(
+        os.environ['DATABASE_URL'],
+        fixtures_dir=pytestconfig.benchmark_dir,
+        players_per_team=scale['players_per_team'],
+        days=scale['days'],
+    )
+
+@pytest.fixture
+def benchmark(request):
+    """
+    Time a callable, and with --benchmark-compare check it against its baseline.
+
+    Returns the median seconds. The first call warms caches and is not timed.
+    """
+    config = request.config
+    baselines = load_baselines(config) if config.getoption('--benchmark-compare') else {}
+    threshold = config.getoption('--benchmark-threshold')
+    rounds = config.getoption('--benchmark-rounds')
+
+    def run(name: str, fn: Callable):
+        fn()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+        median = statistics.median(timings)
+        config.benchmark_results[name] = median
+        baseline = baselines.get(name)
+        if baseline is not None:
+            assert median <= baseline * (1 + threshold), (
+                f"{name} regressed: {median * 1000:.1f} ms against a baseline of "
+                f"{baseline * 1000:.1f} ms (threshold {threshold:.0%})"
+            )
+        return median
+
+    return run
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, 'benchmark_results', {})
+    if not results:
+        return
+
+    baselines = load_baselines(config)
+    terminalreporter.section('benchmarks')
+    for name, median in results.items():
+        line = f"{name:32s} {median * 1000:10.1f} ms"
+        if name in baselines:
+            line += f"   baseline {baselines[name] * 1000:10.1f} ms ({median / baselines[name] - 1:+.0%})"
+        terminalreporter.write_line(line)
+
+    if config.getoption('--benchmark-update'):
+        # Benchmarks left out of this run keep their baselines
+        results = {**read_baselines(config), **results}
+        with open(BASELINES, 'w') as f:
+            json.dump({'scale': benchmark_scale(config), 'results': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        terminalreporter.write_line(f"Baselines written to {BASELINES}")
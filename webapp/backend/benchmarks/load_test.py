@@ -0,0 +1,224 @@
+"""
+Drive the API with a mix of requests at a target rate and report latency per route.
+
+Requests arrive open loop at --rate per second for --duration seconds, each
+route picked at random by its weight in --mix. Latency is measured from when
+a request was due to be sent, so time spent waiting for a free connection
+(--concurrency) counts, and an overloaded app shows up as growing
+percentiles rather than a politely lower request rate.
+
+In-process (the default), the app runs inside this process on a synthetic
+league in a temporary SQLite database. With --url, requests go to a
+server that is already running:
+
+    python -m benchmarks.load_test --rate 20 --duration 30 --output load.json
+    python -m benchmarks.load_test --mix optimize=1,players=5,settings=2 --rate 50
+    python -m benchmarks.load_test --url http://localhost:8000 --rate 10
+
+The JSON report holds throughput, p50/p95/p99 latency and error rates per
+route and overall, plus the commit and options, for comparing commits.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+
+DEFAULT_MIX = "optimize=1,players=4,settings=2"
+
+class Routes:
+    """Builds the request for each route in the mix"""
+
+    def __init__(self, settings: Dict[str, Any], player_ids: List[int], optimize_variants: int, rng: random.Random):
+        self.settings = settings
+        self.player_ids = player_ids
+        self.rng = rng
+        # Identical optimize requests share one solve, variants exclude a different player each
+        self.exclusions = [[]] + [[player_id] for player_id in rng.sample(player_ids, min(optimize_variants - 1, len(player_ids)))]
+
+    def request(self, route: str) -> Tuple[str, str, Dict[str, Any]]:
+        if route == 'optimize':
+            exclude = self.rng.choice(self.exclusions)
+            body = {'settings': self.settings, 'exclude_players': exclude} if exclude else {'settings': self.settings}
+            return 'POST', '/api/optimize/lineup', {'json': body}
+        if route == 'players':
+            params = {'limit': 100}
+            if self.player_ids and self.rng.random() < 0.8:
+                params['after'] = self.rng.choice(self.player_ids)
+            return 'GET', '/api/players/', {'params': params}
+        if route == 'settings':
+            return 'GET', '/api/settings/default', {}
+        raise ValueError(f"Unknown route {route}")
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        route, _, weight = part.partition('=')
+        weights[route.strip()] = float(weight or 1)
+    return weights
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(latencies: List[float], errors: int, statuses: Dict[int, int], seconds: float) -> Dict[str, Any]:
+    count = len(latencies)
+    ms = [latency * 1000 for latency in latencies]
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'throughput': (count - errors) / seconds if seconds else 0.0,
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'mean_ms': sum(ms) / count if count else None,
+        'max_ms': max(ms) if ms else None,
+        'statuses': {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+async def run_load(client: httpx.AsyncClient, args) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    settings = (await client.get('/api/settings/default')).json()
+    players = (await client.get('/api/players/', params={'limit': 1000})).json()
+    routes = Routes(settings, [player['id'] for player in players], args.optimize_variants, rng)
+
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    connections = asyncio.Semaphore(args.concurrency)
+
+    async def send(route: str, due: float):
+        method, path, kwargs = routes.request(route)
+        async with connections:
+            try:
+                response = await client.request(method, path, timeout=args.timeout, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0  # Timed out or the connection failed
+        latencies[route].append(time.perf_counter() - due)
+        statuses[route][status] += 1
+        if not 200 <= status < 400:
+            errors[route] += 1
+
+    # Open loop: send on schedule whether or not earlier requests finished
+    tasks = []
+    start = time.perf_counter()
+    due = start
+    while due < start + args.duration:
+        due += rng.expovariate(args.rate) if args.poisson else 1 / args.rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(rng.choices(names, weights)[0], due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for route in latencies for latency in latencies[route]]
+    all_statuses: Dict[int, int] = defaultdict(int)
+    for route_statuses in statuses.values():
+        for status, n in route_statuses.items():
+            all_statuses[status] += n
+
+    return {
+        'seconds': elapsed,
+        'routes': {
+            route: summarize(latencies[route], errors[route], statuses[route], elapsed)
+            for route in names if latencies[route]
+        },
+        'overall': summarize(all_latencies, sum(errors.values()), all_statuses, elapsed),
+    }
+
+@asynccontextmanager
+async def in_process_client(args):
+    """The app on a synthetic league, served through ASGI without a socket"""
+    tmp = tempfile.mkdtemp(prefix='nhl-load-')
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tmp, 'league.db')}"
+    os.environ.pop('ASYNC_DATABASE_URL', None)
+    os.environ['REFRESH_FIXTURES_DIR'] = args.fixtures_dir or tmp
+    os.environ.setdefault('WARMUP_ENABLED', 'true')
+
+    if not args.database_url:
+        from app.scripts.generate_synthetic_data import generate_league
+        generate_league(os.environ['DATABASE_URL'], fixtures_dir=tmp, players_per_team=args.players_per_team)
+
+    import main
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://load-test') as client:
+            yield client
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Load test a running server instead of the app in-process")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Route weights (default {DEFAULT_MIX})")
+    parser.add_argument('--rate', type=float, default=10, help="Requests per second")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of load")
+    parser.add_argument('--concurrency', type=int, default=50, help="Requests in flight at most")
+    parser.add_argument('--timeout', type=float, default=30, help="Seconds before a request counts as an error")
+    parser.add_argument('--poisson', action='store_true', help="Exponential gaps between requests instead of even ones")
+    parser.add_argument('--optimize-variants', type=int, default=10, help="Distinct optimize requests in the mix")
+    parser.add_argument('--players-per-team', type=int, default=24, help="Synthetic league size in-process")
+    parser.add_argument('--database-url', help="In-process, use this database instead of a synthetic league")
+    parser.add_argument('--fixtures-dir', help="In-process, schedule fixtures for --database-url")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            results = await run_load(client, args)
+    else:
+        async with in_process_client(args) as client:
+            results = await run_load(client, args)
+
+    report = {
+        'commit': git_commit(),
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'target': args.url or 'in-process',
+        'options': {
+            'mix': parse_mix(args.mix),
+            'rate': args.rate,
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'poisson': args.poisson,
+            'optimize_variants': args.optimize_variants,
+        },
+        **results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        overall = report['overall']
+        print(f"{overall['requests']} requests, {overall['throughput']:.1f}/s, "
+              f"p99 {overall['p99_ms']:.1f} ms, {overall['error_rate']:.1%} errors -> {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""
+Tests that a backtest week only prices players with salaries known before it.
+
+The synthetic league gives every player an older salary, dated 30 days
+before the last game log, and a newer one dated on it. A week between the
+two must be priced with the older salaries, and a week before both skipped.
+"""
+import asyncio
+import os
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import pytest
+
+@pytest.fixture(scope='module')
+def inputs(league, pytestconfig):
+    """Game logs, salaries and a scored schedule read from the synthetic league"""
+    from app.database import SessionLocal
+    from app.services.optimizer import FantasyOptimizer
+    from app.services.player_projections import default_league_settings
+
+    async def load(db):
+        optimizer = FantasyOptimizer(db, default_league_settings())
+        history = await optimizer.get_player_data()
+        salaries = await optimizer.salary_service.get_player_salaries()
+        return history, salaries
+
+    db = SessionLocal()
+    try:
+        history, salaries = asyncio.run(load(db))
+    finally:
+        db.close()
+    history['Date'] = pd.to_datetime(history['Date'])
+
+    game_data = pd.read_csv(os.path.join(pytestconfig.benchmark_dir, 'schedule.csv'), parse_dates=['Date'])
+    game_data['Date'] = game_data['Date'].dt.date
+    rng = np.random.default_rng(0)
+    game_data['HomeGoals'] = rng.integers(0, 6, len(game_data)).astype(float)
+    game_data['VisitorGoals'] = rng.integers(0, 6, len(game_data)).astype(float)
+
+    return {
+        'history': history,
+        'game_data': game_data,
+        'salaries': salaries,
+        'settings': default_league_settings(),
+        'season_start': str(history['Date'].min().date()),
+    }
+
+@pytest.fixture
+def priced_pools(monkeypatch):
+    """Salaries each backtest week built its player pool with"""
+    from app.services.optimizer import FantasyOptimizer
+
+    seen = []
+    assemble = FantasyOptimizer.assemble_player_pool
+
+    async def record(self, player_data, injuries_df, salary_df):
+        seen.append(salary_df)
+        return await assemble(self, player_data, injuries_df, salary_df)
+
+    monkeypatch.setattr(FantasyOptimizer, 'assemble_player_pool', record)
+    return seen
+
+def last_log_date(inputs):
+    return inputs['history']['Date'].max().date()
+
+def test_week_is_priced_with_salaries_from_before_it(inputs, priced_pools):
+    from app.services.backtest import backtest_week
+
+    week_start = last_log_date(inputs) - timedelta(days=14)
+    result = asyncio.run(backtest_week(week_start, **inputs))
+
+    assert 'accuracy' in result, result.get('skipped')
+    assert result['accuracy']['unpriced_players'] == 0
+
+    salaries = inputs['salaries']
+    (priced,) = priced_pools
+    assert len(priced) == len(salaries) // 2
+    assert (pd.to_datetime(priced['updated_at']) < pd.Timestamp(week_start)).all()
+
+    older = salaries[pd.to_datetime(salaries['updated_at']) < pd.Timestamp(week_start)]
+    expected = older.set_index(['Player', 'Team'])['pv']
+    assert priced.set_index(['Player', 'Team'])['pv'].sort_index().equals(expected.sort_index())
+
+def test_player_first_priced_after_the_week_is_left_unpriced(inputs, priced_pools):
+    from app.services.backtest import backtest_week
+
+    week_start = last_log_date(inputs) - timedelta(days=14)
+    salaries = inputs['salaries']
+    player, team = salaries.iloc[0][['Player', 'Team']]
+    # Only the salary dated after the week is left for this player
+    dropped = salaries.index[
+        (salaries['Player'] == player) & (salaries['Team'] == team)
+        & (pd.to_datetime(salaries['updated_at']) < pd.Timestamp(week_start))
+    ]
+    result = asyncio.run(backtest_week(week_start, **{**inputs, 'salaries': salaries.drop(dropped)}))
+
+    assert 'accuracy' in result, result.get('skipped')
+    assert result['accuracy']['unpriced_players'] == 1
+    (priced,) = priced_pools
+    assert not ((priced['Player'] == player) & (priced['Team'] == team)).any()
+
+def test_week_before_any_salary_is_skipped(inputs, priced_pools):
+    from app.services.backtest import backtest_week
+
+    week_start = last_log_date(inputs) - timedelta(days=60)
+    result = asyncio.run(backtest_week(week_start, **inputs))
+
+    assert 'accuracy' not in result
+    assert result['skipped']['week_start'] == week_start
+    assert 'salary' in result['skipped']['reason'].lower()
+    assert all(priced.empty for priced in priced_pools)
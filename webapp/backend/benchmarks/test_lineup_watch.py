@@ -0,0 +1,112 @@
+"""
+Tests for the lineup watcher's change detection.
+
+PlayerChanges.between diffs two player pools, and LineupRegistry.affected
+picks the saved lineups a set of changes has to re-solve. Both run on
+small hand-built frames, no database needed.
+"""
+import pandas as pd
+import pytest
+
+def player_pool(rows):
+    return pd.DataFrame(rows, columns=['player_id', 'Player', 'Team', 'Position', 'Injured', 'pv', 'proj_fantasy_pts'])
+
+POOL = [
+    (1, 'Forward One', 'BOS', 'F', False, 5.0, 10.0),
+    (2, 'Forward Two', 'TOR', 'F', False, 4.0, 8.0),
+    (3, 'Defense One', 'BOS', 'D', False, 3.0, 6.0),
+    (4, 'Goalie One', 'TOR', 'G', False, 6.0, 12.0),
+    (5, 'Forward Three', 'NYR', 'F', True, 4.5, 0.0),
+]
+
+def with_changes(rows, **columns):
+    """Copy of rows with {player_id: value} changes applied per column"""
+    pool = player_pool(rows)
+    for column, values in columns.items():
+        for player_id, value in values.items():
+            pool.loc[pool['player_id'] == player_id, column] = value
+    return pool
+
+def test_between_finds_injury_and_salary_changes():
+    from app.services.lineup_watch import PlayerChanges
+
+    old = player_pool(POOL)
+    new = with_changes(POOL, Injured={2: True, 5: False}, pv={3: 3.5})
+
+    changes = PlayerChanges.between(old, new)
+
+    assert changes.injuries == {2: True, 5: False}
+    assert changes.salaries == {3: 3.5}
+    assert changes.player_ids == {2, 3, 5}
+
+def test_between_ignores_unchanged_added_and_removed_players():
+    from app.services.lineup_watch import PlayerChanges
+
+    old = player_pool(POOL)
+    # Player 1 leaves the pool, player 6 joins, a duplicate row of player 4 changes nothing
+    new = player_pool(POOL[1:] + [POOL[3], (6, 'Defense Two', 'NYR', 'D', False, 2.0, 4.0)])
+
+    changes = PlayerChanges.between(old, new)
+
+    assert changes.player_ids == set()
+
+@pytest.fixture
+def registry():
+    from app.services.lineup_watch import LineupRegistry
+    from app.services.optimizer import FantasyOptimizer
+    from app.services.player_projections import default_league_settings
+
+    registry = LineupRegistry(max_size=10)
+    pool = player_pool(POOL).assign(games_this_week=3)
+    for key, lineup_ids, candidate_ids in [
+        ('bos', [1, 3], [1, 2, 3]),
+        ('tor', [2, 4], [2, 4, 5]),
+    ]:
+        optimizer = FantasyOptimizer(None, default_league_settings())
+        optimizer.final_df = pool[pool['player_id'].isin(candidate_ids)]
+        lineup = optimizer.format_lineup(pool[pool['player_id'].isin(lineup_ids)])
+        registry.record(key, optimizer, lineup)
+    return registry
+
+def affected_keys(registry, changes):
+    from app.services.lineup_watch import lineup_id_for
+
+    ids = {saved.lineup_id for saved in registry.affected(changes)}
+    return {key for key in ('bos', 'tor') if lineup_id_for(key) in ids}
+
+def test_affected_lineups_include_a_changed_player(registry):
+    from app.services.lineup_watch import PlayerChanges
+
+    changes = PlayerChanges()
+    changes.injuries[3] = True
+    assert affected_keys(registry, changes) == {'bos'}
+
+    changes = PlayerChanges()
+    changes.salaries[4] = 7.0
+    assert affected_keys(registry, changes) == {'tor'}
+
+def test_changes_to_players_outside_a_lineup_do_not_resolve_it(registry):
+    from app.services.lineup_watch import PlayerChanges
+
+    # Player 2 is only a candidate for bos: being injured or repriced cannot
+    # make the bos lineup worse
+    changes = PlayerChanges()
+    changes.injuries[2] = True
+    changes.salaries[2] = 1.0
+    assert affected_keys(registry, changes) == {'tor'}
+
+    # Player 6 is in neither pool
+    changes = PlayerChanges()
+    changes.injuries[6] = True
+    assert affected_keys(registry, changes) == set()
+
+def test_a_player_back_from_injury_resolves_lineups_that_could_pick_them(registry):
+    from app.services.lineup_watch import PlayerChanges
+
+    changes = PlayerChanges()
+    changes.injuries[5] = False
+    assert affected_keys(registry, changes) == {'tor'}
+
+    changes = PlayerChanges()
+    changes.injuries[6] = False
+    assert affected_keys(registry, changes) == set()
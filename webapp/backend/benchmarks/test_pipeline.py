@@ -0,0 +1,86 @@
+"""
+Benchmarks for each stage of the optimize pipeline and the endpoint end to end,
+from reading the database to the response.
+
+See conftest.py for the options and how baselines are stored.
+"""
+import asyncio
+import os
+import pytest
+
+@pytest.fixture(scope='session')
+def pipeline(league, pytestconfig):
+    """Inputs for each stage, built once from the synthetic league"""
+    from app.core.data_sources import FixtureDataSource
+    from app.database import SessionLocal
+    from app.services.optimizer import FantasyOptimizer
+    from app.services.player_projections import default_league_settings
+    from app.services.snapshots import data_snapshots
+
+    async def build():
+        schedule = FixtureDataSource(os.path.join(pytestconfig.benchmark_dir, 'schedule.csv'), ['Date'])
+        data_snapshots.swap('schedule', await schedule.get_data())
+
+        optimizer = FantasyOptimizer(db, default_league_settings())
+        player_data = await optimizer.get_player_data()
+        features = await optimizer.projection_service.create_player_features(player_data.copy())
+        await optimizer.optimize()
+        return optimizer, player_data, features
+
+    db = SessionLocal()
+    try:
+        optimizer, player_data, features = asyncio.run(build())
+    finally:
+        db.close()
+        data_snapshots.clear()
+
+    return {
+        'optimizer': optimizer,
+        'player_data': player_data,
+        'features': features,
+        'final_df': optimizer.final_df,
+    }
+
+def test_create_player_features(pipeline, benchmark):
+    service = pipeline['optimizer'].projection_service
+    player_data = pipeline['player_data']
+    benchmark('create_player_features', lambda: asyncio.run(service.create_player_features(player_data.copy())))
+
+def test_calculate_weighted_projections(pipeline, benchmark):
+    service = pipeline['optimizer'].projection_service
+    features = pipeline['features']
+    benchmark('calculate_weighted_projections',
+              lambda: asyncio.run(service.calculate_weighted_projections(features, {}, {})))
+
+def test_select_best_team(pipeline, benchmark):
+    optimizer = pipeline['optimizer']
+    final_df = pipeline['final_df']
+    benchmark('select_best_team', lambda: asyncio.run(optimizer.select_best_team(final_df)))
+
+def test_optimize_lineup_endpoint(league, pytestconfig, benchmark, monkeypatch):
+    import main
+    from fastapi.testclient import TestClient
+    from app.core.config import get_settings
+    from app.core.data_sources import FixtureDataSource
+    from app.services.shared_pool import shared_pool
+    from app.services.snapshots import data_snapshots
+
+    # Without the background refresh and the shared pool every request
+    # builds the player pool itself, so the timing covers the whole pipeline
+    monkeypatch.setattr(get_settings(), 'REFRESH_ENABLED', False)
+    monkeypatch.setattr(shared_pool, 'directory', None)
+    schedule = FixtureDataSource(os.path.join(pytestconfig.benchmark_dir, 'schedule.csv'), ['Date'])
+    data_snapshots.swap('schedule', asyncio.run(schedule.get_data()))
+
+    try:
+        with TestClient(main.app) as client:
+            settings = client.get('/api/settings/default').json()
+
+            def optimize():
+                assert data_snapshots.get('player_pool') is None
+                response = client.post('/api/optimize/lineup', json={'settings': settings})
+                assert response.status_code == 200, response.text
+
+            benchmark('optimize_lineup_endpoint', optimize)
+    finally:
+        data_snapshots.clear()
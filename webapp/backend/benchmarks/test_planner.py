@@ -0,0 +1,104 @@
+"""
+Tests for the multi-week lineup planner on a small fixed pool.
+
+The weekly projections are built by hand, so the plans only depend on the
+planner's model: transfer limits between weeks, transfers that add up to
+the lineup changes, and a one-week lookahead that picks the same lineups
+as select_best_team.
+"""
+import asyncio
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+
+WEEKS = 4
+POSITIONS = ['F'] * 7 + ['D'] * 5 + ['G'] * 3
+TEAMS = ['BOS', 'TOR', 'NYR', 'MTL']
+
+def league_settings():
+    from app.schemas import schemas
+
+    return schemas.LeagueSettings(
+        max_salary_cap=12.0,
+        min_salary_cap_pct=0.0,
+        num_forwards=2,
+        num_defense=2,
+        num_goalies=1,
+        max_players_per_team=3,
+        points_goal=1.0,
+        points_assist=1.0,
+        points_goalie_win=1.0,
+    )
+
+def weekly_points():
+    """Universe, week starts and weekly projections with no ties between lineups"""
+    rng = np.random.default_rng(7)
+    universe = pd.DataFrame({
+        'player_id': range(101, 101 + len(POSITIONS)),
+        'Player': [f"Player {i}" for i in range(len(POSITIONS))],
+        'Team': [TEAMS[i % len(TEAMS)] for i in range(len(POSITIONS))],
+        'Position': POSITIONS,
+        'pv': rng.uniform(1.0, 4.0, len(POSITIONS)).round(2),
+    })
+
+    weekly = []
+    for _ in range(WEEKS):
+        week = universe.copy()
+        week['games_this_week'] = rng.integers(1, 5, len(week))
+        week['proj_fantasy_pts'] = rng.uniform(0.0, 10.0, len(week)) * week['games_this_week']
+        weekly.append(week)
+
+    week_starts = [date(2026, 10, 19) + timedelta(weeks=w) for w in range(WEEKS)]
+    return universe, week_starts, weekly
+
+def run_plan(max_transfers, lookahead_weeks):
+    from app.schemas import schemas
+    from app.services.planner import LineupPlanner
+
+    plan = schemas.PlanSettings(num_weeks=WEEKS, max_transfers=max_transfers, lookahead_weeks=lookahead_weeks)
+    planner = LineupPlanner(None, league_settings(), plan)
+
+    async def build_weekly_points():
+        return weekly_points()
+
+    planner.build_weekly_points = build_weekly_points
+    return asyncio.run(planner.plan())
+
+def lineup_ids(week):
+    return {player.id for player in week.forwards + week.defense + week.goalies}
+
+@pytest.mark.parametrize('max_transfers', [0, 1, 2])
+def test_plan_respects_max_transfers(max_transfers):
+    plan = run_plan(max_transfers, lookahead_weeks=2)
+
+    assert len(plan.weeks) == WEEKS
+    for previous, week in zip(plan.weeks, plan.weeks[1:]):
+        assert len(week.transfers_in) <= max_transfers
+        assert len(lineup_ids(week) - lineup_ids(previous)) <= max_transfers
+
+def test_transfers_match_lineup_changes():
+    plan = run_plan(max_transfers=2, lookahead_weeks=2)
+
+    assert plan.weeks[0].transfers_in == []
+    assert plan.weeks[0].transfers_out == []
+    for previous, week in zip(plan.weeks, plan.weeks[1:]):
+        assert week.transfers_in == sorted(lineup_ids(week) - lineup_ids(previous))
+        assert week.transfers_out == sorted(lineup_ids(previous) - lineup_ids(week))
+        assert len(week.transfers_in) == len(week.transfers_out)
+
+    assert plan.total_transfers == sum(len(week.transfers_in) for week in plan.weeks)
+    assert plan.total_points == pytest.approx(sum(week.total_points for week in plan.weeks))
+
+def test_one_week_lookahead_matches_select_best_team():
+    from app.services.optimizer import FantasyOptimizer
+
+    # With a whole roster of transfers allowed, each week is solved on its own
+    plan = run_plan(max_transfers=5, lookahead_weeks=1)
+
+    optimizer = FantasyOptimizer(None, league_settings())
+    _, _, weekly = weekly_points()
+    for week, frame in zip(plan.weeks, weekly):
+        best = asyncio.run(optimizer.select_best_team(frame))
+        assert lineup_ids(week) == set(best['player_id'])
+        assert week.total_points == pytest.approx(best['proj_fantasy_pts'].sum())
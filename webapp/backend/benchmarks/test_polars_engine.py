@@ -0,0 +1,24 @@
+"""
+Parity test for the polars player pool engine.
+
+Both engines build the pool from the same synthetic inputs, which must
+match, as must the weekly projections built from them. bench_polars_engine
+times the two.
+"""
+import asyncio
+import pytest
+from benchmarks.bench_polars_engine import check_parity, pandas_pool, polars_pool, synthetic_inputs
+
+@pytest.mark.parametrize('players, days', [(300, 60), (1000, 120)])
+def test_polars_pool_matches_pandas(players, days):
+    from app.services.optimizer import FantasyOptimizer
+    from app.services.player_projections import default_league_settings
+
+    optimizer = FantasyOptimizer(None, default_league_settings())
+    inputs = synthetic_inputs(players, days)
+
+    expected = asyncio.run(pandas_pool(optimizer, *inputs))
+    actual = polars_pool(optimizer, *inputs)
+
+    assert not expected.empty
+    check_parity(optimizer, expected, actual)
@@ -0,0 +1,30 @@
+"""
+Query-plan regression tests for the optimize hot path.
+
+Runs each service query against the synthetic league, which is built
+through the migrations, and fails when its plan does not use the expected
+index. app.scripts.check_query_plans runs the same check against any
+database by hand.
+"""
+import os
+import pytest
+from app.scripts.check_query_plans import EXPECTED_INDEXES, capture_statements, explain
+
+@pytest.fixture(scope='module')
+def engine(league):
+    from app.database import create_db_engine
+
+    engine = create_db_engine(url=os.environ['DATABASE_URL'])
+    yield engine
+    engine.dispose()
+
+@pytest.mark.parametrize('name', sorted(EXPECTED_INDEXES))
+def test_query_uses_index(engine, name):
+    statements = capture_statements(engine, name)
+    assert statements, f"{name} ran no statements"
+
+    for statement, parameters in statements:
+        plan = explain(engine, statement, parameters)
+        assert any(index in plan for index in EXPECTED_INDEXES[name]), (
+            f"{name} uses none of {sorted(EXPECTED_INDEXES[name])}:\n{statement}\n{plan}"
+        )
@@ -1,9 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import players, optimize, settings, status
+from app.api.endpoints import players, optimize, settings, status, metrics, admin
 from app.core.config import get_settings
+from app.api.profiling import RequestProfilerMiddleware
+from app.core.sql_profiler import QueryScopeMiddleware
+from app.database import SessionLocal, get_async_session_factory
+from app.services.lineup_watch import lineup_watcher
+from app.services.status import run_status_refresh
 
-app = FastAPI(title=get_settings().APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    status_refresh = asyncio.create_task(
+        run_status_refresh(SessionLocal, settings.STATUS_REFRESH_SECONDS)
+    )
+
+    # Imported here rather than at the top so importing the app stays cheap,
+    # the refresh jobs and warm-up pull in pandas and the optimizer
+    scheduler = None
+    if settings.REFRESH_ENABLED:
+        from app.services.refresh import RefreshScheduler, default_refresh_jobs
+        scheduler = RefreshScheduler(default_refresh_jobs(settings, get_async_session_factory()))
+
+    if settings.WARMUP_ENABLED:
+        from app.services.warmup import warm_up
+        await warm_up(settings, scheduler)
+
+    if scheduler:
+        scheduler.start(initial_refresh=not settings.WARMUP_ENABLED)
+
+    lineup_watcher.start()
+
+    yield
+
+    await lineup_watcher.stop()
+
+    if scheduler:
+        await scheduler.stop()
+    if settings.SHARED_POOL_DIR:
+        from app.services.shared_pool import shared_pool
+        shared_pool.close()
+    status_refresh.cancel()
+
+app = FastAPI(title=get_settings().APP_NAME, lifespan=lifespan)
 
 origins = [
     "http://localhost:5173",  # Vite's default port
@@ -16,12 +57,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count", "X-Lineup-Id", "X-Profile-Id"],
 )
+# Counts each request's statements by call site when SQL profiling is on
+app.add_middleware(QueryScopeMiddleware)
+# Samples requests an admin asked to profile when profiling is on
+app.add_middleware(RequestProfilerMiddleware)
 
 app.include_router(players.router, prefix="/api/players", tags=["players"])
 app.include_router(optimize.router, prefix="/api/optimize", tags=["optimize"])
 app.include_router(settings.router, prefix="/api/settings", tags=["settings"])
-# app.include_router(status.router, prefix="/api/status", tags=["status"])
+app.include_router(status.router, prefix="/api/status", tags=["status"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,40 @@
+from logging.config import fileConfig
+from alembic import context
+from app.database import Base, create_db_engine
+from app.models import models  # noqa: F401 - registers the tables on Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def get_url() -> str:
+    # An explicit URL (e.g. from a test or script) wins over Settings
+    return config.get_main_option("sqlalchemy.url") or create_db_engine().url.render_as_string(hide_password=False)
+
+def run_migrations_offline():
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    engine = create_db_engine(url=get_url())
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
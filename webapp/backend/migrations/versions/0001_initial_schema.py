@@ -0,0 +1,97 @@
+"""Initial schema
+
+Databases created earlier with metadata.create_all() are already at this
+revision; mark them with `alembic stamp 0001` before upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'players',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String()),
+        sa.Column('team', sa.String()),
+        sa.Column('position', sa.String()),
+        sa.Column('raw_position', sa.String()),
+        sa.UniqueConstraint('name', 'team', 'position', name='unique_player_identifier'),
+    )
+    op.create_index('ix_players_id', 'players', ['id'])
+    op.create_index('ix_players_name', 'players', ['name'])
+
+    op.create_table(
+        'player_stats',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id')),
+        sa.Column('date', sa.Date()),
+        sa.Column('toi', sa.Float()),
+        sa.Column('goals_per_60', sa.Float()),
+        sa.Column('assists_per_60', sa.Float()),
+        sa.Column('shots_per_60', sa.Float()),
+        sa.Column('ixg_per_60', sa.Float()),
+    )
+    op.create_index('ix_player_stats_id', 'player_stats', ['id'])
+
+    op.create_table(
+        'player_salaries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id')),
+        sa.Column('salary', sa.Float()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_player_salaries_id', 'player_salaries', ['id'])
+
+    op.create_table(
+        'player_injuries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_id', sa.Integer(), sa.ForeignKey('players.id')),
+        sa.Column('status', sa.String()),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('expected_return', sa.Date(), nullable=True),
+        sa.Column('is_active', sa.Boolean()),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_player_injuries_id', 'player_injuries', ['id'])
+
+    op.create_table(
+        'team_standings',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('team', sa.String(), unique=True),
+        sa.Column('points_percentage', sa.Float()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+    op.create_index('ix_team_standings_id', 'team_standings', ['id'])
+
+    op.create_table(
+        'league_settings',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('max_salary_cap', sa.Float()),
+        sa.Column('min_salary_cap_pct', sa.Float()),
+        sa.Column('num_forwards', sa.Integer()),
+        sa.Column('num_defense', sa.Integer()),
+        sa.Column('num_goalies', sa.Integer()),
+        sa.Column('max_players_per_team', sa.Integer()),
+        sa.Column('max_defense_per_team', sa.Integer()),
+        sa.Column('points_goal', sa.Float()),
+        sa.Column('points_assist', sa.Float()),
+        sa.Column('points_goalie_win', sa.Float()),
+    )
+    op.create_index('ix_league_settings_id', 'league_settings', ['id'])
+
+def downgrade():
+    op.drop_table('league_settings')
+    op.drop_table('team_standings')
+    op.drop_table('player_injuries')
+    op.drop_table('player_salaries')
+    op.drop_table('player_stats')
+    op.drop_table('players')
@@ -0,0 +1,34 @@
+"""Indexes for the optimize hot path
+
+- player_stats(player_id, date) for the season stats join, plus
+  player_stats(date) so the season-start filter is a range search
+- player_salaries(player_id, updated_at) for latest-salary lookups
+- a partial index on active injuries, the only ones ever read
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_player_stats_player_id_date', 'player_stats', ['player_id', 'date'])
+    op.create_index('ix_player_stats_date', 'player_stats', ['date'])
+    op.create_index('ix_player_salaries_player_id_updated_at', 'player_salaries', ['player_id', 'updated_at'])
+    op.create_index(
+        'ix_player_injuries_active_player_id', 'player_injuries', ['player_id'],
+        postgresql_where=sa.text('is_active = true'),
+        sqlite_where=sa.text('is_active = 1'),
+    )
+
+def downgrade():
+    op.drop_index('ix_player_injuries_active_player_id', table_name='player_injuries')
+    op.drop_index('ix_player_salaries_player_id_updated_at', table_name='player_salaries')
+    op.drop_index('ix_player_stats_date', table_name='player_stats')
+    op.drop_index('ix_player_stats_player_id_date', table_name='player_stats')
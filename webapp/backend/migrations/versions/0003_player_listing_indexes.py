@@ -0,0 +1,20 @@
+"""Indexes for filtered player listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_players_team_id', 'players', ['team', 'id'])
+    op.create_index('ix_players_position_id', 'players', ['position', 'id'])
+
+def downgrade():
+    op.drop_index('ix_players_position_id', table_name='players')
+    op.drop_index('ix_players_team_id', table_name='players')
@@ -0,0 +1,24 @@
+"""Columns for persisting every league setting
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('league_settings', sa.Column('min_forwards_per_team', sa.Integer()))
+    op.add_column('league_settings', sa.Column('max_forwards_per_team', sa.Integer()))
+    op.add_column('league_settings', sa.Column('updated_at', sa.DateTime()))
+
+def downgrade():
+    with op.batch_alter_table('league_settings') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('max_forwards_per_team')
+        batch_op.drop_column('min_forwards_per_team')